@@ -0,0 +1,53 @@
+"""Add change sequence columns and delete tombstones"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202610180002"
+down_revision = "202610180001"
+branch_labels = None
+depends_on = None
+
+TRACKED_TABLES = ("zones", "anchors", "items", "captures")
+
+
+def upgrade() -> None:
+    for table in TRACKED_TABLES:
+        op.add_column(
+            table,
+            sa.Column("change_seq", sa.Integer(), nullable=False, server_default="0"),
+        )
+        op.create_index(f"ix_{table}_change_seq", table, ["change_seq"])
+
+    op.create_table(
+        "tombstones",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "owner_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("entity", sa.String(length=16), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("change_seq", sa.Integer(), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "ix_tombstones_owner_id_change_seq", "tombstones", ["owner_id", "change_seq"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tombstones_owner_id_change_seq", table_name="tombstones")
+    op.drop_table("tombstones")
+    for table in reversed(TRACKED_TABLES):
+        op.drop_index(f"ix_{table}_change_seq", table_name=table)
+        op.drop_column(table, "change_seq")
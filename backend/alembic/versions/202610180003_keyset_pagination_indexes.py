@@ -0,0 +1,46 @@
+"""Add composite indexes backing keyset pagination
+
+On Postgres the indexes are built with CREATE INDEX CONCURRENTLY outside the
+migration transaction, so the upgrade can run against a live database.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "202610180003"
+down_revision = "202610180002"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_zones_owner_id_name_id", "zones", ["owner_id", "name", "id"]),
+    ("ix_anchors_name_id", "anchors", ["name", "id"]),
+    ("ix_anchors_zone_id_name_id", "anchors", ["zone_id", "name", "id"]),
+    ("ix_items_created_at_id", "items", ["created_at", "id"]),
+    ("ix_items_zone_id_created_at_id", "items", ["zone_id", "created_at", "id"]),
+    ("ix_items_anchor_id_created_at_id", "items", ["anchor_id", "created_at", "id"]),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _columns in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
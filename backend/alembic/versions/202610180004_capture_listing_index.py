@@ -0,0 +1,18 @@
+"""Add keyset index for capture listing"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "202610180004"
+down_revision = "202610180003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_captures_created_at_id", "captures", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_captures_created_at_id", table_name="captures")
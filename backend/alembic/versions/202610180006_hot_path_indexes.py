@@ -0,0 +1,48 @@
+"""Add hot-path indexes for ownership joins, ordering and active breadcrumbs
+
+On Postgres the indexes are built with CREATE INDEX CONCURRENTLY outside the
+migration transaction, so the upgrade can run against a live database.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202610180006"
+down_revision = "202610180005"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_captures_zone_id_created_at_id", "captures", ["zone_id", "created_at", "id"], None),
+    ("ix_captures_anchor_id_created_at_id", "captures", ["anchor_id", "created_at", "id"], None),
+    ("ix_breadcrumbs_anchor_id_started_at", "breadcrumbs", ["anchor_id", "started_at"], None),
+    ("ix_breadcrumbs_started_at_id", "breadcrumbs", ["started_at", "id"], None),
+    ("ix_breadcrumbs_active_anchor_id", "breadcrumbs", ["anchor_id"], "active"),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                sqlite_where=sa.text(where) if where else None,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _columns, _where in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
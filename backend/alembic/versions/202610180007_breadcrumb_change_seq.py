@@ -0,0 +1,24 @@
+"""Track breadcrumb changes in the owner's change sequence"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202610180007"
+down_revision = "202610180006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "breadcrumbs",
+        sa.Column("change_seq", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_breadcrumbs_change_seq", "breadcrumbs", ["change_seq"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_breadcrumbs_change_seq", table_name="breadcrumbs")
+    op.drop_column("breadcrumbs", "change_seq")
@@ -0,0 +1,111 @@
+"""Add full-text search over items, anchors and captures
+
+Postgres gets a stored ``search_vector`` tsvector column per table, generated
+from the searchable text and indexed with GIN. SQLite gets one FTS5 table,
+``search_index``, kept in sync by triggers. Its rowid encodes the entity so
+trigger deletes are point lookups.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "202610180008"
+down_revision = "202610180007"
+branch_labels = None
+depends_on = None
+
+# table -> (weighted tsvector expression, FTS rowid code, FTS title, FTS body); the
+# FTS expressions are templated on the row alias (table name or trigger ``new``).
+SEARCHABLE = {
+    "items": (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(body, '')), 'B')",
+        1,
+        "{row}.title",
+        "coalesce({row}.body, '')",
+    ),
+    "anchors": (
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(anchor_id, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(location_hint, '')), 'B')",
+        2,
+        "{row}.name",
+        "{row}.anchor_id || ' ' || coalesce({row}.description, '') || ' ' || "
+        "coalesce({row}.location_hint, '')",
+    ),
+    "captures": (
+        "setweight(to_tsvector('english', coalesce(raw_text, '')), 'B')",
+        3,
+        "''",
+        "{row}.raw_text",
+    ),
+}
+
+ENTITIES = {"items": "item", "anchors": "anchor", "captures": "capture"}
+
+SEARCHED_COLUMNS = {
+    "items": "title, body",
+    "anchors": "name, anchor_id, description, location_hint",
+    "captures": "raw_text",
+}
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        for table, (vector, _code, _title, _body) in SEARCHABLE.items():
+            op.execute(
+                f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+                f"GENERATED ALWAYS AS ({vector}) STORED"
+            )
+            op.execute(
+                f"CREATE INDEX ix_{table}_search_vector ON {table} USING gin (search_vector)"
+            )
+    elif dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE search_index USING fts5("
+            "entity UNINDEXED, entity_id UNINDEXED, title, body, "
+            "tokenize = 'porter unicode61')"
+        )
+        for table, (_vector, code, title, body) in SEARCHABLE.items():
+            _create_sqlite_triggers(table, ENTITIES[table], code, title, body)
+            op.execute(
+                f"INSERT INTO search_index (rowid, entity, entity_id, title, body) "
+                f"SELECT id * 4 + {code}, '{ENTITIES[table]}', id, "
+                f"{title.format(row=table)}, {body.format(row=table)} FROM {table}"
+            )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        for table in reversed(list(SEARCHABLE)):
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+            op.execute(f"ALTER TABLE {table} DROP COLUMN search_vector")
+    elif dialect == "sqlite":
+        for table in reversed(list(SEARCHABLE)):
+            for event in ("insert", "update", "delete"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_search_{event}")
+        op.execute("DROP TABLE IF EXISTS search_index")
+
+
+def _create_sqlite_triggers(table: str, entity: str, code: int, title: str, body: str) -> None:
+    new_title, new_body = title.format(row="new"), body.format(row="new")
+    insert = (
+        f"INSERT INTO search_index (rowid, entity, entity_id, title, body) "
+        f"VALUES (new.id * 4 + {code}, '{entity}', new.id, {new_title}, {new_body});"
+    )
+    delete = f"DELETE FROM search_index WHERE rowid = old.id * 4 + {code};"
+    op.execute(
+        f"CREATE TRIGGER {table}_search_insert AFTER INSERT ON {table} BEGIN {insert} END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {table}_search_update AFTER UPDATE OF {SEARCHED_COLUMNS[table]} "
+        f"ON {table} BEGIN {delete} {insert} END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {table}_search_delete AFTER DELETE ON {table} BEGIN {delete} END"
+    )
+
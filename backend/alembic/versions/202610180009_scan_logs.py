@@ -0,0 +1,48 @@
+"""Add NFC scan log"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202610180009"
+down_revision = "202610180008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scan_logs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "owner_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "anchor_id",
+            sa.Integer(),
+            sa.ForeignKey("anchors.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "device", sa.String(length=16), nullable=False, server_default="iphone"
+        ),
+        sa.Column("location", sa.String(length=64), nullable=True),
+        sa.Column(
+            "at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index("ix_scan_logs_owner_id_at", "scan_logs", ["owner_id", "at"])
+    op.create_index("ix_scan_logs_anchor_id_at", "scan_logs", ["anchor_id", "at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scan_logs_anchor_id_at", table_name="scan_logs")
+    op.drop_index("ix_scan_logs_owner_id_at", table_name="scan_logs")
+    op.drop_table("scan_logs")
@@ -0,0 +1,64 @@
+"""Denormalise breadcrumb ownership and allow one active breadcrumb per owner
+
+Existing rows are backfilled from their anchor's zone, and all but the newest
+active breadcrumb per owner are deactivated before the partial unique index
+is built. SQLite cannot add constraints to an existing column, so the NOT
+NULL and foreign key are only applied on Postgres there; the ORM model
+enforces both for new rows.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202610180010"
+down_revision = "202610180009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    op.add_column("breadcrumbs", sa.Column("owner_id", sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE breadcrumbs SET owner_id = ("
+        "SELECT zones.owner_id FROM anchors JOIN zones ON zones.id = anchors.zone_id "
+        "WHERE anchors.id = breadcrumbs.anchor_id)"
+    )
+    op.execute("DELETE FROM breadcrumbs WHERE owner_id IS NULL")
+    op.execute(
+        sa.text(
+            "UPDATE breadcrumbs SET active = :inactive WHERE active AND id NOT IN ("
+            "SELECT max(id) FROM breadcrumbs WHERE active GROUP BY owner_id)"
+        ).bindparams(inactive=False)
+    )
+    if dialect == "postgresql":
+        op.alter_column("breadcrumbs", "owner_id", nullable=False)
+        op.create_foreign_key(
+            "breadcrumbs_owner_id_fkey",
+            "breadcrumbs",
+            "users",
+            ["owner_id"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+    op.create_index(
+        "ix_breadcrumbs_owner_id_started_at", "breadcrumbs", ["owner_id", "started_at"]
+    )
+    op.create_index(
+        "ux_breadcrumbs_owner_id_active",
+        "breadcrumbs",
+        ["owner_id"],
+        unique=True,
+        postgresql_where=sa.text("active"),
+        sqlite_where=sa.text("active"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_breadcrumbs_owner_id_active", table_name="breadcrumbs")
+    op.drop_index("ix_breadcrumbs_owner_id_started_at", table_name="breadcrumbs")
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_constraint("breadcrumbs_owner_id_fkey", "breadcrumbs", type_="foreignkey")
+    op.drop_column("breadcrumbs", "owner_id")
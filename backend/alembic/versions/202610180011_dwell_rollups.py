@@ -0,0 +1,42 @@
+"""Add incrementally maintained breadcrumb dwell-time rollups"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202610180011"
+down_revision = "202610180010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dwell_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "owner_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("period", sa.String(length=8), nullable=False),
+        sa.Column("scope", sa.String(length=8), nullable=False),
+        sa.Column("bucket", sa.Date(), nullable=False),
+        sa.Column("scope_id", sa.Integer(), nullable=False),
+        sa.Column("seconds", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("sessions", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("interruptions", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index(
+        "ux_dwell_rollups_owner_period_scope_bucket",
+        "dwell_rollups",
+        ["owner_id", "period", "scope", "bucket", "scope_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_dwell_rollups_owner_period_scope_bucket", table_name="dwell_rollups")
+    op.drop_table("dwell_rollups")
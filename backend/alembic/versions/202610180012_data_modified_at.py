@@ -0,0 +1,19 @@
+"""Record when each owner's data last changed"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202610180012"
+down_revision = "202610180011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("data_modified_at", sa.DateTime(timezone=True)))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "data_modified_at")
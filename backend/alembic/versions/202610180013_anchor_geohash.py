@@ -0,0 +1,55 @@
+"""Index anchor coordinates by geohash for nearby lookups
+
+The encoder is inlined so the migration does not depend on application code.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202610180013"
+down_revision = "202610180012"
+branch_labels = None
+depends_on = None
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 12
+
+
+def _geohash(latitude: float, longitude: float) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < PRECISION:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value = value << 1 | (coordinate >= middle)
+        interval[0 if coordinate >= middle else 1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def upgrade() -> None:
+    op.add_column("anchors", sa.Column("geohash", sa.String(PRECISION)))
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text(
+            "SELECT id, latitude, longitude FROM anchors "
+            "WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+        )
+    ).all()
+    if rows:
+        bind.execute(
+            sa.text("UPDATE anchors SET geohash = :geohash WHERE id = :id"),
+            [{"id": row.id, "geohash": _geohash(row.latitude, row.longitude)} for row in rows],
+        )
+    op.create_index("ix_anchors_geohash", "anchors", ["geohash"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_anchors_geohash", table_name="anchors")
+    op.drop_column("anchors", "geohash")
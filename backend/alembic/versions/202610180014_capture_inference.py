@@ -0,0 +1,89 @@
+"""Store inferred zones and anchors for inbox captures
+
+SQLite cannot add foreign keys to an existing table, so the constraints on
+the new capture columns are only created on Postgres; the ORM model declares
+them for both.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202610180014"
+down_revision = "202610180013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    op.add_column("captures", sa.Column("inferred_zone_id", sa.Integer()))
+    op.add_column("captures", sa.Column("inferred_anchor_id", sa.Integer()))
+    op.add_column("captures", sa.Column("inference_confidence", sa.Float()))
+    if dialect == "postgresql":
+        op.create_foreign_key(
+            "captures_inferred_zone_id_fkey",
+            "captures",
+            "zones",
+            ["inferred_zone_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+        op.create_foreign_key(
+            "captures_inferred_anchor_id_fkey",
+            "captures",
+            "anchors",
+            ["inferred_anchor_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+
+    op.create_table(
+        "capture_suggestions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "owner_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "capture_id",
+            sa.Integer(),
+            sa.ForeignKey("captures.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column(
+            "zone_id",
+            sa.Integer(),
+            sa.ForeignKey("zones.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("anchor_id", sa.Integer(), sa.ForeignKey("anchors.id", ondelete="CASCADE")),
+        sa.Column("confidence", sa.Float(), nullable=False),
+    )
+    op.create_index(
+        "ux_capture_suggestions_owner_capture_rank",
+        "capture_suggestions",
+        ["owner_id", "capture_id", "rank"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_capture_suggestions_capture_id", "capture_suggestions", ["capture_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_capture_suggestions_capture_id", table_name="capture_suggestions")
+    op.drop_index(
+        "ux_capture_suggestions_owner_capture_rank", table_name="capture_suggestions"
+    )
+    op.drop_table("capture_suggestions")
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_constraint("captures_inferred_anchor_id_fkey", "captures", type_="foreignkey")
+        op.drop_constraint("captures_inferred_zone_id_fkey", "captures", type_="foreignkey")
+    op.drop_column("captures", "inference_confidence")
+    op.drop_column("captures", "inferred_anchor_id")
+    op.drop_column("captures", "inferred_zone_id")
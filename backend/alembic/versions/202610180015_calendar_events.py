@@ -0,0 +1,86 @@
+"""Track imported calendar events and the items materialised for them"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202610180015"
+down_revision = "202610180014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "calendar_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "zone_id",
+            sa.Integer(),
+            sa.ForeignKey("zones.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("uid", sa.String(length=255), nullable=False),
+        sa.Column("recurrence_key", sa.String(length=16), nullable=False, server_default=""),
+        sa.Column("kind", sa.String(length=8), nullable=False),
+        sa.Column("sequence", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("source", sa.Text(), nullable=False),
+        sa.Column("timezone", sa.String(length=64), nullable=True),
+        sa.Column("expanded_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_start", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "ux_calendar_events_zone_uid_recurrence",
+        "calendar_events",
+        ["zone_id", "uid", "recurrence_key"],
+        unique=True,
+    )
+
+    op.create_table(
+        "calendar_occurrences",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "event_id",
+            sa.Integer(),
+            sa.ForeignKey("calendar_events.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("occurs_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "item_id",
+            sa.Integer(),
+            sa.ForeignKey("items.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ux_calendar_occurrences_event_occurs_at",
+        "calendar_occurrences",
+        ["event_id", "occurs_at"],
+        unique=True,
+    )
+    op.create_index("ix_calendar_occurrences_item_id", "calendar_occurrences", ["item_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_calendar_occurrences_item_id", table_name="calendar_occurrences")
+    op.drop_index(
+        "ux_calendar_occurrences_event_occurs_at", table_name="calendar_occurrences"
+    )
+    op.drop_table("calendar_occurrences")
+    op.drop_index("ux_calendar_events_zone_uid_recurrence", table_name="calendar_events")
+    op.drop_table("calendar_events")
@@ -0,0 +1,88 @@
+"""Record who created each item and capture, so zone-less rows stay private
+
+Rows in a zone keep following the zone's owner. Rows without a zone were
+visible to every user, although only their writer's data version and change
+sequence covered them; they now belong to their creator. Existing rows are
+backfilled from their zone or their anchor's zone. A zone-less row goes to
+the only user, or else to the only user who could have written it: one that
+holds an API key (or is the first active user, whom the shared key maps to)
+and whose data version has reached the row's change sequence. If any row is
+still left without a creator while several users exist, the migration stops
+before changing anything. As with breadcrumb ownership, SQLite cannot add
+constraints to an existing column, so the NOT NULL and foreign key are only
+applied on Postgres; the ORM model enforces both for new rows.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202610180016"
+down_revision = "202610180015"
+branch_labels = None
+depends_on = None
+
+ONLY_USER = (
+    "CASE WHEN (SELECT count(*) FROM users) = 1 THEN (SELECT min(id) FROM users) END"
+)
+WRITERS = "SELECT user_id FROM api_keys UNION SELECT min(id) FROM users WHERE is_active"
+
+
+def _creator(table: str) -> str:
+    """SQL for the creator of a ``table`` row, or NULL when it cannot be derived."""
+    candidates = (
+        f"FROM users WHERE users.id IN ({WRITERS}) "
+        f"AND users.data_version >= {table}.change_seq"
+    )
+    return (
+        "COALESCE("
+        f"(SELECT zones.owner_id FROM zones WHERE zones.id = {table}.zone_id), "
+        "(SELECT zones.owner_id FROM anchors JOIN zones ON zones.id = anchors.zone_id "
+        f"WHERE anchors.id = {table}.anchor_id), "
+        f"{ONLY_USER}, "
+        f"CASE WHEN (SELECT count(*) {candidates}) = 1 THEN (SELECT min(users.id) {candidates}) END"
+        ")"
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    users = bind.scalar(sa.text("SELECT count(*) FROM users"))
+    if users > 1:
+        for table in ("items", "captures"):
+            orphans = bind.scalar(
+                sa.text(f"SELECT count(*) FROM {table} WHERE {_creator(table)} IS NULL")
+            )
+            if orphans:
+                raise RuntimeError(
+                    f"{orphans} {table} rows have no zone and no derivable creator among "
+                    f"{users} users; give them a zone (or delete them) and rerun"
+                )
+
+    for table in ("items", "captures"):
+        op.add_column(table, sa.Column("owner_id", sa.Integer(), nullable=True))
+        op.execute(f"UPDATE {table} SET owner_id = {_creator(table)}")
+        # Only left when there are no users to hand the rows to.
+        op.execute(f"DELETE FROM {table} WHERE owner_id IS NULL")
+        if bind.dialect.name == "postgresql":
+            op.alter_column(table, "owner_id", nullable=False)
+            op.create_foreign_key(
+                f"{table}_owner_id_fkey",
+                table,
+                "users",
+                ["owner_id"],
+                ["id"],
+                ondelete="CASCADE",
+            )
+        op.create_index(
+            f"ix_{table}_owner_id_created_at_id", table, ["owner_id", "created_at", "id"]
+        )
+
+
+def downgrade() -> None:
+    for table in ("captures", "items"):
+        op.drop_index(f"ix_{table}_owner_id_created_at_id", table_name=table)
+        if op.get_bind().dialect.name == "postgresql":
+            op.drop_constraint(f"{table}_owner_id_fkey", table, type_="foreignkey")
+        op.drop_column(table, "owner_id")
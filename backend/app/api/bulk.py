@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import insert, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.versioning import bump_data_version
+from app.models.anchor import Anchor
+from app.models.zone import Zone
+
+
+async def owned_scope_ids(
+    db: AsyncSession, owner_id: int, zone_ids: set[int], anchor_ids: set[int]
+) -> tuple[set[int], set[int]]:
+    """Resolve which of the referenced zones and anchors the owner holds, in one query."""
+    selects = []
+    if zone_ids:
+        selects.append(
+            select(literal("zone").label("kind"), Zone.id).where(
+                Zone.id.in_(zone_ids), Zone.owner_id == owner_id
+            )
+        )
+    if anchor_ids:
+        selects.append(
+            select(literal("anchor").label("kind"), Anchor.id)
+            .join(Zone)
+            .where(Anchor.id.in_(anchor_ids), Zone.owner_id == owner_id)
+        )
+    if not selects:
+        return set(), set()
+
+    owned: dict[str, set[int]] = {"zone": set(), "anchor": set()}
+    for kind, row_id in (await db.execute(union_all(*selects))).all():
+        owned[kind].add(row_id)
+    return owned["zone"], owned["anchor"]
+
+
+async def bulk_create(
+    db: AsyncSession, model: type, rows: list[BaseModel], owner_id: int
+) -> dict[str, Any]:
+    """Validate ``rows`` against the owner's scope and insert the valid ones at once.
+
+    Rows pointing at a zone or anchor the owner does not hold are rejected
+    individually; the rest go in as one multi-row ``INSERT ... RETURNING`` in
+    the caller's transaction, stamped with a single change sequence.
+    """
+    zone_ids = {row.zone_id for row in rows if row.zone_id is not None}
+    anchor_ids = {row.anchor_id for row in rows if row.anchor_id is not None}
+    owned_zones, owned_anchors = await owned_scope_ids(db, owner_id, zone_ids, anchor_ids)
+
+    results: list[dict[str, Any]] = []
+    accepted: list[tuple[int, dict[str, Any]]] = []
+    for index, row in enumerate(rows):
+        if row.zone_id is not None and row.zone_id not in owned_zones:
+            results.append({"index": index, "status": "rejected", "detail": "Zone not found"})
+        elif row.anchor_id is not None and row.anchor_id not in owned_anchors:
+            results.append({"index": index, "status": "rejected", "detail": "Anchor not found"})
+        else:
+            accepted.append((index, row.model_dump()))
+
+    if accepted:
+        seq = await bump_data_version(db, owner_id)
+        created = await db.scalars(
+            insert(model).returning(model, sort_by_parameter_order=True),
+            [{**values, "owner_id": owner_id, "change_seq": seq} for _index, values in accepted],
+        )
+        for (index, _values), instance in zip(accepted, created.all()):
+            results.append({"index": index, "status": "created", "data": instance})
+        await db.commit()
+
+    results.sort(key=lambda result: result["index"])
+    return {
+        "created": len(accepted),
+        "rejected": len(rows) - len(accepted),
+        "results": results,
+    }
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.ownership import visible_captures
+from app.core.capture_inference import Suggestion, capture_inference
+from app.db.jobs import job_queue
+from app.db.versioning import bump_data_version, stamp_changes
+from app.models.capture import Capture
+from app.models.capture_suggestion import CaptureSuggestion
+
+
+def inferred_values(suggestions: Sequence[Suggestion]) -> dict[str, object]:
+    """The ``inferred_*`` column values for a capture's ranked suggestions."""
+    best = suggestions[0] if suggestions else None
+    return {
+        "inferred_zone_id": best.zone_id if best else None,
+        "inferred_anchor_id": best.anchor_id if best else None,
+        "inference_confidence": best.confidence if best else None,
+    }
+
+
+async def infer_captures(
+    db: AsyncSession, owner_id: int, captures: Sequence[Capture]
+) -> list[Capture]:
+    """Score inbox captures against the owner's index; the caller commits.
+
+    Captures must be flushed (they need ids). Captures already filed under a
+    zone or anchor are skipped. Returns those whose best guess changed.
+    """
+    inbox = [c for c in captures if c.zone_id is None and c.anchor_id is None]
+    if not inbox:
+        return []
+    index = await capture_inference.get(db, owner_id)
+    results = index.suggest_many([capture.raw_text for capture in inbox])
+    changed = []
+    for capture, suggestions in zip(inbox, results):
+        values = inferred_values(suggestions)
+        if values != {column: getattr(capture, column) for column in values}:
+            changed.append(capture)
+            for column, value in values.items():
+                setattr(capture, column, value)
+    await store_suggestions(
+        db, owner_id, {capture.id: suggestions for capture, suggestions in zip(inbox, results)}
+    )
+    return changed
+
+
+async def infer_captures_job(
+    db: AsyncSession, owner_id: int, capture_ids: list[int]
+) -> None:
+    """Job handler run after a capture POST commits; the request never waits on it."""
+    captures = (await db.scalars(select(Capture).where(Capture.id.in_(capture_ids)))).all()
+    changed = await infer_captures(db, owner_id, captures)
+    if changed:
+        await stamp_changes(db, owner_id, *changed)
+    await db.commit()
+
+
+job_queue.register("infer_captures", infer_captures_job)
+
+
+async def rescore_inbox(db: AsyncSession, owner_id: int) -> dict[str, int]:
+    """Re-score every unassigned capture the owner sees in one pass; the caller commits.
+
+    Only captures whose top suggestion changed are rewritten and stamped with
+    a change sequence, so a rescore with nothing new leaves the feed quiet.
+    """
+    index = await capture_inference.get(db, owner_id)
+    inbox = (
+        await db.execute(
+            visible_captures(owner_id)
+            .with_only_columns(
+                Capture.id,
+                Capture.raw_text,
+                Capture.inferred_zone_id,
+                Capture.inferred_anchor_id,
+                Capture.inference_confidence,
+            )
+            .where(Capture.zone_id.is_(None), Capture.anchor_id.is_(None))
+        )
+    ).all()
+    results = index.suggest_many([row.raw_text for row in inbox])
+
+    changed = []
+    for row, suggestions in zip(inbox, results):
+        values = inferred_values(suggestions)
+        if values != {column: getattr(row, column) for column in values}:
+            changed.append({"id": row.id, **values})
+    if changed:
+        seq = await bump_data_version(db, owner_id)
+        await db.execute(
+            update(Capture).execution_options(synchronize_session=False),
+            [{**values, "change_seq": seq} for values in changed],
+        )
+
+    await db.execute(delete(CaptureSuggestion).where(CaptureSuggestion.owner_id == owner_id))
+    await store_suggestions(
+        db, owner_id, {row.id: suggestions for row, suggestions in zip(inbox, results)}, False
+    )
+    return {
+        "scored": len(inbox),
+        "suggested": sum(1 for suggestions in results if suggestions),
+        "updated": len(changed),
+    }
+
+
+async def store_suggestions(
+    db: AsyncSession,
+    owner_id: int,
+    suggestions: Mapping[int, Sequence[Suggestion]],
+    replace: bool = True,
+) -> None:
+    """Write the owner's ranked suggestions per capture id, replacing older ones."""
+    if replace and suggestions:
+        await db.execute(
+            delete(CaptureSuggestion).where(
+                CaptureSuggestion.owner_id == owner_id,
+                CaptureSuggestion.capture_id.in_(list(suggestions)),
+            )
+        )
+    rows = [
+        {
+            "owner_id": owner_id,
+            "capture_id": capture_id,
+            "rank": rank,
+            "zone_id": suggestion.zone_id,
+            "anchor_id": suggestion.anchor_id,
+            "confidence": suggestion.confidence,
+        }
+        for capture_id, ranked in suggestions.items()
+        for rank, suggestion in enumerate(ranked, 1)
+    ]
+    if rows:
+        await db.execute(insert(CaptureSuggestion), rows)
+
+
+async def forget_inferences(
+    db: AsyncSession, seq: int, zone_ids: Iterable[int], anchor_ids: Iterable[int]
+) -> None:
+    """Drop suggestions and inferred links pointing at zones or anchors being deleted."""
+    zone_ids, anchor_ids = list(zone_ids), list(anchor_ids)
+    await db.execute(
+        delete(CaptureSuggestion).where(
+            or_(
+                CaptureSuggestion.zone_id.in_(zone_ids),
+                CaptureSuggestion.anchor_id.in_(anchor_ids),
+            )
+        )
+    )
+    await db.execute(
+        update(Capture)
+        .where(
+            or_(Capture.inferred_zone_id.in_(zone_ids), Capture.inferred_anchor_id.in_(anchor_ids))
+        )
+        .values(
+            inferred_zone_id=None,
+            inferred_anchor_id=None,
+            inference_confidence=None,
+            change_seq=seq,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
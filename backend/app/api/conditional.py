@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.db.versioning import get_data_state
+from app.models.user import User
+
+CACHE_CONTROL = "private, no-cache"
+
+
+@dataclass
+class OwnerValidators:
+    version: int
+    etag: str
+    last_modified: datetime | None
+
+
+def make_etag(*parts: object) -> str:
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore any W/ prefix.
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def unmodified_since(request: Request, last_modified: datetime | None) -> bool:
+    header = request.headers.get("if-modified-since")
+    # If-None-Match takes precedence when both are sent (RFC 9110, 13.1.3).
+    if not header or last_modified is None or "if-none-match" in request.headers:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    return _utc(last_modified).replace(microsecond=0) <= since
+
+
+def validator_headers(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_utc(last_modified), usegmt=True)
+    return headers
+
+
+def not_modified(etag: str, last_modified: datetime | None = None) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=validator_headers(etag, last_modified),
+    )
+
+
+def set_validators(response: Response, etag: str, last_modified: datetime | None = None) -> None:
+    response.headers.update(validator_headers(etag, last_modified))
+
+
+async def owner_validators(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> OwnerValidators:
+    """Answer a conditional GET from the owner's data version alone.
+
+    Every write bumps the version, so it validates any owner-scoped read. The
+    ETag also covers the path and query string, since each resource and page
+    is a separate representation. A match raises 304 before the route's own
+    queries run; otherwise the validators are set on the eventual response.
+    """
+    version, last_modified = await get_data_state(db, current_user.id)
+    url = request.url.path + ("?" + request.url.query if request.url.query else "")
+    digest = hashlib.blake2b(url.encode(), digest_size=6).hexdigest()
+    etag = make_etag(current_user.id, version, digest)
+    if etag_matches(request, etag) or unmodified_since(request, last_modified):
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=validator_headers(etag, last_modified),
+        )
+    set_validators(response, etag, last_modified)
+    return OwnerValidators(version, etag, last_modified)
+
+
+def _utc(moment: datetime) -> datetime:
+    # SQLite returns naive UTC timestamps.
+    return moment.replace(tzinfo=UTC) if moment.tzinfo is None else moment.astimezone(UTC)
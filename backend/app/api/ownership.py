@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import aliased
+
+from app.models.anchor import Anchor
+from app.models.breadcrumb import Breadcrumb
+from app.models.capture import Capture
+from app.models.item import Item
+from app.models.zone import Zone
+
+
+def owned_zones(owner_id: int) -> Select[tuple[Zone]]:
+    return select(Zone).where(Zone.owner_id == owner_id)
+
+
+def owned_anchors(owner_id: int) -> Select[tuple[Anchor]]:
+    return select(Anchor).join(Zone).where(Zone.owner_id == owner_id)
+
+
+def visible_items(owner_id: int) -> Select[tuple[Item]]:
+    """Items in the owner's zones, plus the zone-less items they created."""
+    return (
+        select(Item)
+        .join(Zone, Item.zone_id == Zone.id, isouter=True)
+        .where((Zone.owner_id == owner_id) | (Zone.id.is_(None) & (Item.owner_id == owner_id)))
+    )
+
+
+def visible_captures(owner_id: int) -> Select[tuple[Capture]]:
+    """Captures whose zone and anchor (when set) both belong to ``owner_id``.
+
+    Captures with neither are only visible to the user who created them.
+    """
+    anchor_zone = aliased(Zone)
+    return (
+        select(Capture)
+        .join(Zone, Capture.zone_id == Zone.id, isouter=True)
+        .join(Anchor, Capture.anchor_id == Anchor.id, isouter=True)
+        .join(anchor_zone, Anchor.zone_id == anchor_zone.id, isouter=True)
+        .where((Zone.id.is_(None)) | (Zone.owner_id == owner_id))
+        .where((anchor_zone.id.is_(None)) | (anchor_zone.owner_id == owner_id))
+        .where(Zone.id.is_not(None) | anchor_zone.id.is_not(None) | (Capture.owner_id == owner_id))
+    )
+
+
+def owned_breadcrumbs(owner_id: int) -> Select[tuple[Breadcrumb]]:
+    return select(Breadcrumb).where(Breadcrumb.owner_id == owner_id)
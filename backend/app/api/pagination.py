@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, TypeVar
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Select, String, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+T = TypeVar("T")
+
+
+class PageParams:
+    """Query parameters shared by every keyset-paginated list route."""
+
+    def __init__(
+        self,
+        cursor: str | None = Query(default=None, description="Opaque cursor from next_cursor"),
+        limit: int = Query(default=DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    ) -> None:
+        self.cursor = cursor
+        self.limit = limit
+
+
+def encode_cursor(values: list[Any]) -> str:
+    raw = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: list[InstrumentedAttribute]) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor shape mismatch")
+        return [
+            datetime.fromisoformat(value) if key.type.python_type is datetime else value
+            for key, value in zip(keys, values)
+        ]
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor"
+        ) from exc
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select[tuple[T]],
+    keys: list[InstrumentedAttribute],
+    page: PageParams,
+    descending: bool = False,
+    scalars: bool = True,
+) -> dict[str, Any]:
+    """Apply a keyset window over ``keys`` and return a page payload.
+
+    ``keys`` must end with a unique column so the ordering is total; each
+    page is then a single range scan over an index on the same columns.
+    Pass ``scalars=False`` to page over multi-column rows instead of entities.
+    """
+    if page.cursor is not None:
+        after = decode_cursor(page.cursor, keys)
+        if db.get_bind().dialect.name == "sqlite":
+            after = [_sqlite_timestamp(value) for value in after]
+        row_key = tuple_(*keys)
+        stmt = stmt.where(row_key < tuple_(*after) if descending else row_key > tuple_(*after))
+
+    order = [key.desc() if descending else key.asc() for key in keys]
+    result = await db.execute(stmt.order_by(*order).limit(page.limit + 1))
+    rows = list(result.scalars().all() if scalars else result.all())
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, key.key) for key in keys])
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+def _sqlite_timestamp(value: Any) -> Any:
+    # SQLite keeps server-default timestamps as 'YYYY-MM-DD HH:MM:SS' text, while
+    # bound datetimes always carry microseconds; compare in the stored form.
+    if isinstance(value, datetime) and value.microsecond == 0:
+        return literal(value.strftime("%Y-%m-%d %H:%M:%S"), String())
+    return value
@@ -2,7 +2,20 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
-from . import anchors, breadcrumbs, captures, items, zones
+from . import (
+    analytics,
+    anchors,
+    breadcrumbs,
+    captures,
+    changes,
+    diagnostics,
+    export,
+    items,
+    scans,
+    search,
+    snapshot,
+    zones,
+)
 
 api_router = APIRouter()
 api_router.include_router(zones.router, prefix="/zones", tags=["zones"])
@@ -10,5 +23,12 @@ api_router.include_router(anchors.router, prefix="/anchors", tags=["anchors"])
 api_router.include_router(items.router, prefix="/items", tags=["items"])
 api_router.include_router(captures.router, prefix="/captures", tags=["captures"])
 api_router.include_router(breadcrumbs.router, prefix="/breadcrumbs", tags=["breadcrumbs"])
+api_router.include_router(changes.router, prefix="/changes", tags=["changes"])
+api_router.include_router(diagnostics.router, prefix="/diagnostics", tags=["diagnostics"])
+api_router.include_router(snapshot.router, prefix="/snapshot", tags=["snapshot"])
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(scans.router, prefix="/scan", tags=["scans"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
 
 __all__ = ["api_router"]
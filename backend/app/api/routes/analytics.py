@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.api.ownership import owned_anchors, owned_breadcrumbs
+from app.db.dwell import (
+    DwellPeriod,
+    DwellScope,
+    DwellTotals,
+    accumulate,
+    bucket_start,
+    new_totals,
+)
+from app.models.anchor import Anchor
+from app.models.breadcrumb import Breadcrumb
+from app.models.dwell_rollup import DwellRollup
+from app.models.user import User
+from app.models.zone import Zone
+from app.schemas.analytics import DwellReport
+
+router = APIRouter()
+
+DEFAULT_BUCKETS = {"day": 7, "week": 8, "month": 6}
+MAX_BUCKETS = 366
+
+
+@router.get("/dwell", response_model=DwellReport)
+async def dwell_report(
+    period: DwellPeriod = Query(default="day"),
+    scope: DwellScope = Query(default="anchor"),
+    since: date | None = Query(default=None, description="First bucket (default: recent window)"),
+    until: date | None = Query(default=None, description="Last bucket (defaults to now)"),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> dict[str, object]:
+    """Time spent per anchor or zone in each day, week or month bucket.
+
+    Reads only the precomputed rollups plus the breadcrumb that is still open,
+    so the cost does not grow with breadcrumb history.
+    """
+    now = datetime.now(UTC)
+    last = bucket_start(until or now.date(), period)
+    first = since and bucket_start(since, period)
+    if first is None:
+        first = last
+        for _ in range(DEFAULT_BUCKETS[period] - 1):
+            first = _previous_bucket(first, period)
+    if first > last:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="since must not be after until"
+        )
+    if _bucket_count(first, last, period) > MAX_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Ranges are limited to {MAX_BUCKETS} buckets",
+        )
+
+    rows = await db.execute(
+        select(
+            DwellRollup.bucket,
+            DwellRollup.scope_id,
+            DwellRollup.seconds,
+            DwellRollup.sessions,
+            DwellRollup.interruptions,
+        ).where(
+            DwellRollup.owner_id == current_user.id,
+            DwellRollup.period == period,
+            DwellRollup.scope == scope,
+            DwellRollup.bucket.between(first, last),
+        )
+    )
+    totals = new_totals()
+    for bucket, scope_id, seconds, sessions, interruptions in rows.all():
+        totals[period, scope, bucket, scope_id] = [seconds, sessions, interruptions]
+    await _add_open_breadcrumb(db, current_user.id, totals, now)
+
+    names = await _scope_names(db, current_user.id, scope, {key[3] for key in totals})
+    buckets: dict[date, list[dict[str, object]]] = {}
+    for (entry_period, entry_scope, bucket, scope_id), values in totals.items():
+        if (entry_period, entry_scope) != (period, scope) or not first <= bucket <= last:
+            continue
+        if scope_id not in names:
+            # Anchor or zone deleted since; its time still counts towards its zone.
+            continue
+        seconds, sessions, interruptions = values
+        buckets.setdefault(bucket, []).append(
+            {
+                "scope_id": scope_id,
+                "name": names[scope_id],
+                "seconds": seconds,
+                "sessions": sessions,
+                "interruptions": interruptions,
+            }
+        )
+
+    return {
+        "period": period,
+        "scope": scope,
+        "since": first,
+        "until": last,
+        "buckets": [
+            {
+                "bucket": bucket,
+                "seconds": sum(entry["seconds"] for entry in entries),
+                "entries": sorted(entries, key=lambda entry: -entry["seconds"]),
+            }
+            for bucket, entries in sorted(buckets.items())
+        ],
+    }
+
+
+async def _add_open_breadcrumb(
+    db: AsyncSession, owner_id: int, totals: DwellTotals, now: datetime
+) -> None:
+    # The active crumb is only rolled up when it stops; count its time so far.
+    current = (
+        await db.execute(
+            owned_breadcrumbs(owner_id)
+            .with_only_columns(Breadcrumb.anchor_id, Breadcrumb.started_at, Anchor.zone_id)
+            .join(Anchor, Anchor.id == Breadcrumb.anchor_id)
+            .where(Breadcrumb.active.is_(True))
+            .limit(1)
+        )
+    ).first()
+    if current is not None:
+        anchor_id, started_at, zone_id = current
+        accumulate(totals, anchor_id, zone_id, started_at, now)
+
+
+async def _scope_names(
+    db: AsyncSession, owner_id: int, scope: str, scope_ids: set[int]
+) -> dict[int, str]:
+    if not scope_ids:
+        return {}
+    if scope == "zone":
+        stmt = select(Zone.id, Zone.name).where(Zone.owner_id == owner_id, Zone.id.in_(scope_ids))
+    else:
+        stmt = owned_anchors(owner_id).with_only_columns(Anchor.id, Anchor.name)
+        stmt = stmt.where(Anchor.id.in_(scope_ids))
+    return dict((await db.execute(stmt)).all())
+
+
+def _previous_bucket(bucket: date, period: str) -> date:
+    return bucket_start(bucket - timedelta(days=1), period)
+
+
+def _bucket_count(first: date, last: date, period: str) -> int:
+    if period == "month":
+        return (last.year - first.year) * 12 + last.month - first.month + 1
+    return (last - first).days // (7 if period == "week" else 1) + 1
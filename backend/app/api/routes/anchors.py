@@ -1,83 +1,229 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from sqlalchemy.orm import Session
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.api.capture_suggestions import forget_inferences
+from app.api.conditional import owner_validators
+from app.api.pagination import PageParams, paginate
+from app.api.serialization import anchor_rows, page_response
+from app.core.anchor_clusters import MAX_ZOOM, BoundingBox, anchor_cluster_cache
+from app.core.anchor_keys import AnchorKey, anchor_key_resolver
+from app.core.geo import (
+    haversine_m,
+    neighbour_prefixes,
+    prefix_upper_bound,
+    search_precision,
+)
+from app.db.anchor_import import csv_records, import_records
+from app.db.versioning import (
+    bump_data_version,
+    record_tombstones,
+    stamp_changes,
+    touch_rows,
+)
 from app.models.anchor import Anchor
+from app.models.capture import Capture
+from app.models.item import Item
 from app.models.user import User
 from app.models.zone import Zone
-from app.schemas.anchor import AnchorCreate, AnchorRead, AnchorUpdate
+from app.schemas.anchor import (
+    AnchorClusters,
+    AnchorCreate,
+    AnchorImportResult,
+    AnchorNearby,
+    AnchorRead,
+    AnchorResolution,
+    AnchorUpdate,
+)
+from app.schemas.page import Page
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[AnchorRead])
-def list_anchors(
+@router.get(
+    "/",
+    responses={200: {"model": Page[AnchorRead]}},
+    dependencies=[Depends(owner_validators)],
+)
+async def list_anchors(
+    response: Response,
     zone_id: int | None = Query(default=None),
-    db: Session = Depends(deps.get_db),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
-) -> list[Anchor]:
-    query = db.query(Anchor).join(Zone)
-    query = query.filter(Zone.owner_id == current_user.id)
+) -> Response:
+    stmt = select(*anchor_rows.columns).join(Zone).where(Zone.owner_id == current_user.id)
     if zone_id is not None:
-        query = query.filter(Anchor.zone_id == zone_id)
-    return query.order_by(Anchor.name.asc()).all()
+        stmt = stmt.where(Anchor.zone_id == zone_id)
+    rows = await paginate(db, stmt, [Anchor.name, Anchor.id], page, scalars=False)
+    return page_response(anchor_rows, rows, response)
 
 
 @router.post("/", response_model=AnchorRead, status_code=status.HTTP_201_CREATED)
-def create_anchor(
+async def create_anchor(
     anchor_in: AnchorCreate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Anchor:
-    _ensure_zone_access(anchor_in.zone_id, current_user, db)
+    await _ensure_zone_access(anchor_in.zone_id, current_user, db)
     anchor = Anchor(**anchor_in.model_dump())
     db.add(anchor)
-    db.commit()
-    db.refresh(anchor)
+    await stamp_changes(db, current_user.id, anchor)
+    await db.commit()
+    await db.refresh(anchor)
     return anchor
 
 
+@router.post(
+    "/import",
+    response_model=AnchorImportResult,
+    openapi_extra={"requestBody": {"content": {"text/csv": {"schema": {"type": "string"}}}}},
+)
+async def import_anchors(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> dict[str, int]:
+    """Upsert anchors from a CSV request body (``anchor_id,friendly_label,zone``)."""
+    try:
+        stats = await import_records(db, current_user.id, csv_records(request.stream()))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    await db.commit()
+    return stats.as_dict()
+
+
+@router.get("/resolve", response_model=AnchorResolution)
+async def resolve_anchor(
+    payload: str = Query(
+        min_length=1,
+        max_length=512,
+        description="Anchor key, ANCHOR:<ID> text, deep-link URL, or KEY-PREFIX-*",
+    ),
+    limit: int = Query(default=10, ge=1, le=50),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> dict[str, object]:
+    """Resolve a scanned payload from memory: exact key, then close typos, then prefix."""
+    index = await anchor_key_resolver.get(db, current_user.id)
+    key, match, anchors = index.resolve(payload, limit)
+    return {
+        "key": key,
+        "match": match,
+        "anchors": [
+            {
+                "id": anchor.id,
+                "anchor_id": anchor.anchor_id,
+                "name": anchor.name,
+                "zone_id": anchor.zone_id,
+                "distance": distance,
+            }
+            for distance, anchor in anchors
+        ],
+    }
+
+
+@router.get(
+    "/nearby", response_model=list[AnchorNearby], dependencies=[Depends(owner_validators)]
+)
+async def nearby_anchors(
+    lat: float = Query(ge=-90, le=90),
+    lon: float = Query(ge=-180, le=180),
+    radius: float = Query(default=1000, gt=0, le=50_000, description="Metres"),
+    limit: int = Query(default=20, ge=1, le=200),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> list[dict[str, object]]:
+    """Anchors within ``radius`` metres of a point, nearest first.
+
+    The geohash index narrows the scan to the nine grid cells around the point;
+    exact distances are then computed for those candidates in one pass.
+    """
+    precision = search_precision(lat, radius)
+    cells = []
+    for prefix in neighbour_prefixes(lat, lon, precision):
+        upper = prefix_upper_bound(prefix)
+        lower = Anchor.geohash >= prefix
+        cells.append(and_(lower, Anchor.geohash < upper) if upper is not None else lower)
+    rows = (
+        await db.execute(
+            select(*anchor_rows.columns)
+            .join(Zone)
+            .where(Zone.owner_id == current_user.id, or_(*cells))
+        )
+    ).all()
+    if not rows:
+        return []
+    distances = haversine_m(
+        lat, lon, [row.latitude for row in rows], [row.longitude for row in rows]
+    )
+    order = np.argsort(distances, kind="stable")
+    order = order[distances[order] <= radius][:limit]
+    anchors = anchor_rows.dicts(rows[index] for index in order)
+    return [
+        {"anchor": anchor, "distance_m": round(float(distances[index]), 1)}
+        for anchor, index in zip(anchors, order)
+    ]
+
+
+@router.get(
+    "/clusters", response_model=AnchorClusters, dependencies=[Depends(owner_validators)]
+)
+async def anchor_clusters(
+    bbox: str = Query(description="west,south,east,north"),
+    zoom: int = Query(ge=0, le=MAX_ZOOM),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> dict[str, object]:
+    """Anchors in ``bbox`` grouped into map grid cells, for drawing at ``zoom``.
+
+    Each cluster carries its count, centroid and per-zone counts; a cluster of
+    one names its anchor. Very large boxes are clustered at a lower zoom so the
+    payload stays bounded, and the zoom used is returned.
+    """
+    try:
+        box = BoundingBox.parse(bbox)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    zoom = box.cluster_zoom(zoom)
+    anchors = await anchor_cluster_cache.get(db, current_user.id)
+    return {"zoom": zoom, "clusters": anchors.level(zoom).within(box)}
+
+
 @router.get("/{anchor_key}", response_model=AnchorRead)
-def get_anchor(
+async def get_anchor(
     anchor_key: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
-) -> Anchor:
-    anchor = (
-        db.query(Anchor)
-        .join(Zone)
-        .filter(Anchor.anchor_id == anchor_key, Zone.owner_id == current_user.id)
-        .first()
-    )
+) -> AnchorKey:
+    """Look an anchor up by key from the owner's cached index, without a query once warm."""
+    index = await anchor_key_resolver.get(db, current_user.id)
+    anchor = index.exact(anchor_key)
     if anchor is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Anchor not found")
     return anchor
 
 
 @router.put("/{anchor_id}", response_model=AnchorRead)
-def update_anchor(
+async def update_anchor(
     anchor_id: int,
     anchor_in: AnchorUpdate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Anchor:
-    anchor = (
-        db.query(Anchor)
-        .join(Zone)
-        .filter(Anchor.id == anchor_id, Zone.owner_id == current_user.id)
-        .first()
-    )
-    if anchor is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Anchor not found")
+    anchor = await _get_owned_anchor(anchor_id, current_user, db)
 
     for key, value in anchor_in.model_dump(exclude_unset=True).items():
         setattr(anchor, key, value)
 
     db.add(anchor)
-    db.commit()
-    db.refresh(anchor)
+    await stamp_changes(db, current_user.id, anchor)
+    await db.commit()
+    await db.refresh(anchor)
     return anchor
 
 
@@ -86,30 +232,37 @@ def update_anchor(
     status_code=status.HTTP_204_NO_CONTENT,
     response_class=Response,
 )
-def delete_anchor(
+async def delete_anchor(
     anchor_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Response:
-    anchor = (
-        db.query(Anchor)
+    anchor = await _get_owned_anchor(anchor_id, current_user, db)
+
+    seq = await bump_data_version(db, current_user.id)
+    record_tombstones(db, current_user.id, "anchor", [anchor.id], seq)
+    await touch_rows(db, Item, seq, Item.anchor_id == anchor.id)
+    await touch_rows(db, Capture, seq, Capture.anchor_id == anchor.id)
+    await forget_inferences(db, seq, [], [anchor.id])
+    await db.delete(anchor)
+    await db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+async def _get_owned_anchor(anchor_id: int, current_user: User, db: AsyncSession) -> Anchor:
+    anchor = await db.scalar(
+        select(Anchor)
         .join(Zone)
-        .filter(Anchor.id == anchor_id, Zone.owner_id == current_user.id)
-        .first()
+        .where(Anchor.id == anchor_id, Zone.owner_id == current_user.id)
     )
     if anchor is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Anchor not found")
-
-    db.delete(anchor)
-    db.commit()
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return anchor
 
 
-def _ensure_zone_access(zone_id: int, current_user: User, db: Session) -> None:
-    zone = (
-        db.query(Zone)
-        .filter(Zone.id == zone_id, Zone.owner_id == current_user.id)
-        .first()
+async def _ensure_zone_access(zone_id: int, current_user: User, db: AsyncSession) -> None:
+    zone_exists = await db.scalar(
+        select(Zone.id).where(Zone.id == zone_id, Zone.owner_id == current_user.id)
     )
-    if zone is None:
+    if zone_exists is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Zone not found")
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import Update, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.api.conditional import owner_validators
+from app.api.ownership import owned_breadcrumbs
+from app.db.dwell import record_dwell
+from app.db.versioning import bump_data_version
 from app.models.anchor import Anchor
 from app.models.breadcrumb import Breadcrumb
 from app.models.user import User
@@ -16,92 +22,121 @@ from app.schemas.breadcrumb import (
 
 router = APIRouter()
 
+START_ATTEMPTS = 3
 
-@router.get("/", response_model=list[BreadcrumbRead])
-def list_breadcrumbs(
-    db: Session = Depends(deps.get_db),
+
+@router.get("/", response_model=list[BreadcrumbRead], dependencies=[Depends(owner_validators)])
+async def list_breadcrumbs(
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> list[Breadcrumb]:
-    return (
-        db.query(Breadcrumb)
-        .join(Anchor)
-        .join(Zone)
-        .filter(Zone.owner_id == current_user.id)
-        .order_by(Breadcrumb.started_at.desc())
-        .limit(20)
-        .all()
-    )
+    stmt = owned_breadcrumbs(current_user.id).order_by(Breadcrumb.started_at.desc()).limit(20)
+    return list((await db.scalars(stmt)).all())
 
 
-@router.get("/current", response_model=BreadcrumbRead | None)
-def current_breadcrumb(
-    db: Session = Depends(deps.get_db),
+@router.get(
+    "/current",
+    response_model=BreadcrumbRead | None,
+    dependencies=[Depends(owner_validators)],
+)
+async def current_breadcrumb(
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Breadcrumb | None:
-    return (
-        db.query(Breadcrumb)
-        .join(Anchor)
-        .join(Zone)
-        .filter(Zone.owner_id == current_user.id)
-        .filter(Breadcrumb.active.is_(True))
-        .first()
+    return await db.scalar(
+        owned_breadcrumbs(current_user.id).where(Breadcrumb.active.is_(True)).limit(1)
     )
 
 
 @router.post("/start", response_model=BreadcrumbRead, status_code=status.HTTP_201_CREATED)
-def start_breadcrumb(
+async def start_breadcrumb(
     payload: BreadcrumbStart,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Breadcrumb:
-    _ensure_anchor_access(payload.anchor_id, current_user, db)
-
-    active = (
-        db.query(Breadcrumb)
-        .join(Anchor)
-        .join(Zone)
-        .filter(Zone.owner_id == current_user.id, Breadcrumb.active.is_(True))
-        .all()
+    await _ensure_anchor_access(payload.anchor_id, current_user, db)
+
+    # The version bump locks the owner's row first, so concurrent starts queue
+    # behind each other; the partial unique index catches anything that slips by.
+    for _attempt in range(START_ATTEMPTS):
+        try:
+            seq = await bump_data_version(db, current_user.id)
+            closed = await db.execute(
+                _deactivate(current_user.id)
+                .values(active=False, change_seq=seq)
+                .returning(Breadcrumb.anchor_id, Breadcrumb.started_at, Breadcrumb.last_action_at)
+            )
+            for anchor_id, started_at, ended_at in closed.all():
+                await record_dwell(
+                    db,
+                    current_user.id,
+                    anchor_id,
+                    started_at,
+                    ended_at,
+                    interrupted=anchor_id != payload.anchor_id,
+                )
+            breadcrumb = await db.scalar(
+                insert(Breadcrumb)
+                .values(
+                    owner_id=current_user.id,
+                    anchor_id=payload.anchor_id,
+                    active=True,
+                    change_seq=seq,
+                )
+                .returning(Breadcrumb)
+            )
+            await db.commit()
+            return breadcrumb
+        except IntegrityError:
+            await db.rollback()
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT, detail="Another breadcrumb start is in progress"
     )
-    for crumb in active:
-        crumb.active = False
-
-    breadcrumb = Breadcrumb(anchor_id=payload.anchor_id, active=True)
-    db.add(breadcrumb)
-    db.commit()
-    db.refresh(breadcrumb)
-    return breadcrumb
 
 
 @router.post("/stop", response_model=BreadcrumbRead | None)
-def stop_breadcrumb(
+async def stop_breadcrumb(
     payload: BreadcrumbStop,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Breadcrumb | None:
-    query = db.query(Breadcrumb).join(Anchor).join(Zone).filter(Zone.owner_id == current_user.id)
+    stmt = _deactivate(current_user.id)
     if payload.breadcrumb_id is not None:
-        query = query.filter(Breadcrumb.id == payload.breadcrumb_id)
-    else:
-        query = query.filter(Breadcrumb.active.is_(True))
+        stmt = stmt.where(Breadcrumb.id == payload.breadcrumb_id)
 
-    breadcrumb = query.first()
+    seq = await bump_data_version(db, current_user.id)
+    breadcrumb = await db.scalar(
+        stmt.values(active=False, change_seq=seq).returning(Breadcrumb)
+    )
     if breadcrumb is None:
-        return None
-
-    breadcrumb.active = False
-    db.add(breadcrumb)
-    db.commit()
-    db.refresh(breadcrumb)
+        # Nothing was active; undo the version bump. A named crumb that is
+        # already stopped is still answered, as stopping it again is a no-op.
+        await db.rollback()
+        if payload.breadcrumb_id is None:
+            return None
+        return await db.scalar(
+            owned_breadcrumbs(current_user.id).where(Breadcrumb.id == payload.breadcrumb_id)
+        )
+    await record_dwell(
+        db, current_user.id, breadcrumb.anchor_id, breadcrumb.started_at, breadcrumb.last_action_at
+    )
+    await db.commit()
     return breadcrumb
 
 
-def _ensure_anchor_access(anchor_id: int, current_user: User, db: Session) -> None:
-    anchor = (
-        db.query(Anchor)
+def _deactivate(owner_id: int) -> Update:
+    return (
+        update(Breadcrumb)
+        .where(Breadcrumb.owner_id == owner_id, Breadcrumb.active.is_(True))
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _ensure_anchor_access(anchor_id: int, current_user: User, db: AsyncSession) -> None:
+    anchor_exists = await db.scalar(
+        select(Anchor.id)
         .join(Zone)
-        .filter(Anchor.id == anchor_id, Zone.owner_id == current_user.id)
-        .first()
+        .where(Anchor.id == anchor_id, Zone.owner_id == current_user.id)
     )
-    if anchor is None:
+    if anchor_exists is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Anchor not found")
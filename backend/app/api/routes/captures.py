@@ -1,71 +1,158 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.api.conditional import owner_validators
+from app.api.bulk import bulk_create
+from app.api.capture_suggestions import rescore_inbox
+from app.api.ownership import visible_captures
+from app.api.pagination import PageParams, paginate
+from app.api.serialization import capture_rows, page_response
+from app.db.jobs import job_queue
+from app.db.versioning import stamp_changes
 from app.models.anchor import Anchor
 from app.models.capture import Capture
+from app.models.capture_suggestion import CaptureSuggestion
 from app.models.user import User
 from app.models.zone import Zone
-from app.schemas.capture import CaptureCreate, CaptureRead
+from app.schemas.bulk import BulkResult
+from app.schemas.capture import (
+    CaptureBulkCreate,
+    CaptureCreate,
+    CaptureInferenceResult,
+    CaptureRead,
+    CaptureSuggestionRead,
+)
+from app.schemas.page import Page
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[CaptureRead])
-def list_captures(
-    db: Session = Depends(deps.get_db),
+@router.get(
+    "/",
+    responses={200: {"model": Page[CaptureRead]}},
+    dependencies=[Depends(owner_validators)],
+)
+async def list_captures(
+    response: Response,
+    source: str | None = Query(default=None),
+    zone_id: int | None = Query(default=None),
+    anchor_id: int | None = Query(default=None),
+    unassigned: bool = Query(
+        default=False, description="Only inbox captures with no zone or anchor"
+    ),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
-) -> list[Capture]:
-    captures = (
-        db.query(Capture).order_by(Capture.created_at.desc()).limit(50).all()
-    )
-    return [capture for capture in captures if _has_access(capture, current_user)]
+) -> Response:
+    stmt = visible_captures(current_user.id).with_only_columns(*capture_rows.columns)
+    if source is not None:
+        stmt = stmt.where(Capture.source == source)
+    if zone_id is not None:
+        stmt = stmt.where(Capture.zone_id == zone_id)
+    if anchor_id is not None:
+        stmt = stmt.where(Capture.anchor_id == anchor_id)
+    if unassigned:
+        stmt = stmt.where(Capture.zone_id.is_(None), Capture.anchor_id.is_(None))
+    keys = [Capture.created_at, Capture.id]
+    rows = await paginate(db, stmt, keys, page, descending=True, scalars=False)
+    return page_response(capture_rows, rows, response)
 
 
 @router.post("/", response_model=CaptureRead, status_code=status.HTTP_201_CREATED)
-def create_capture(
+async def create_capture(
     capture_in: CaptureCreate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Capture:
-    _validate_scope(capture_in.zone_id, capture_in.anchor_id, current_user, db)
-    capture = Capture(**capture_in.model_dump())
+    await _validate_scope(capture_in.zone_id, capture_in.anchor_id, current_user, db)
+    capture = Capture(**capture_in.model_dump(), owner_id=current_user.id)
     db.add(capture)
-    db.commit()
-    db.refresh(capture)
+    await stamp_changes(db, current_user.id, capture)
+    await db.flush()
+    if capture.zone_id is None and capture.anchor_id is None:
+        job_queue.enqueue_after_commit(
+            db, "infer_captures", owner_id=current_user.id, capture_ids=[capture.id]
+        )
+    await db.commit()
+    await db.refresh(capture)
     return capture
 
 
-def _has_access(capture: Capture, current_user: User) -> bool:
-    if capture.zone and capture.zone.owner_id != current_user.id:
-        return False
-    if capture.anchor and capture.anchor.zone.owner_id != current_user.id:
-        return False
-    return True
+@router.post("/bulk", response_model=BulkResult[CaptureRead])
+async def create_captures_bulk(
+    payload: CaptureBulkCreate,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> dict[str, object]:
+    result = await bulk_create(db, Capture, payload.captures, current_user.id)
+    created = [row["data"] for row in result["results"] if row["status"] == "created"]
+    inbox = [c.id for c in created if c.zone_id is None and c.anchor_id is None]
+    if inbox:
+        # bulk_create has committed already.
+        job_queue.enqueue("infer_captures", owner_id=current_user.id, capture_ids=inbox)
+    return result
+
+
+@router.post("/infer", response_model=CaptureInferenceResult)
+async def infer_inbox(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> dict[str, int]:
+    """Re-score every unassigned capture against the current anchors and zones."""
+    result = await rescore_inbox(db, current_user.id)
+    await db.commit()
+    return result
+
+
+@router.get(
+    "/{capture_id}/suggestions",
+    response_model=list[CaptureSuggestionRead],
+    dependencies=[Depends(owner_validators)],
+)
+async def capture_suggestions(
+    capture_id: int,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> list[CaptureSuggestion]:
+    visible = await db.scalar(
+        visible_captures(current_user.id)
+        .with_only_columns(Capture.id)
+        .where(Capture.id == capture_id)
+    )
+    if visible is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Capture not found")
+    suggestions = await db.scalars(
+        select(CaptureSuggestion)
+        .where(
+            CaptureSuggestion.owner_id == current_user.id,
+            CaptureSuggestion.capture_id == capture_id,
+        )
+        .order_by(CaptureSuggestion.rank)
+    )
+    return list(suggestions.all())
 
 
-def _validate_scope(
+async def _validate_scope(
     zone_id: int | None,
     anchor_id: int | None,
     current_user: User,
-    db: Session,
+    db: AsyncSession,
 ) -> None:
     if zone_id is not None:
-        zone = (
-            db.query(Zone)
-            .filter(Zone.id == zone_id, Zone.owner_id == current_user.id)
-            .first()
+        zone_exists = await db.scalar(
+            select(Zone.id).where(Zone.id == zone_id, Zone.owner_id == current_user.id)
         )
-        if zone is None:
+        if zone_exists is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Zone not found")
     if anchor_id is not None:
-        anchor = (
-            db.query(Anchor)
+        anchor_exists = await db.scalar(
+            select(Anchor.id)
             .join(Zone)
-            .filter(Anchor.id == anchor_id, Zone.owner_id == current_user.id)
-            .first()
+            .where(Anchor.id == anchor_id, Zone.owner_id == current_user.id)
         )
-        if anchor is None:
+        if anchor_exists is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Anchor not found")
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.api.conditional import OwnerValidators, owner_validators
+from app.api.ownership import owned_anchors, owned_zones, visible_captures, visible_items
+from app.core.config import settings
+from app.db.change_stream import change_broker
+from app.db.versioning import get_data_version
+from app.models.anchor import Anchor
+from app.models.capture import Capture
+from app.models.item import Item
+from app.models.tombstone import Tombstone
+from app.models.user import User
+from app.models.zone import Zone
+from app.schemas.change import ChangeSet
+
+router = APIRouter()
+
+
+@router.get("/", response_model=ChangeSet)
+async def list_changes(
+    since: int | None = Query(default=None, ge=0),
+    validators: OwnerValidators = Depends(owner_validators),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> dict[str, object]:
+    """Return rows changed after ``since``; omit it for a full resync.
+
+    The returned ``cursor`` is the owner's data version at read time. Rows
+    stamped after it are left for the next pull, so a client that stores the
+    cursor never skips a change.
+    """
+    cursor = validators.version
+
+    async def window(stmt: Select, model: type) -> list:
+        stmt = stmt.where(model.change_seq <= cursor)
+        if since is not None:
+            stmt = stmt.where(model.change_seq > since)
+        stmt = stmt.order_by(model.change_seq.asc(), model.id.asc())
+        return list((await db.scalars(stmt)).all())
+
+    tombstones: list[Tombstone] = []
+    if since is not None:
+        tombstones = await window(
+            select(Tombstone).where(Tombstone.owner_id == current_user.id), Tombstone
+        )
+
+    return {
+        "cursor": cursor,
+        "zones": await window(owned_zones(current_user.id), Zone),
+        "anchors": await window(owned_anchors(current_user.id), Anchor),
+        "items": await window(visible_items(current_user.id), Item),
+        "captures": await window(visible_captures(current_user.id), Capture),
+        "tombstones": tombstones,
+    }
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_changes(
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> StreamingResponse:
+    """Push the owner's committed changes as server-sent events.
+
+    The first ``ready`` event carries the current cursor; each ``change``
+    event names the new cursor and the entity types touched, for the client
+    to pull from ``/api/changes?since=``. A ``resync`` event means events were
+    dropped because the client fell behind.
+    """
+    # Subscribe before reading the cursor so no commit falls in between.
+    subscription = change_broker.subscribe(current_user.id)
+    cursor = await get_data_version(db, current_user.id)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            yield _sse("ready", {"cursor": cursor})
+            while True:
+                try:
+                    change = await asyncio.wait_for(
+                        subscription.get(), timeout=settings.CHANGE_STREAM_KEEPALIVE
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if change["type"] == "closing":
+                    return
+                yield _sse(change["type"], change)
+        finally:
+            change_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data: dict[str, object]) -> str:
+    payload = {key: value for key, value in data.items() if key != "owner_id"}
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.api import deps
+from app.db.change_stream import change_broker
+from app.db.jobs import job_queue
+from app.db.pool import pool_status
+from app.db.scan_buffer import scan_buffer
+from app.db.session import async_engine, engine
+from app.models.user import User
+
+router = APIRouter()
+
+
+@router.get("/pool")
+async def get_pool_stats(
+    _current_user: User = Depends(deps.get_current_user),
+) -> dict[str, Any]:
+    pools = {"sync": pool_status(engine.pool)}
+    if async_engine is not None:
+        pools["async"] = pool_status(async_engine.sync_engine.pool)
+    return pools
+
+
+@router.get("/scans")
+async def get_scan_buffer_stats(
+    _current_user: User = Depends(deps.get_current_user),
+) -> dict[str, Any]:
+    return scan_buffer.status()
+
+
+@router.get("/changes")
+async def get_change_stream_stats(
+    _current_user: User = Depends(deps.get_current_user),
+) -> dict[str, Any]:
+    return change_broker.status()
+
+
+@router.get("/jobs")
+async def get_job_queue_stats(
+    _current_user: User = Depends(deps.get_current_user),
+) -> dict[str, Any]:
+    return job_queue.status()
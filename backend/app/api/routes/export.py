@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.api.ownership import (
+    owned_anchors,
+    owned_breadcrumbs,
+    owned_zones,
+    visible_captures,
+    visible_items,
+)
+from app.db.session import open_session
+from app.db.versioning import get_data_version
+from app.models.anchor import Anchor
+from app.models.breadcrumb import Breadcrumb
+from app.models.capture import Capture
+from app.models.item import Item
+from app.models.tombstone import Tombstone
+from app.models.user import User
+from app.models.zone import Zone
+from app.schemas.anchor import AnchorRead
+from app.schemas.breadcrumb import BreadcrumbRead
+from app.schemas.capture import CaptureRead
+from app.schemas.change import TombstoneRead
+from app.schemas.item import ItemRead
+from app.schemas.zone import ZoneRead
+
+router = APIRouter()
+
+# Rows fetched per round trip from the server-side cursor.
+EXPORT_BATCH_SIZE = 500
+
+
+@router.get("/", response_class=StreamingResponse)
+async def export_hive(
+    since: int | None = Query(default=None, ge=0),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> StreamingResponse:
+    """Stream the owner's hive as NDJSON, one ``{"type", "data"}`` object per line.
+
+    The first line carries the ``cursor`` to pass as ``since`` next time; the
+    last line carries per-type counts, so a truncated download is detectable.
+    """
+    cursor = await get_data_version(db, current_user.id)
+    return StreamingResponse(
+        _export_lines(current_user.id, cursor, since),
+        media_type="application/x-ndjson",
+        headers={
+            "Content-Disposition": f'attachment; filename="hive-export-{cursor}.ndjson"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+async def _export_lines(owner_id: int, cursor: int, since: int | None) -> AsyncIterator[str]:
+    # The request-scoped session is closed before the body is sent, so the
+    # stream reads through its own session for as long as the client keeps up.
+    sections: list[tuple[str, Select, type, type[BaseModel]]] = [
+        ("zone", owned_zones(owner_id), Zone, ZoneRead),
+        ("anchor", owned_anchors(owner_id), Anchor, AnchorRead),
+        ("item", visible_items(owner_id), Item, ItemRead),
+        ("capture", visible_captures(owner_id), Capture, CaptureRead),
+        ("breadcrumb", owned_breadcrumbs(owner_id), Breadcrumb, BreadcrumbRead),
+    ]
+    if since is not None:
+        tombstones = select(Tombstone).where(Tombstone.owner_id == owner_id)
+        sections.append(("tombstone", tombstones, Tombstone, TombstoneRead))
+
+    yield _line({"type": "export", "data": {"cursor": cursor, "since": since}})
+    counts: dict[str, int] = {}
+    db = open_session()
+    try:
+        for kind, stmt, model, schema in sections:
+            stmt = stmt.where(model.change_seq <= cursor)
+            if since is not None:
+                stmt = stmt.where(model.change_seq > since)
+            stmt = stmt.order_by(model.change_seq.asc(), model.id.asc()).execution_options(
+                yield_per=EXPORT_BATCH_SIZE
+            )
+            counts[kind] = 0
+            rows = await db.stream_scalars(stmt)
+            async for row in rows:
+                data = schema.model_validate(row).model_dump(mode="json")
+                yield _line({"type": kind, "data": data})
+                counts[kind] += 1
+    finally:
+        await db.close()
+    yield _line({"type": "end", "data": counts})
+
+
+def _line(payload: dict[str, object]) -> str:
+    return json.dumps(payload, separators=(",", ":")) + "\n"
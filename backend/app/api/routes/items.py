@@ -1,74 +1,93 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.api.conditional import owner_validators
+from app.api.bulk import bulk_create
+from app.api.ownership import visible_items
+from app.api.pagination import PageParams, paginate
+from app.api.serialization import item_rows, page_response
+from app.db.versioning import bump_data_version, record_tombstones, stamp_changes
 from app.models.anchor import Anchor
 from app.models.item import Item
 from app.models.user import User
 from app.models.zone import Zone
-from app.schemas.item import ItemCreate, ItemRead, ItemUpdate
+from app.schemas.bulk import BulkResult
+from app.schemas.item import ItemBulkCreate, ItemCreate, ItemRead, ItemUpdate
+from app.schemas.page import Page
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[ItemRead])
-def list_items(
+@router.get(
+    "/",
+    responses={200: {"model": Page[ItemRead]}},
+    dependencies=[Depends(owner_validators)],
+)
+async def list_items(
+    response: Response,
     zone_id: int | None = Query(default=None),
     anchor_id: int | None = Query(default=None),
-    db: Session = Depends(deps.get_db),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
-) -> list[Item]:
-    query = db.query(Item).join(Zone, Item.zone_id == Zone.id, isouter=True)
-    query = query.filter((Zone.owner_id == current_user.id) | (Zone.id.is_(None)))
+) -> Response:
+    stmt = visible_items(current_user.id).with_only_columns(*item_rows.columns)
     if zone_id is not None:
-        query = query.filter(Item.zone_id == zone_id)
+        stmt = stmt.where(Item.zone_id == zone_id)
     if anchor_id is not None:
-        query = query.filter(Item.anchor_id == anchor_id)
-    return query.order_by(Item.created_at.desc()).all()
+        stmt = stmt.where(Item.anchor_id == anchor_id)
+    keys = [Item.created_at, Item.id]
+    rows = await paginate(db, stmt, keys, page, descending=True, scalars=False)
+    return page_response(item_rows, rows, response)
 
 
 @router.post("/", response_model=ItemRead, status_code=status.HTTP_201_CREATED)
-def create_item(
+async def create_item(
     item_in: ItemCreate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Item:
-    _validate_scope(item_in.zone_id, item_in.anchor_id, current_user, db)
-    item = Item(**item_in.model_dump())
+    await _validate_scope(item_in.zone_id, item_in.anchor_id, current_user, db)
+    item = Item(**item_in.model_dump(), owner_id=current_user.id)
     db.add(item)
-    db.commit()
-    db.refresh(item)
+    await stamp_changes(db, current_user.id, item)
+    await db.commit()
+    await db.refresh(item)
     return item
 
 
+@router.post("/bulk", response_model=BulkResult[ItemRead])
+async def create_items_bulk(
+    payload: ItemBulkCreate,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> dict[str, object]:
+    return await bulk_create(db, Item, payload.items, current_user.id)
+
+
 @router.patch("/{item_id}", response_model=ItemRead)
-def update_item(
+async def update_item(
     item_id: int,
     item_in: ItemUpdate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Item:
-    item = (
-        db.query(Item)
-        .join(Zone, Item.zone_id == Zone.id, isouter=True)
-        .filter((Zone.owner_id == current_user.id) | (Zone.id.is_(None)))
-        .filter(Item.id == item_id)
-        .first()
-    )
-    if item is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+    item = await _get_visible_item(item_id, current_user, db)
 
     payload = item_in.model_dump(exclude_unset=True)
-    _validate_scope(payload.get("zone_id"), payload.get("anchor_id"), current_user, db)
+    await _validate_scope(payload.get("zone_id"), payload.get("anchor_id"), current_user, db)
 
     for key, value in payload.items():
         setattr(item, key, value)
 
     db.add(item)
-    db.commit()
-    db.refresh(item)
+    await stamp_changes(db, current_user.id, item)
+    await db.commit()
+    await db.refresh(item)
     return item
 
 
@@ -77,47 +96,45 @@ def update_item(
     status_code=status.HTTP_204_NO_CONTENT,
     response_class=Response,
 )
-def delete_item(
+async def delete_item(
     item_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Response:
-    item = (
-        db.query(Item)
-        .join(Zone, Item.zone_id == Zone.id, isouter=True)
-        .filter((Zone.owner_id == current_user.id) | (Zone.id.is_(None)))
-        .filter(Item.id == item_id)
-        .first()
-    )
-    if item is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+    item = await _get_visible_item(item_id, current_user, db)
 
-    db.delete(item)
-    db.commit()
+    seq = await bump_data_version(db, current_user.id)
+    record_tombstones(db, current_user.id, "item", [item.id], seq)
+    await db.delete(item)
+    await db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-def _validate_scope(
+async def _get_visible_item(item_id: int, current_user: User, db: AsyncSession) -> Item:
+    item = await db.scalar(visible_items(current_user.id).where(Item.id == item_id))
+    if item is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+    return item
+
+
+async def _validate_scope(
     zone_id: int | None,
     anchor_id: int | None,
     current_user: User,
-    db: Session,
+    db: AsyncSession,
 ) -> None:
     if zone_id is not None:
-        zone = (
-            db.query(Zone)
-            .filter(Zone.id == zone_id, Zone.owner_id == current_user.id)
-            .first()
+        zone_exists = await db.scalar(
+            select(Zone.id).where(Zone.id == zone_id, Zone.owner_id == current_user.id)
         )
-        if zone is None:
+        if zone_exists is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Zone not found")
 
     if anchor_id is not None:
-        anchor = (
-            db.query(Anchor)
+        anchor_exists = await db.scalar(
+            select(Anchor.id)
             .join(Zone)
-            .filter(Anchor.id == anchor_id, Zone.owner_id == current_user.id)
-            .first()
+            .where(Anchor.id == anchor_id, Zone.owner_id == current_user.id)
         )
-        if anchor is None:
+        if anchor_exists is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Anchor not found")
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Body, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core.anchor_keys import anchor_key_resolver, parse_anchor_payload
+from app.db.scan_buffer import ScanBufferFull, scan_buffer
+from app.models.user import User
+from app.schemas.bulk import MAX_BULK_ROWS
+from app.schemas.scan import ScanAccepted, ScanCreate
+
+router = APIRouter()
+
+
+@router.post("/", response_model=ScanAccepted, status_code=status.HTTP_202_ACCEPTED)
+async def log_scans(
+    payload: ScanCreate | list[ScanCreate] = Body(...),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> dict[str, object]:
+    """Queue one scan or a list of scans for the next batched write.
+
+    Anchor keys resolve against the in-memory index, so a warm request does
+    not touch the database; rows land in ``scan_logs`` within one flush interval.
+    """
+    scans = payload if isinstance(payload, list) else [payload]
+    if len(scans) > MAX_BULK_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BULK_ROWS} scans per request",
+        )
+
+    index = await anchor_key_resolver.get(db, current_user.id)
+    received_at = datetime.now(timezone.utc)
+    rows = []
+    rejected = []
+    for position, scan in enumerate(scans):
+        key, _is_prefix = parse_anchor_payload(scan.anchor_id)
+        anchor = index.exact(key)
+        if anchor is None:
+            rejected.append({"index": position, "detail": "Anchor not found"})
+            continue
+        rows.append(
+            {
+                "owner_id": current_user.id,
+                "anchor_id": anchor.id,
+                "device": scan.device.value,
+                "location": scan.location,
+                "at": scan.at or received_at,
+            }
+        )
+
+    try:
+        scan_buffer.add(rows)
+    except ScanBufferFull as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Scan buffer is full; retry shortly",
+            headers={"Retry-After": "1"},
+        ) from exc
+    return {"accepted": len(rows), "rejected": rejected}
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.api.conditional import owner_validators
+from app.api.pagination import PageParams, paginate
+from app.api.search import ENTITIES, render_snippet, search_statement, search_terms
+from app.models.user import User
+from app.schemas.page import Page
+from app.schemas.search import SearchEntity, SearchHit
+
+router = APIRouter()
+
+
+@router.get("/", response_model=Page[SearchHit], dependencies=[Depends(owner_validators)])
+async def search(
+    q: str = Query(min_length=1, max_length=200),
+    entity: SearchEntity | None = Query(default=None, description="Limit hits to one type"),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> dict[str, object]:
+    """Rank the owner's items, anchors and captures against ``q``.
+
+    Snippets are HTML-escaped text with matched terms wrapped in ``<mark>`` tags.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return {"items": [], "next_cursor": None}
+
+    stmt = search_statement(
+        db.get_bind().dialect.name,
+        current_user.id,
+        terms,
+        (entity,) if entity is not None else ENTITIES,
+    )
+    hits = stmt.selected_columns
+    keys = [hits.rank, hits.entity, hits.entity_id]
+    result = await paginate(db, stmt, keys, page, descending=True, scalars=False)
+    result["items"] = [
+        {**row._mapping, "snippet": render_snippet(row.snippet)} for row in result["items"]
+    ]
+    return result
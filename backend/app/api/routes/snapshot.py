@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.api.conditional import OwnerValidators, owner_validators
+from app.api.ownership import (
+    owned_anchors,
+    owned_breadcrumbs,
+    owned_zones,
+    visible_captures,
+    visible_items,
+)
+from app.api.serialization import (
+    anchor_rows,
+    breadcrumb_rows,
+    capture_rows,
+    dump_json,
+    item_rows,
+    json_object,
+    zone_rows,
+)
+from app.models.anchor import Anchor
+from app.models.breadcrumb import Breadcrumb
+from app.models.capture import Capture
+from app.models.item import Item
+from app.models.user import User
+from app.models.zone import Zone
+from app.schemas.snapshot import SnapshotRead
+
+router = APIRouter()
+
+CAPTURE_LIMIT = 50
+
+
+@router.get("/", responses={200: {"model": SnapshotRead}})
+async def get_snapshot(
+    response: Response,
+    validators: OwnerValidators = Depends(owner_validators),
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> Response:
+    """Everything the dashboard renders on load, encoded straight from SQL rows."""
+    owner_id = current_user.id
+    zones = await db.execute(
+        owned_zones(owner_id).with_only_columns(*zone_rows.columns).order_by(Zone.name.asc())
+    )
+    anchors = await db.execute(
+        owned_anchors(owner_id)
+        .with_only_columns(*anchor_rows.columns)
+        .order_by(Anchor.name.asc())
+    )
+    items = await db.execute(
+        visible_items(owner_id)
+        .with_only_columns(*item_rows.columns)
+        .order_by(Item.created_at.desc())
+    )
+    captures = await db.execute(
+        visible_captures(owner_id)
+        .with_only_columns(*capture_rows.columns)
+        .order_by(Capture.created_at.desc())
+        .limit(CAPTURE_LIMIT)
+    )
+    breadcrumb = await db.execute(
+        owned_breadcrumbs(owner_id)
+        .with_only_columns(*breadcrumb_rows.columns)
+        .where(Breadcrumb.active.is_(True))
+        .limit(1)
+    )
+
+    return json_object(
+        {
+            "version": dump_json(validators.version),
+            "zones": zone_rows.dump(zones.all()),
+            "anchors": anchor_rows.dump(anchors.all()),
+            "items": item_rows.dump(items.all()),
+            "captures": capture_rows.dump(captures.all()),
+            "breadcrumb": breadcrumb_rows.dump_one(breadcrumb.first()),
+        },
+        response,
+    )
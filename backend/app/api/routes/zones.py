@@ -1,100 +1,149 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.api.capture_suggestions import forget_inferences
+from app.api.conditional import owner_validators
+from app.api.pagination import PageParams, paginate
+from app.api.serialization import page_response, zone_rows
+from app.core.ics import ics_components
+from app.db.calendar_import import import_calendar
+from app.db.versioning import (
+    bump_data_version,
+    record_tombstones,
+    stamp_changes,
+    touch_rows,
+)
+from app.models.anchor import Anchor
+from app.models.capture import Capture
+from app.models.item import Item
 from app.models.user import User
 from app.models.zone import Zone
+from app.schemas.page import Page
 from app.schemas.zone import ZoneCreate, ZoneRead, ZoneUpdate
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[ZoneRead])
-def list_zones(
-    db: Session = Depends(deps.get_db),
+@router.get(
+    "/",
+    responses={200: {"model": Page[ZoneRead]}},
+    dependencies=[Depends(owner_validators)],
+)
+async def list_zones(
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
-) -> list[Zone]:
-    return (
-        db.query(Zone)
-        .filter(Zone.owner_id == current_user.id)
-        .order_by(Zone.name.asc())
-        .all()
-    )
+) -> Response:
+    stmt = select(*zone_rows.columns).where(Zone.owner_id == current_user.id)
+    rows = await paginate(db, stmt, [Zone.name, Zone.id], page, scalars=False)
+    return page_response(zone_rows, rows, response)
 
 
 @router.post("/", response_model=ZoneRead, status_code=status.HTTP_201_CREATED)
-def create_zone(
+async def create_zone(
     zone_in: ZoneCreate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Zone:
     zone = Zone(**zone_in.model_dump(), owner_id=current_user.id)
     db.add(zone)
-    db.commit()
-    db.refresh(zone)
+    await stamp_changes(db, current_user.id, zone)
+    await db.commit()
+    await db.refresh(zone)
     return zone
 
 
-@router.get("/{zone_id}", response_model=ZoneRead)
-def get_zone(
+@router.get("/{zone_id}", response_model=ZoneRead, dependencies=[Depends(owner_validators)])
+async def get_zone(
     zone_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Zone:
-    zone = (
-        db.query(Zone)
-        .filter(Zone.id == zone_id, Zone.owner_id == current_user.id)
-        .first()
-    )
-    if zone is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Zone not found")
-    return zone
+    return await _get_owned_zone(zone_id, current_user, db)
 
 
 @router.put("/{zone_id}", response_model=ZoneRead)
-def update_zone(
+async def update_zone(
     zone_id: int,
     zone_in: ZoneUpdate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Zone:
-    zone = (
-        db.query(Zone)
-        .filter(Zone.id == zone_id, Zone.owner_id == current_user.id)
-        .first()
-    )
-    if zone is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Zone not found")
+    zone = await _get_owned_zone(zone_id, current_user, db)
 
     for key, value in zone_in.model_dump(exclude_unset=True).items():
         setattr(zone, key, value)
 
     db.add(zone)
-    db.commit()
-    db.refresh(zone)
+    await stamp_changes(db, current_user.id, zone)
+    await db.commit()
+    await db.refresh(zone)
     return zone
 
 
+@router.post("/{zone_id}/calendar")
+async def import_zone_calendar(
+    zone_id: int,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> dict[str, int]:
+    """Sync the zone's calendar items with the full ICS feed in the request body."""
+    zone = await _get_owned_zone(zone_id, current_user, db)
+    try:
+        stats = await import_calendar(
+            db, current_user.id, zone.id, ics_components(request.stream())
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    await db.commit()
+    return stats.as_dict()
+
+
 @router.delete(
     "/{zone_id}",
     status_code=status.HTTP_204_NO_CONTENT,
     response_class=Response,
 )
-def delete_zone(
+async def delete_zone(
     zone_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Response:
-    zone = (
-        db.query(Zone)
-        .filter(Zone.id == zone_id, Zone.owner_id == current_user.id)
-        .first()
+    zone = await _get_owned_zone(zone_id, current_user, db)
+
+    seq = await bump_data_version(db, current_user.id)
+    await _record_zone_deletion(zone, current_user, seq, db)
+    await db.delete(zone)
+    await db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+async def _get_owned_zone(zone_id: int, current_user: User, db: AsyncSession) -> Zone:
+    zone = await db.scalar(
+        select(Zone).where(Zone.id == zone_id, Zone.owner_id == current_user.id)
     )
     if zone is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Zone not found")
+    return zone
 
-    db.delete(zone)
-    db.commit()
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+async def _record_zone_deletion(
+    zone: Zone, current_user: User, seq: int, db: AsyncSession
+) -> None:
+    """Tombstone the zone with its cascaded rows and stamp rows whose links get nulled."""
+    anchor_ids = (await db.scalars(select(Anchor.id).where(Anchor.zone_id == zone.id))).all()
+    item_ids = (await db.scalars(select(Item.id).where(Item.zone_id == zone.id))).all()
+    record_tombstones(db, current_user.id, "zone", [zone.id], seq)
+    record_tombstones(db, current_user.id, "anchor", anchor_ids, seq)
+    record_tombstones(db, current_user.id, "item", item_ids, seq)
+    await touch_rows(db, Item, seq, Item.anchor_id.in_(anchor_ids))
+    await touch_rows(
+        db, Capture, seq, (Capture.zone_id == zone.id) | Capture.anchor_id.in_(anchor_ids)
+    )
+    await forget_inferences(db, seq, [zone.id], anchor_ids)
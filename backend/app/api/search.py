@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import html
+import re
+from typing import Any
+
+from sqlalchemy import (
+    Float,
+    Integer,
+    Select,
+    String,
+    column,
+    func,
+    literal,
+    literal_column,
+    select,
+    table,
+    union_all,
+)
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.api.ownership import owned_anchors, visible_captures, visible_items
+from app.models.anchor import Anchor
+from app.models.capture import Capture
+from app.models.item import Item
+
+SNIPPET_START = "<mark>"
+SNIPPET_STOP = "</mark>"
+# The database brackets matches with control characters; the user's text is
+# escaped before they become tags (see ``render_snippet``).
+_MATCH_START = "\x02"
+_MATCH_STOP = "\x03"
+_MATCH_BRACKETS = re.compile(f"([{_MATCH_START}{_MATCH_STOP}])")
+SNIPPET_WORDS = 12
+TITLE_LENGTH = 80
+
+ENTITIES = ("item", "anchor", "capture")
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+# SQLite FTS5 shadow table maintained by triggers (see the full-text search migration).
+search_index = table(
+    "search_index",
+    column("entity", String),
+    column("entity_id", Integer),
+    column("title", String),
+    column("body", String),
+)
+
+
+def search_terms(query: str) -> list[str]:
+    """Split free text into plain word terms; operators and quotes are dropped."""
+    return _TERM.findall(query.lower())[:16]
+
+
+def search_statement(
+    dialect: str, owner_id: int, terms: list[str], entities: tuple[str, ...] = ENTITIES
+) -> Select[Any]:
+    """Owner-scoped, ranked hits as ``(entity, entity_id, rank, title, snippet)`` rows.
+
+    Every term must match, and the last one matches as a prefix so results
+    keep up with search-as-you-type. Higher ``rank`` is better on both backends.
+    """
+    build = _postgres_hits if dialect == "postgresql" else _sqlite_hits
+    hits = union_all(*(build(entity, owner_id, terms) for entity in entities)).subquery("hits")
+    if dialect == "postgresql":
+        # Headlines are costly; computed on the outer query they only run for the page.
+        snippet = func.ts_headline(
+            "english",
+            hits.c.document,
+            func.to_tsquery("english", _tsquery(terms)),
+            f"StartSel={_MATCH_START}, StopSel={_MATCH_STOP}, "
+            f"MaxWords={SNIPPET_WORDS * 2}, MinWords={SNIPPET_WORDS // 2}",
+            type_=String,
+        )
+    else:
+        snippet = hits.c.snippet
+    return select(
+        hits.c.entity, hits.c.entity_id, hits.c.rank, hits.c.title, snippet.label("snippet")
+    )
+
+
+def render_snippet(snippet: str | None) -> str:
+    """HTML-escape a raw snippet, then turn its match brackets into ``<mark>`` tags.
+
+    Stray brackets (control characters in the user's own text) are dropped,
+    so the result only ever holds balanced ``<mark>`` tags.
+    """
+    parts: list[str] = []
+    open_mark = False
+    for part in _MATCH_BRACKETS.split(snippet or ""):
+        if part == _MATCH_START or part == _MATCH_STOP:
+            if (part == _MATCH_START) != open_mark:
+                open_mark = not open_mark
+                parts.append(SNIPPET_START if open_mark else SNIPPET_STOP)
+        else:
+            parts.append(html.escape(part))
+    if open_mark:
+        parts.append(SNIPPET_STOP)
+    return "".join(parts)
+
+
+def _owned(entity: str, owner_id: int) -> tuple[Select[Any], type, ColumnElement[str]]:
+    if entity == "item":
+        return visible_items(owner_id), Item, Item.title
+    if entity == "anchor":
+        return owned_anchors(owner_id), Anchor, Anchor.name
+    return visible_captures(owner_id), Capture, func.substr(Capture.raw_text, 1, TITLE_LENGTH)
+
+
+def _postgres_hits(entity: str, owner_id: int, terms: list[str]) -> Select[Any]:
+    stmt, model, title = _owned(entity, owner_id)
+    vector = literal_column(f"{model.__tablename__}.search_vector")
+    query = func.to_tsquery("english", _tsquery(terms))
+    if entity == "item":
+        document = Item.title + " " + func.coalesce(Item.body, "")
+    elif entity == "anchor":
+        document = func.concat_ws(
+            " ", Anchor.name, Anchor.description, Anchor.location_hint, Anchor.anchor_id
+        )
+    else:
+        document = Capture.raw_text
+    return stmt.with_only_columns(
+        literal(entity, String).label("entity"),
+        model.id.label("entity_id"),
+        func.ts_rank(vector, query, type_=Float).label("rank"),
+        title.label("title"),
+        document.label("document"),
+    ).where(vector.bool_op("@@")(query))
+
+
+def _sqlite_hits(entity: str, owner_id: int, terms: list[str]) -> Select[Any]:
+    stmt, model, title = _owned(entity, owner_id)
+    fts = literal_column("search_index")
+    return (
+        stmt.with_only_columns(
+            literal(entity, String).label("entity"),
+            model.id.label("entity_id"),
+            # bm25 is lower-is-better; column weights favour titles over bodies.
+            (-func.bm25(fts, 0.0, 0.0, 4.0, 1.0, type_=Float)).label("rank"),
+            title.label("title"),
+            func.snippet(
+                fts, -1, _MATCH_START, _MATCH_STOP, "…", SNIPPET_WORDS, type_=String
+            ).label("snippet"),
+        )
+        .join(search_index, search_index.c.entity_id == model.id)
+        .where(search_index.c.entity == entity, fts.op("MATCH")(_fts_query(terms)))
+    )
+
+
+def _tsquery(terms: list[str]) -> str:
+    return " & ".join([*terms[:-1], f"{terms[-1]}:*"])
+
+
+def _fts_query(terms: list[str]) -> str:
+    return " ".join([*(f'"{term}"' for term in terms[:-1]), f'"{terms[-1]}"*'])
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.orm import InstrumentedAttribute
+from typing_extensions import TypedDict
+
+from app.models.anchor import Anchor
+from app.models.breadcrumb import Breadcrumb
+from app.models.capture import Capture
+from app.models.item import Item
+from app.models.zone import Zone
+from app.schemas.anchor import AnchorRead
+from app.schemas.breadcrumb import BreadcrumbRead
+from app.schemas.capture import CaptureRead
+from app.schemas.item import ItemRead
+from app.schemas.zone import ZoneRead
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+
+class RowSerializer:
+    """Serialize SQL rows straight to JSON in the shape of a ``*Read`` schema.
+
+    Routes select exactly the schema's columns and hand the row tuples over;
+    nothing is re-validated, since the values come from our own database.
+    orjson does the encoding when installed, otherwise a ``TypeAdapter``
+    compiled once from the schema's field types. Both produce the same JSON
+    values, in the same key order, as the ``response_model`` path, though a
+    float may be spelled differently; ``scripts/check_serialization.py``
+    checks every serializer and route against it.
+    """
+
+    def __init__(self, schema: type[BaseModel], model: type) -> None:
+        self.schema = schema
+        self.fields = list(schema.model_fields)
+        self.columns: list[InstrumentedAttribute] = [getattr(model, f) for f in self.fields]
+        row_type = TypedDict(  # type: ignore[misc]
+            f"{schema.__name__}Row",
+            {name: field.annotation for name, field in schema.model_fields.items()},
+        )
+        self._adapter = TypeAdapter(list[row_type])
+
+    def dicts(self, rows: Iterable[Sequence[Any]]) -> list[dict[str, Any]]:
+        return [dict(zip(self.fields, row)) for row in rows]
+
+    def dump(self, rows: Iterable[Sequence[Any]]) -> bytes:
+        return dump_json(self.dicts(rows), self._adapter)
+
+    def dump_one(self, row: Sequence[Any] | None) -> bytes:
+        return self.dump([row])[1:-1] if row is not None else b"null"
+
+
+def dump_json(value: Any, adapter: TypeAdapter[Any] | None = None) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_UTC_Z)
+    if adapter is not None:
+        return adapter.dump_json(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def json_object(fields: dict[str, bytes], response: Response | None = None) -> Response:
+    """Assemble already-encoded members into one JSON object response.
+
+    Headers set on the injected ``response`` (validators, for instance) are
+    carried over, since FastAPI ignores it when a route returns a response.
+    """
+    members = (json.dumps(key).encode() + b":" + value for key, value in fields.items())
+    body = b"{" + b",".join(members)
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return Response(content=body + b"}", media_type="application/json", headers=headers)
+
+
+def page_response(
+    serializer: RowSerializer, page: dict[str, Any], response: Response | None = None
+) -> Response:
+    """Encode a ``paginate(..., scalars=False)`` result as a ``Page`` body."""
+    return json_object(
+        {
+            "items": serializer.dump(page["items"]),
+            "next_cursor": dump_json(page["next_cursor"]),
+        },
+        response,
+    )
+
+
+zone_rows = RowSerializer(ZoneRead, Zone)
+anchor_rows = RowSerializer(AnchorRead, Anchor)
+item_rows = RowSerializer(ItemRead, Item)
+capture_rows = RowSerializer(CaptureRead, Capture)
+breadcrumb_rows = RowSerializer(BreadcrumbRead, Breadcrumb)
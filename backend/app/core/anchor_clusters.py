@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.owner_cache import Change, OwnerCache
+from app.models.anchor import Anchor
+from app.models.zone import Zone
+
+MAX_ZOOM = 22
+# Grid cells are a quarter of a 256px map tile, so one cell spans 64px at its zoom.
+CELLS_PER_TILE = 4
+# Requests are answered at a zoom where the bbox spans at most this many cells
+# each way, which bounds the payload however large the requested area is.
+MAX_CELLS_ACROSS = 64
+MAX_MERCATOR_LATITUDE = 85.05112878
+
+_CLUSTERED_ATTRIBUTES = ("latitude", "longitude", "zone_id")
+
+
+@dataclass(frozen=True)
+class BoundingBox:
+    west: float
+    south: float
+    east: float
+    north: float
+
+    @classmethod
+    def parse(cls, value: str) -> BoundingBox:
+        """Parse ``west,south,east,north`` (Leaflet's ``toBBoxString`` order)."""
+        try:
+            west, south, east, north = (float(part) for part in value.split(","))
+        except ValueError as exc:
+            raise ValueError("bbox must be west,south,east,north") from exc
+        if not (-90 <= south <= north <= 90 and -180 <= west <= 180 and -180 <= east <= 180):
+            raise ValueError("bbox is outside the valid coordinate range")
+        return cls(west, south, east, north)
+
+    def contains(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        inside = (latitudes >= self.south) & (latitudes <= self.north)
+        if self.west <= self.east:
+            return inside & (longitudes >= self.west) & (longitudes <= self.east)
+        # The box crosses the antimeridian.
+        return inside & ((longitudes >= self.west) | (longitudes <= self.east))
+
+    def cluster_zoom(self, zoom: int) -> int:
+        """``zoom`` lowered until the box spans at most ``MAX_CELLS_ACROSS`` cells."""
+        width = self.east - self.west if self.west <= self.east else self.east - self.west + 360
+        top, bottom = mercator_y(np.array([self.north, self.south]))
+        span = max(width / 360, bottom - top)
+        if span <= 0:
+            return zoom
+        fitting = math.floor(math.log2(MAX_CELLS_ACROSS / (span * CELLS_PER_TILE)))
+        return max(0, min(zoom, fitting))
+
+
+@dataclass
+class ClusterLevel:
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    clusters: list[dict[str, Any]]
+
+    def within(self, bbox: BoundingBox) -> list[dict[str, Any]]:
+        mask = bbox.contains(self.latitudes, self.longitudes)
+        return [self.clusters[index] for index in np.flatnonzero(mask)]
+
+
+@dataclass
+class OwnerAnchors:
+    """One owner's anchor coordinates and the cluster levels built from them so far."""
+
+    ids: np.ndarray
+    zone_ids: np.ndarray
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    levels: dict[int, ClusterLevel] = field(default_factory=dict)
+
+    def level(self, zoom: int) -> ClusterLevel:
+        level = self.levels.get(zoom)
+        if level is None:
+            level = self.levels[zoom] = build_level(self, zoom)
+        return level
+
+
+def mercator_y(latitudes: np.ndarray) -> np.ndarray:
+    """Web Mercator y in ``[0, 1]``, 0 at the top of the map."""
+    radians = np.radians(np.clip(latitudes, -MAX_MERCATOR_LATITUDE, MAX_MERCATOR_LATITUDE))
+    return (1 - np.log(np.tan(radians) + 1 / np.cos(radians)) / math.pi) / 2
+
+
+def build_level(anchors: OwnerAnchors, zoom: int) -> ClusterLevel:
+    """Group anchors by the map grid cell they fall in at ``zoom``."""
+    if not len(anchors.ids):
+        return ClusterLevel(np.empty(0), np.empty(0), [])
+    scale = CELLS_PER_TILE * 2**zoom
+    x = np.clip(((anchors.longitudes + 180) / 360 * scale).astype(np.int64), 0, scale - 1)
+    y = np.clip((mercator_y(anchors.latitudes) * scale).astype(np.int64), 0, scale - 1)
+    _cells, first, inverse, counts = np.unique(
+        x * scale + y, return_index=True, return_inverse=True, return_counts=True
+    )
+    latitudes = np.bincount(inverse, weights=anchors.latitudes) / counts
+    longitudes = np.bincount(inverse, weights=anchors.longitudes) / counts
+
+    pairs, pair_counts = np.unique(
+        np.stack([inverse, anchors.zone_ids]), axis=1, return_counts=True
+    )
+    zones: list[list[dict[str, int]]] = [[] for _ in counts]
+    for cluster, zone_id, count in zip(*pairs.tolist(), pair_counts.tolist()):
+        zones[cluster].append({"zone_id": zone_id, "count": count})
+
+    clusters = [
+        {
+            "latitude": latitude,
+            "longitude": longitude,
+            "count": count,
+            "zones": cluster_zones,
+            "anchor_id": anchor_id if count == 1 else None,
+        }
+        for latitude, longitude, count, cluster_zones, anchor_id in zip(
+            latitudes.tolist(),
+            longitudes.tolist(),
+            counts.tolist(),
+            zones,
+            anchors.ids[first].tolist(),
+        )
+    ]
+    return ClusterLevel(latitudes, longitudes, clusters)
+
+
+async def _load_anchors(db: AsyncSession, owner_id: int) -> OwnerAnchors:
+    rows = (
+        await db.execute(
+            select(Anchor.id, Anchor.zone_id, Anchor.latitude, Anchor.longitude)
+            .join(Zone)
+            .where(
+                Zone.owner_id == owner_id,
+                Anchor.latitude.is_not(None),
+                Anchor.longitude.is_not(None),
+            )
+        )
+    ).all()
+    columns = list(zip(*rows)) or [(), (), (), ()]
+    return OwnerAnchors(
+        ids=np.array(columns[0], dtype=np.int64),
+        zone_ids=np.array(columns[1], dtype=np.int64),
+        latitudes=np.array(columns[2], dtype=np.float64),
+        longitudes=np.array(columns[3], dtype=np.float64),
+    )
+
+
+def _moves_anchor(instance: Any, change: Change) -> bool:
+    """Whether a flushed row can change any owner's clusters."""
+    if change == "delete":
+        return True
+    if not isinstance(instance, Anchor):
+        return False
+    if change == "insert":
+        return instance.latitude is not None
+    attrs = inspect(instance).attrs
+    return any(attrs[name].history.has_changes() for name in _CLUSTERED_ATTRIBUTES)
+
+
+def _moves_anchors(model: type, change: Change) -> bool:
+    return model is Anchor or change == "delete"
+
+
+# Per-owner anchor coordinates with lazily built cluster levels per zoom. Entries
+# are dropped once a write that adds, removes or moves an anchor, or deletes a
+# zone, commits.
+anchor_cluster_cache: OwnerCache[OwnerAnchors] = OwnerCache(
+    _load_anchors,
+    (Anchor, Zone),
+    settings.ANCHOR_CLUSTER_CACHE_SIZE,
+    settings.ANCHOR_CLUSTER_CACHE_TTL,
+    affects=_moves_anchor,
+    affects_statement=_moves_anchors,
+)
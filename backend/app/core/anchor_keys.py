@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Literal
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.owner_cache import OwnerCache
+from app.models.anchor import Anchor
+from app.models.zone import Zone
+
+PAYLOAD_PREFIX = "ANCHOR:"
+URL_QUERY_KEYS = ("anchor", "anchor_id")
+MAX_DISTANCE = 2
+
+MatchKind = Literal["exact", "prefix", "fuzzy", "none"]
+
+_SEPARATORS = re.compile(r"[\s_]+")
+
+
+@dataclass(frozen=True)
+class AnchorKey:
+    id: int
+    anchor_id: str
+    name: str
+    zone_id: int
+    # The rest of ``AnchorRead``, so a lookup by key is answered from the index.
+    created_at: datetime | None = None
+    description: str | None = None
+    location_hint: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+
+
+def normalize_key(key: str) -> str:
+    return _SEPARATORS.sub("-", key.strip()).upper()
+
+
+def parse_anchor_payload(payload: str) -> tuple[str, bool]:
+    """Extract an anchor key from a scanned payload; returns ``(key, is_prefix)``.
+
+    Accepts bare keys, ``ANCHOR:<ID>`` text records and deep-link URLs (the
+    last path segment, or an ``anchor``/``anchor_id`` query parameter). A
+    trailing ``*`` asks for a prefix lookup. The key is returned as written;
+    index lookups normalise it themselves.
+    """
+    text = payload.strip()
+    if text.upper().startswith(PAYLOAD_PREFIX):
+        text = text[len(PAYLOAD_PREFIX) :]
+    elif "://" in text or text.startswith("/"):
+        url = urlsplit(text)
+        query = parse_qs(url.query)
+        from_query = next((query[name][0] for name in URL_QUERY_KEYS if name in query), None)
+        segments = [segment for segment in url.path.split("/") if segment]
+        text = unquote(from_query or (segments[-1] if segments else ""))
+    key = text.strip()
+    return key.rstrip("*").strip(), key.endswith("*")
+
+
+class AnchorKeyIndex:
+    """One owner's anchor keys as a sorted array; lookups never touch the database."""
+
+    def __init__(self, anchors: Iterable[AnchorKey]) -> None:
+        anchors = list(anchors)
+        entries = sorted(
+            ((normalize_key(anchor.anchor_id), anchor) for anchor in anchors),
+            key=lambda entry: (entry[0], entry[1].anchor_id),
+        )
+        self._keys = [key for key, _anchor in entries]
+        self._anchors = [anchor for _key, anchor in entries]
+        self._stored = {anchor.anchor_id: anchor for anchor in anchors}
+        self._deletions: dict[str, list[int]] | None = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def exact(self, key: str) -> AnchorKey | None:
+        """The anchor stored under ``key``, else the only one whose normalised key matches.
+
+        Distinct stored keys such as ``abc_1`` and ``ABC-1`` normalise alike;
+        such a lookup only resolves when it names one of them verbatim.
+        """
+        anchor = self._stored.get(key.strip())
+        if anchor is not None:
+            return anchor
+        key = normalize_key(key)
+        position = bisect_left(self._keys, key)
+        if position >= len(self._keys) or self._keys[position] != key:
+            return None
+        if position + 1 < len(self._keys) and self._keys[position + 1] == key:
+            return None
+        return self._anchors[position]
+
+    def prefix(self, prefix: str, limit: int) -> list[AnchorKey]:
+        prefix = normalize_key(prefix)
+        position = bisect_left(self._keys, prefix)
+        matches: list[AnchorKey] = []
+        while (
+            position < len(self._keys)
+            and len(matches) < limit
+            and self._keys[position].startswith(prefix)
+        ):
+            matches.append(self._anchors[position])
+            position += 1
+        return matches
+
+    def fuzzy(self, key: str, limit: int) -> list[tuple[int, AnchorKey]]:
+        """Closest keys by edit distance (insert, delete, substitute, transpose).
+
+        Candidates come from a single-deletion index (SymSpell style), so every
+        key one edit away is found, plus two-edit typos that share a deletion
+        variant, without scanning the whole array.
+        """
+        key = normalize_key(key)
+        if self._deletions is None:
+            self._deletions = _deletion_index(self._keys)
+        max_distance = 1 if len(key) < 6 else MAX_DISTANCE
+        candidates = {
+            position
+            for variant in _deletions(key)
+            for position in self._deletions.get(variant, ())
+        }
+        scored = []
+        for position in candidates:
+            distance = _edit_distance(key, self._keys[position], max_distance)
+            if distance <= max_distance:
+                scored.append((distance, position))
+        scored.sort()
+        return [(distance, self._anchors[position]) for distance, position in scored[:limit]]
+
+    def resolve(
+        self, payload: str, limit: int
+    ) -> tuple[str, MatchKind, list[tuple[int, AnchorKey]]]:
+        raw_key, is_prefix = parse_anchor_payload(payload)
+        key = normalize_key(raw_key)
+        if not key:
+            return key, "none", []
+        if not is_prefix:
+            anchor = self.exact(raw_key)
+            if anchor is not None:
+                return key, "exact", [(0, anchor)]
+            close = self.fuzzy(key, limit)
+            if close:
+                return key, "fuzzy", close
+        matches = self.prefix(key, limit)
+        return key, ("prefix" if matches else "none"), [(0, anchor) for anchor in matches]
+
+
+async def _load_index(db: AsyncSession, owner_id: int) -> AnchorKeyIndex:
+    rows = await db.execute(
+        select(
+            Anchor.id,
+            Anchor.anchor_id,
+            Anchor.name,
+            Anchor.zone_id,
+            Anchor.created_at,
+            Anchor.description,
+            Anchor.location_hint,
+            Anchor.latitude,
+            Anchor.longitude,
+        )
+        .join(Zone)
+        .where(Zone.owner_id == owner_id)
+    )
+    return AnchorKeyIndex(AnchorKey(*row) for row in rows.all())
+
+
+# Per-owner ``AnchorKeyIndex``, rebuilt lazily after anchor or zone writes commit.
+anchor_key_resolver: OwnerCache[AnchorKeyIndex] = OwnerCache(
+    _load_index, (Anchor, Zone), settings.ANCHOR_INDEX_SIZE, settings.ANCHOR_INDEX_TTL
+)
+
+
+def _deletions(key: str) -> set[str]:
+    return {key, *(key[:i] + key[i + 1 :] for i in range(len(key)))}
+
+
+def _deletion_index(keys: list[str]) -> dict[str, list[int]]:
+    index: dict[str, list[int]] = {}
+    for position, key in enumerate(keys):
+        for variant in _deletions(key):
+            index.setdefault(variant, []).append(position)
+    return index
+
+
+def _edit_distance(source: str, target: str, bound: int) -> int:
+    # Optimal string alignment distance, abandoning a row once it exceeds ``bound``.
+    # Typos are local, so trimming the shared prefix and suffix leaves a tiny table.
+    start = 0
+    while start < len(source) and start < len(target) and source[start] == target[start]:
+        start += 1
+    end = 0
+    while (
+        end < len(source) - start
+        and end < len(target) - start
+        and source[-1 - end] == target[-1 - end]
+    ):
+        end += 1
+    source, target = source[start : len(source) - end], target[start : len(target) - end]
+
+    previous2: list[int] = []
+    previous = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, 1):
+        current = [i] + [0] * len(target)
+        for j, target_char in enumerate(target, 1):
+            cost = source_char != target_char
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (
+                i > 1
+                and j > 1
+                and source_char == target[j - 2]
+                and source[i - 2] == target_char
+            ):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > bound:
+            return bound + 1
+        previous2, previous = previous, current
+    return previous[-1]
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.owner_cache import OwnerCache
+from app.models.anchor import Anchor
+from app.models.zone import Zone
+
+MAX_SUGGESTIONS = 3
+MIN_CONFIDENCE = 0.1
+# Caps the dense (captures x documents) score block built per batch chunk.
+MAX_SCORE_CELLS = 4_000_000
+TRIGRAM_WEIGHT = 0.5
+# Features in more than this share of documents (and at least COMMON_FEATURE_MIN
+# of them) add little but long posting lists, so scoring skips their postings.
+COMMON_FEATURE_SHARE = 0.05
+COMMON_FEATURE_MIN = 100
+
+_WORD = re.compile(r"[^\W_]+")
+_STOP_WORDS = frozenset(
+    "a an and are at by for from in into is it its me my of on or our the this to up".split()
+)
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    zone_id: int
+    anchor_id: int | None
+    confidence: float
+
+
+def features(text: str, weight: float = 1.0, counts: Counter[str] | None = None) -> Counter[str]:
+    """Weighted word tokens plus character trigrams, so near-misses still overlap.
+
+    Adds into ``counts`` when given, which is much cheaper than summing Counters.
+    """
+    counts = Counter() if counts is None else counts
+    trigram_weight = weight * TRIGRAM_WEIGHT
+    for word in _WORD.findall(text.lower()):
+        if word in _STOP_WORDS:
+            continue
+        counts[word] += weight
+        for trigram in _trigrams(word):
+            counts[trigram] += trigram_weight
+    return counts
+
+
+@lru_cache(maxsize=65536)
+def _trigrams(word: str) -> tuple[str, ...]:
+    padded = f"<{word}>"
+    return tuple("#" + padded[start : start + 3] for start in range(len(padded) - 2))
+
+
+def anchor_document(anchor: Any, zone: Any) -> Counter[str]:
+    counts = features(anchor.name, 2.0)
+    features(anchor.anchor_id.replace("-", " "), 2.0, counts)
+    features(anchor.location_hint or "", 1.0, counts)
+    features(anchor.description or "", 1.0, counts)
+    features(zone.name, 1.0, counts)
+    features(zone.description or "", 0.5, counts)
+    return counts
+
+
+def zone_document(zone: Any) -> Counter[str]:
+    return features(zone.description or "", 1.0, features(zone.name, 2.0))
+
+
+class InferenceIndex:
+    """TF-IDF vectors of one owner's anchors and zones, stored as an inverted index.
+
+    Each feature maps to a slice of ``postings``/``weights`` (CSC layout), so
+    scoring a batch of captures is a handful of array gathers plus one
+    ``bincount`` per chunk, with no per-document Python loop.
+    """
+
+    def __init__(self, documents: Sequence[tuple[int, int | None, Counter[str]]]) -> None:
+        self.targets = [(zone_id, anchor_id) for zone_id, anchor_id, _features in documents]
+        self.vocabulary: dict[str, int] = {}
+        columns: list[int] = []
+        rows: list[int] = []
+        values: list[float] = []
+        for row, (_zone_id, _anchor_id, counts) in enumerate(documents):
+            columns.extend(self.vocabulary.setdefault(f, len(self.vocabulary)) for f in counts)
+            rows.extend([row] * len(counts))
+            values.extend(counts.values())
+        column_array = np.array(columns, dtype=np.int64)
+        row_array = np.array(rows, dtype=np.int64)
+        frequency = np.bincount(column_array, minlength=len(self.vocabulary))
+        self.idf = np.log((1 + len(documents)) / (1 + frequency)) + 1
+        weights = np.array(values, dtype=np.float64) * self.idf[column_array]
+        norms = np.sqrt(np.bincount(row_array, weights=weights**2, minlength=len(documents)))
+        weights /= np.where(norms > 0, norms, 1)[row_array]
+
+        order = np.argsort(column_array, kind="stable")
+        self.postings = row_array[order]
+        self.weights = weights[order]
+        self.indptr = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(frequency, out=self.indptr[1:])
+        limit = max(COMMON_FEATURE_MIN, COMMON_FEATURE_SHARE * len(documents))
+        self.scored = frequency <= limit
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def suggest(self, text: str) -> list[Suggestion]:
+        return self.suggest_many([text])[0]
+
+    def suggest_many(self, texts: Sequence[str]) -> list[list[Suggestion]]:
+        """Top suggestions for each text, scored in chunks of whole-matrix operations."""
+        if not self.targets:
+            return [[] for _ in texts]
+        chunk = max(1, MAX_SCORE_CELLS // len(self.targets))
+        results: list[list[Suggestion]] = []
+        for start in range(0, len(texts), chunk):
+            scores = self._scores(texts[start : start + chunk])
+            results.extend(self._top(row) for row in scores)
+        return results
+
+    def _scores(self, texts: Sequence[str]) -> np.ndarray:
+        """Cosine similarity of each text against every document."""
+        rows: list[int] = []
+        columns: list[int] = []
+        counts: list[float] = []
+        for row, text in enumerate(texts):
+            text_features = features(text)
+            columns.extend(self.vocabulary.get(f, -1) for f in text_features)
+            rows.extend([row] * len(text_features))
+            counts.extend(text_features.values())
+        shape = (len(texts), len(self.targets))
+        row_array = np.array(rows, dtype=np.int64)
+        column_array = np.array(columns, dtype=np.int64)
+        seen = column_array >= 0
+        # Words no document uses get the highest idf; they still dilute the match.
+        idf = np.where(seen, self.idf[np.where(seen, column_array, 0)], np.log(1 + shape[1]) + 1)
+        values = np.array(counts, dtype=np.float64) * idf
+        norms = np.sqrt(np.bincount(row_array, weights=values**2, minlength=shape[0]))
+        seen[seen] = self.scored[column_array[seen]]
+        rows_seen, columns = row_array[seen], column_array[seen]
+        values = values[seen] / norms[rows_seen]
+        if not len(columns):
+            return np.zeros(shape)
+
+        starts = self.indptr[columns]
+        lengths = self.indptr[columns + 1] - starts
+        total = int(lengths.sum())
+        offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = np.repeat(starts, lengths) + offsets
+        cells = np.repeat(rows_seen, lengths) * shape[1] + self.postings[positions]
+        contributions = np.repeat(values, lengths) * self.weights[positions]
+        scores = np.bincount(cells, weights=contributions, minlength=shape[0] * shape[1])
+        return scores.reshape(shape)
+
+    def _top(self, scores: np.ndarray) -> list[Suggestion]:
+        count = min(MAX_SUGGESTIONS, len(scores))
+        best = np.argpartition(-scores, count - 1)[:count]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [
+            Suggestion(*self.targets[index], round(min(float(scores[index]), 1.0), 4))
+            for index in best
+            if scores[index] >= MIN_CONFIDENCE
+        ]
+
+
+async def _load_index(db: AsyncSession, owner_id: int) -> InferenceIndex:
+    zones = (
+        await db.execute(
+            select(Zone.id, Zone.name, Zone.description).where(Zone.owner_id == owner_id)
+        )
+    ).all()
+    anchors = (
+        await db.execute(
+            select(
+                Anchor.zone_id,
+                Anchor.id,
+                Anchor.anchor_id,
+                Anchor.name,
+                Anchor.location_hint,
+                Anchor.description,
+            )
+            .join(Zone)
+            .where(Zone.owner_id == owner_id)
+        )
+    ).all()
+    return InferenceIndex(_documents(zones, anchors))
+
+
+# Per-owner ``InferenceIndex``, rebuilt lazily after anchor or zone writes commit.
+capture_inference: OwnerCache[InferenceIndex] = OwnerCache(
+    _load_index, (Anchor, Zone), settings.CAPTURE_INDEX_SIZE, settings.CAPTURE_INDEX_TTL
+)
+
+
+def _documents(
+    zones: Iterable[Any], anchors: Iterable[Any]
+) -> list[tuple[int, int | None, Counter[str]]]:
+    zones_by_id = {zone.id: zone for zone in zones}
+    documents = [(zone.id, None, zone_document(zone)) for zone in zones_by_id.values()]
+    documents.extend(
+        (anchor.zone_id, anchor.id, anchor_document(anchor, zones_by_id[anchor.zone_id]))
+        for anchor in anchors
+    )
+    return documents
+
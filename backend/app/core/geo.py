@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_008.8
+GEOHASH_PRECISION = 12
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """(height, width) in degrees of a geohash cell of ``precision`` characters."""
+    lat_bits = 5 * precision // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180 / 2**lat_bits, 360 / 2**lon_bits
+
+
+def search_precision(latitude: float, radius_m: float) -> int:
+    """Longest prefix whose cells are at least ``radius_m`` across at ``latitude``.
+
+    The circle around a point then fits in the point's cell plus its eight
+    neighbours.
+    """
+    # Meridians converge, so size the cells for the poleward edge of the circle.
+    edge = min(abs(latitude) + radius_m / _METERS_PER_DEGREE, 90.0)
+    shrink = max(math.cos(math.radians(edge)), 1e-6)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        height_m = height * _METERS_PER_DEGREE
+        width_m = width * _METERS_PER_DEGREE * shrink
+        if height_m >= radius_m and width_m >= radius_m:
+            return precision
+    return 1
+
+
+def neighbour_prefixes(latitude: float, longitude: float, precision: int) -> list[str]:
+    """The geohash cell containing the point and the (up to) eight around it."""
+    height, width = cell_size(precision)
+    prefixes = set()
+    for dy in (-1, 0, 1):
+        lat = latitude + dy * height
+        if not -90 <= lat <= 90:
+            continue
+        for dx in (-1, 0, 1):
+            lon = (longitude + dx * width + 180) % 360 - 180
+            prefixes.add(geohash_encode(lat, lon, precision))
+    return sorted(prefixes)
+
+
+def prefix_upper_bound(prefix: str) -> str | None:
+    """Smallest geohash greater than every hash starting with ``prefix``.
+
+    Comparing against it keeps the lookup a plain B-tree range scan, with no
+    reliance on ``LIKE`` index support or collation quirks.
+    """
+    chars = list(prefix)
+    while chars:
+        index = BASE32.index(chars[-1])
+        if index + 1 < len(BASE32):
+            chars[-1] = BASE32[index + 1]
+            return "".join(chars)
+        chars.pop()
+    return None
+
+
+def haversine_m(
+    latitude: float, longitude: float, latitudes: Sequence[float], longitudes: Sequence[float]
+) -> np.ndarray:
+    """Great-circle distance in metres from one point to many, vectorised."""
+    lat1 = math.radians(latitude)
+    lat2 = np.radians(np.asarray(latitudes, dtype=np.float64))
+    dlat = lat2 - lat1
+    dlon = np.radians(np.asarray(longitudes, dtype=np.float64) - longitude)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
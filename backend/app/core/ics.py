@@ -0,0 +1,631 @@
+from __future__ import annotations
+
+import calendar
+import codecs
+import hashlib
+import heapq
+import itertools
+import re
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+COMPONENTS = ("VEVENT", "VTODO")
+# Exporters rewrite DTSTAMP on every fetch, so it is left out of fingerprints.
+VOLATILE_PROPERTIES = frozenset({"DTSTAMP"})
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+UNSUPPORTED_RULE_PARTS = ("BYSECOND", "BYMINUTE", "BYHOUR", "BYWEEKNO", "BYYEARDAY")
+# Stops rules that can never match (e.g. BYMONTH=2;BYMONTHDAY=30) from spinning.
+MAX_EMPTY_PERIODS = 1000
+# Bounded rules longer than this are treated as open-ended.
+MAX_SCANNED_INSTANCES = 100_000
+
+_DATE_TIME_FORMAT = "%Y%m%dT%H%M%S"
+_DURATION = re.compile(
+    r"([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$"
+)
+_BYDAY = re.compile(r"([+-]?\d{1,2})?(MO|TU|WE|TH|FR|SA|SU)$")
+_ESCAPE = re.compile(r"\\(.)")
+_ESCAPED = {"n": "\n", "N": "\n"}
+
+
+@dataclass(frozen=True)
+class Property:
+    name: str
+    params: dict[str, str]
+    value: str
+
+
+@dataclass
+class Component:
+    """The content lines of one top-level VEVENT or VTODO, unfolded.
+
+    ``timezone`` is the feed's ``X-WR-TIMEZONE``, applied to floating times.
+    Nested components such as VALARM are dropped.
+    """
+
+    kind: str
+    lines: list[str]
+    timezone: str | None = None
+
+    @classmethod
+    def from_source(cls, kind: str, source: str, timezone: str | None) -> Component:
+        return cls(kind, source.split("\n"), timezone)
+
+    @property
+    def source(self) -> str:
+        return "\n".join(self.lines)
+
+    @property
+    def fingerprint(self) -> str:
+        digest = hashlib.sha256((self.timezone or "").encode())
+        for line in self.lines:
+            if _property_name(line) not in VOLATILE_PROPERTIES:
+                digest.update(b"\n" + line.encode())
+        return digest.hexdigest()
+
+    def identity(self) -> tuple[str, str]:
+        """``(UID, recurrence key)``, read without parsing the rest of the component."""
+        uid = ""
+        recurrence_id = None
+        for line in self.lines:
+            name = _property_name(line)
+            if name == "UID":
+                uid = parse_property(line).value.strip()
+            elif name == "RECURRENCE-ID":
+                recurrence_id = parse_property(line)
+        if not uid:
+            raise ValueError("Component has no UID")
+        if recurrence_id is None:
+            return uid, ""
+        default_tz = resolve_timezone(self.timezone)
+        return uid, recurrence_key(parse_datetime(recurrence_id, default_tz)[0])
+
+    def properties(self) -> dict[str, list[Property]]:
+        found: dict[str, list[Property]] = {}
+        for line in self.lines:
+            prop = parse_property(line)
+            found.setdefault(prop.name, []).append(prop)
+        return found
+
+
+@dataclass(frozen=True)
+class Recurrence:
+    """When an event happens: its first start plus any RRULE, RDATEs and EXDATEs.
+
+    Hashable, so expansions can be cached across imports and owners.
+    """
+
+    start: datetime
+    all_day: bool
+    rule: tuple[tuple[str, str], ...] = ()
+    exdates: frozenset[datetime] = frozenset()
+    rdates: frozenset[datetime] = frozenset()
+
+
+@dataclass(frozen=True)
+class Event:
+    kind: str
+    uid: str
+    sequence: int
+    summary: str
+    description: str | None
+    location: str | None
+    status: str | None
+    recurrence_id: datetime | None
+    # None for to-dos, which are not placed on the calendar.
+    recurrence: Recurrence | None
+    duration: timedelta | None
+    due: datetime | None = None
+    due_all_day: bool = False
+    completed: bool = False
+
+    @property
+    def recurrence_key(self) -> str:
+        """``RECURRENCE-ID`` in UTC for an overridden instance, ``""`` for the event itself."""
+        return recurrence_key(self.recurrence_id) if self.recurrence_id is not None else ""
+
+    @property
+    def cancelled(self) -> bool:
+        return (self.status or "").upper() == "CANCELLED"
+
+
+async def ics_components(chunks: AsyncIterable[bytes]) -> AsyncIterator[Component]:
+    """Yield VEVENT and VTODO components from an ICS byte stream without buffering it.
+
+    Raises ``ValueError`` at the end if the stream is not a complete
+    VCALENDAR, so a truncated upload is never mistaken for a shorter calendar.
+    """
+    stack: list[str] = []
+    current: Component | None = None
+    depth = 0
+    feed_timezone: str | None = None
+    opened = closed = False
+    async for line in _content_lines(chunks):
+        upper = line.upper()
+        if upper.startswith("BEGIN:"):
+            name = upper[6:].strip()
+            stack.append(name)
+            if name == "VCALENDAR":
+                opened = True
+            elif current is None and name in COMPONENTS:
+                current = Component(name, [], feed_timezone)
+                depth = len(stack)
+        elif upper.startswith("END:"):
+            name = upper[4:].strip()
+            if stack:
+                stack.pop()
+            if name == "VCALENDAR" and not stack:
+                closed = True
+            if current is not None and len(stack) < depth:
+                yield current
+                current = None
+        elif current is not None:
+            if len(stack) == depth:
+                current.lines.append(line)
+        elif stack == ["VCALENDAR"] and _property_name(line) == "X-WR-TIMEZONE":
+            feed_timezone = parse_property(line).value.strip() or None
+    if not opened:
+        raise ValueError("Body is not an iCalendar feed")
+    if not closed:
+        raise ValueError("iCalendar feed is truncated")
+
+
+def parse_property(line: str) -> Property:
+    quoted = False
+    for index, char in enumerate(line):
+        if char == '"':
+            quoted = not quoted
+        elif char == ":" and not quoted:
+            break
+    else:
+        raise ValueError(f"Malformed content line {line[:40]!r}")
+    name, *params = _split_unquoted(line[:index], ";")
+    parsed = {}
+    for param in params:
+        key, _, value = param.partition("=")
+        parsed[key.strip().upper()] = value.strip().strip('"')
+    return Property(name.strip().upper(), parsed, line[index + 1 :])
+
+
+def parse_event(component: Component) -> Event:
+    """Read the properties the importer uses; ``ValueError`` if the component is unusable."""
+    props = component.properties()
+
+    def first(name: str) -> Property | None:
+        values = props.get(name)
+        return values[0] if values else None
+
+    uid = (first("UID") or Property("UID", {}, "")).value.strip()
+    summary = _text(first("SUMMARY"))
+    if not uid or not summary:
+        raise ValueError("Component needs a UID and a SUMMARY")
+    default_tz = resolve_timezone(component.timezone)
+    try:
+        sequence = int((first("SEQUENCE") or Property("SEQUENCE", {}, "0")).value)
+    except ValueError:
+        sequence = 0
+    recurrence_id = first("RECURRENCE-ID")
+
+    fields = {
+        "kind": component.kind,
+        "uid": uid,
+        "sequence": sequence,
+        "summary": summary,
+        "description": _text(first("DESCRIPTION")),
+        "location": _text(first("LOCATION")),
+        "status": _text(first("STATUS")),
+        "recurrence_id": (
+            parse_datetime(recurrence_id, default_tz)[0] if recurrence_id is not None else None
+        ),
+    }
+    if component.kind == "VTODO":
+        due = first("DUE")
+        due_at, due_all_day = parse_datetime(due, default_tz) if due is not None else (None, False)
+        completed = (fields["status"] or "").upper() == "COMPLETED" or "COMPLETED" in props
+        return Event(
+            **fields,
+            recurrence=None,
+            duration=None,
+            due=due_at,
+            due_all_day=due_all_day,
+            completed=completed,
+        )
+
+    dtstart = first("DTSTART")
+    if dtstart is None:
+        raise ValueError("VEVENT has no DTSTART")
+    start, all_day = parse_datetime(dtstart, default_tz)
+    duration = None
+    if (dtend := first("DTEND")) is not None:
+        duration = parse_datetime(dtend, default_tz)[0] - start
+    elif (length := first("DURATION")) is not None:
+        duration = parse_duration(length.value)
+    elif all_day:
+        duration = timedelta(days=1)
+    rrule = first("RRULE")
+    recurrence = Recurrence(
+        start,
+        all_day,
+        parse_rule(rrule.value) if rrule is not None else (),
+        frozenset(_date_list(props.get("EXDATE", ()), default_tz)),
+        frozenset(_date_list(props.get("RDATE", ()), default_tz)),
+    )
+    return Event(**fields, recurrence=recurrence, duration=duration)
+
+
+def recurrence_key(recurrence_id: datetime) -> str:
+    return recurrence_id.astimezone(timezone.utc).strftime(_DATE_TIME_FORMAT + "Z")
+
+
+@lru_cache(maxsize=256)
+def resolve_timezone(name: str | None) -> tzinfo:
+    """The named zone, or UTC when it is missing or unknown (e.g. Windows zone names)."""
+    if name:
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return timezone.utc
+
+
+def parse_datetime(prop: Property, default_tz: tzinfo) -> tuple[datetime, bool]:
+    """An aware datetime, and whether the value was a DATE (all-day, midnight UTC)."""
+    value = prop.value.strip()
+    if prop.params.get("VALUE") == "PERIOD":
+        value = value.partition("/")[0]
+    tz = resolve_timezone(prop.params["TZID"]) if "TZID" in prop.params else default_tz
+    return _parse_value(value, tz, prop.params.get("VALUE") == "DATE")
+
+
+def parse_duration(value: str) -> timedelta:
+    match = _DURATION.match(value.strip().upper())
+    if match is None:
+        raise ValueError(f"Invalid DURATION {value!r}")
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = timedelta(
+        weeks=int(weeks or 0),
+        days=int(days or 0),
+        hours=int(hours or 0),
+        minutes=int(minutes or 0),
+        seconds=int(seconds or 0),
+    )
+    return -duration if sign == "-" else duration
+
+
+def parse_rule(value: str) -> tuple[tuple[str, str], ...]:
+    parts = {}
+    for part in value.split(";"):
+        key, _, setting = part.partition("=")
+        if key.strip():
+            parts[key.strip().upper()] = setting.strip().upper()
+    if parts.get("FREQ") not in FREQUENCIES:
+        raise ValueError(f"Unsupported RRULE frequency {parts.get('FREQ')!r}")
+    unsupported = [key for key in UNSUPPORTED_RULE_PARTS if key in parts]
+    if unsupported:
+        raise ValueError(f"Unsupported RRULE parts: {', '.join(unsupported)}")
+    for weekday in _split(parts.get("BYDAY")):
+        if _BYDAY.match(weekday) is None:
+            raise ValueError(f"Invalid BYDAY {weekday!r}")
+    return tuple(sorted(parts.items()))
+
+
+@lru_cache(maxsize=4096)
+def expand(
+    recurrence: Recurrence, window_start: datetime, window_end: datetime, limit: int
+) -> tuple[datetime, ...]:
+    """UTC starts of the instances in ``[window_start, window_end)``, at most ``limit``.
+
+    Importers ask for day-aligned windows, so re-importing a feed (or the same
+    feed into another zone) the same day expands each unchanged rule once.
+    """
+    found: list[datetime] = []
+    for instance in instances(recurrence, after=window_start):
+        if instance >= window_end or len(found) >= limit:
+            break
+        if instance >= window_start:
+            found.append(instance)
+    return tuple(found)
+
+
+def instances(recurrence: Recurrence, after: datetime | None = None) -> Iterator[datetime]:
+    """Every instance start in UTC, ascending.
+
+    ``after`` lets open-ended rules skip whole periods that end before it
+    rather than stepping through years of history.
+    """
+    previous = None
+    for instance in heapq.merge(_rule_instances(recurrence, after), sorted(recurrence.rdates)):
+        if instance != previous and instance not in recurrence.exdates:
+            yield instance
+        previous = instance
+
+
+def last_instance(recurrence: Recurrence) -> datetime | None:
+    """Start of the final instance, or None when the rule never ends."""
+    rule = dict(recurrence.rule)
+    if rule and "COUNT" not in rule and "UNTIL" not in rule:
+        return None
+    last = None
+    for count, last in enumerate(instances(recurrence), 1):
+        if count > MAX_SCANNED_INSTANCES:
+            return None
+    return last
+
+
+def _rule_instances(recurrence: Recurrence, after: datetime | None) -> Iterator[datetime]:
+    start = recurrence.start
+    if not recurrence.rule:
+        yield start.astimezone(timezone.utc)
+        return
+    rule = dict(recurrence.rule)
+    tz = start.tzinfo
+    local_start = start.replace(tzinfo=None)
+    count = int(rule["COUNT"]) if "COUNT" in rule else None
+    until = _until(rule.get("UNTIL"), tz)
+
+    skip = 0
+    if count is None and after is not None and after > start:
+        skip = _periods_before(rule, local_start, after.astimezone(tz).replace(tzinfo=None))
+    emitted = 0
+    if not skip:
+        # DTSTART is always the first instance, and counts towards COUNT.
+        yield start.astimezone(timezone.utc)
+        emitted = 1
+    for candidate in _candidates(rule, local_start, skip):
+        if count is not None and emitted >= count:
+            return
+        if candidate <= local_start:
+            continue
+        instance = candidate.replace(tzinfo=tz).astimezone(timezone.utc)
+        if until is not None and instance > until:
+            return
+        emitted += 1
+        yield instance
+
+
+def _candidates(rule: dict[str, str], start: datetime, skip: int) -> Iterator[datetime]:
+    """Local start times matching the rule's BY* parts, period by period."""
+    freq = rule["FREQ"]
+    interval = max(1, int(rule.get("INTERVAL") or 1))
+    months = {int(month) for month in _split(rule.get("BYMONTH"))}
+    monthdays = [int(day) for day in _split(rule.get("BYMONTHDAY"))]
+    weekdays = [_weekday(value) for value in _split(rule.get("BYDAY"))]
+    positions = [int(position) for position in _split(rule.get("BYSETPOS"))]
+    week_start = WEEKDAYS.index(rule.get("WKST") or "MO")
+    clock = start.time()
+    first = start.date()
+
+    empty = 0
+    for period in itertools.count(skip):
+        try:
+            anchor = _period_start(freq, interval, period, first)
+        except (OverflowError, ValueError):
+            return
+        days = _period_days(freq, anchor, first, months, monthdays, weekdays, week_start)
+        if positions:
+            days = [days[p - 1 if p > 0 else p] for p in positions if 0 < abs(p) <= len(days)]
+            days = sorted(set(days))
+        if not days:
+            empty += 1
+            if empty > MAX_EMPTY_PERIODS:
+                return
+            continue
+        empty = 0
+        for day in days:
+            yield datetime.combine(day, clock)
+
+
+def _period_start(freq: str, interval: int, period: int, first: date) -> date:
+    """First day of the ``period``-th period after the one holding ``first``.
+
+    Monthly and yearly periods start on the 1st of the month or year.
+    """
+    if freq == "DAILY":
+        return first + timedelta(days=period * interval)
+    if freq == "WEEKLY":
+        return first + timedelta(weeks=period * interval)
+    if freq == "MONTHLY":
+        year, month = divmod(first.year * 12 + first.month - 1 + period * interval, 12)
+        return date(year, month + 1, 1)
+    return date(first.year + period * interval, 1, 1)
+
+
+def _period_days(
+    freq: str,
+    anchor: date,
+    first: date,
+    months: set[int],
+    monthdays: list[int],
+    weekdays: list[tuple[int | None, int]],
+    week_start: int,
+) -> list[date]:
+    """Matching days in the period starting at ``anchor``, in order."""
+    if freq == "DAILY":
+        return [anchor] if _day_matches(anchor, months, monthdays, weekdays) else []
+    if freq == "WEEKLY":
+        week = anchor - timedelta(days=(anchor.weekday() - week_start) % 7)
+        wanted = {weekday for _ordinal, weekday in weekdays} or {first.weekday()}
+        days = sorted(week + timedelta(days=(weekday - week_start) % 7) for weekday in wanted)
+        return [day for day in days if not months or day.month in months]
+    if freq == "MONTHLY":
+        if months and anchor.month not in months:
+            return []
+        return _month_days(anchor.year, anchor.month, first, monthdays, weekdays)
+    if weekdays and not months and not monthdays:
+        return _weekday_days(date(anchor.year, 1, 1), date(anchor.year, 12, 31), weekdays)
+    return [
+        day
+        for month in sorted(months) or [first.month]
+        for day in _month_days(anchor.year, month, first, monthdays, weekdays)
+    ]
+
+
+def _month_days(
+    year: int,
+    month: int,
+    first: date,
+    monthdays: list[int],
+    weekdays: list[tuple[int | None, int]],
+) -> list[date]:
+    last = calendar.monthrange(year, month)[1]
+    if monthdays:
+        numbers = {day if day > 0 else last + 1 + day for day in monthdays}
+        days = [date(year, month, day) for day in sorted(numbers) if 1 <= day <= last]
+        if weekdays:
+            wanted = {weekday for _ordinal, weekday in weekdays}
+            days = [day for day in days if day.weekday() in wanted]
+        return days
+    if weekdays:
+        return _weekday_days(date(year, month, 1), date(year, month, last), weekdays)
+    return [date(year, month, first.day)] if first.day <= last else []
+
+
+def _weekday_days(
+    first: date, last: date, weekdays: list[tuple[int | None, int]]
+) -> list[date]:
+    """Days in ``[first, last]`` matching BYDAY values such as ``TU``, ``2TU`` or ``-1FR``."""
+    found = set()
+    span = (last - first).days
+    for ordinal, weekday in weekdays:
+        offset = (weekday - first.weekday()) % 7
+        matches = [first + timedelta(days=day) for day in range(offset, span + 1, 7)]
+        if ordinal is None:
+            found.update(matches)
+        elif 0 < abs(ordinal) <= len(matches):
+            found.add(matches[ordinal - 1 if ordinal > 0 else ordinal])
+    return sorted(found)
+
+
+def _day_matches(
+    day: date, months: set[int], monthdays: list[int], weekdays: list[tuple[int | None, int]]
+) -> bool:
+    if months and day.month not in months:
+        return False
+    if monthdays:
+        last = calendar.monthrange(day.year, day.month)[1]
+        if day.day not in {d if d > 0 else last + 1 + d for d in monthdays}:
+            return False
+    return not weekdays or day.weekday() in {weekday for _ordinal, weekday in weekdays}
+
+
+def _periods_before(rule: dict[str, str], start: datetime, target: datetime) -> int:
+    """Whole periods that end before ``target``, leaving one to spare."""
+    interval = max(1, int(rule.get("INTERVAL") or 1))
+    freq = rule["FREQ"]
+    if freq in ("DAILY", "WEEKLY"):
+        days = (target.date() - start.date()).days
+        periods = days // (interval * (1 if freq == "DAILY" else 7))
+    elif freq == "MONTHLY":
+        periods = ((target.year - start.year) * 12 + target.month - start.month) // interval
+    else:
+        periods = (target.year - start.year) // interval
+    return max(0, periods - 1)
+
+
+def _until(value: str | None, tz: tzinfo | None) -> datetime | None:
+    if not value:
+        return None
+    if len(value) == 8:
+        day = datetime.strptime(value, "%Y%m%d")
+        return datetime.combine(day.date(), time.max, tz).astimezone(timezone.utc)
+    return _parse_value(value, tz or timezone.utc, False)[0].astimezone(timezone.utc)
+
+
+def _parse_value(value: str, tz: tzinfo, is_date: bool) -> tuple[datetime, bool]:
+    try:
+        if is_date or len(value) == 8:
+            return datetime.strptime(value[:8], "%Y%m%d").replace(tzinfo=timezone.utc), True
+        if value.endswith(("Z", "z")):
+            parsed = datetime.strptime(value[:-1], _DATE_TIME_FORMAT)
+            return parsed.replace(tzinfo=timezone.utc), False
+        return datetime.strptime(value, _DATE_TIME_FORMAT).replace(tzinfo=tz), False
+    except ValueError as exc:
+        raise ValueError(f"Invalid date-time {value!r}") from exc
+
+
+def _date_list(props: Iterable[Property], default_tz: tzinfo) -> Iterator[datetime]:
+    for prop in props:
+        for value in prop.value.split(","):
+            if value.strip():
+                single = Property(prop.name, prop.params, value)
+                yield parse_datetime(single, default_tz)[0].astimezone(timezone.utc)
+
+
+def _weekday(value: str) -> tuple[int | None, int]:
+    match = _BYDAY.match(value)
+    if match is None:
+        raise ValueError(f"Invalid BYDAY {value!r}")
+    ordinal, weekday = match.groups()
+    return (int(ordinal) if ordinal else None), WEEKDAYS.index(weekday)
+
+
+def _split(value: str | None) -> list[str]:
+    return [part for part in (value or "").split(",") if part]
+
+
+def _text(prop: Property | None) -> str | None:
+    if prop is None:
+        return None
+    text = _ESCAPE.sub(lambda match: _ESCAPED.get(match.group(1), match.group(1)), prop.value)
+    return text.strip() or None
+
+
+def _property_name(line: str) -> str:
+    end = min((index for index in (line.find(";"), line.find(":")) if index >= 0), default=0)
+    return line[:end].strip().upper()
+
+
+def _split_unquoted(text: str, separator: str) -> list[str]:
+    parts = []
+    quoted = False
+    start = 0
+    for index, char in enumerate(text):
+        if char == '"':
+            quoted = not quoted
+        elif char == separator and not quoted:
+            parts.append(text[start:index])
+            start = index + 1
+    parts.append(text[start:])
+    return parts
+
+
+class _Unfolder:
+    """Joins folded physical lines (RFC 5545 section 3.1) into content lines."""
+
+    def __init__(self) -> None:
+        self._line: str | None = None
+
+    def feed(self, physical: Iterable[str]) -> Iterator[str]:
+        for raw in physical:
+            raw = raw.rstrip("\r")
+            if raw[:1] in (" ", "\t") and self._line is not None:
+                self._line += raw[1:]
+                continue
+            if self._line:
+                yield self._line
+            self._line = raw
+
+    def close(self) -> Iterator[str]:
+        if self._line:
+            yield self._line
+        self._line = None
+
+
+async def _content_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    unfolder = _Unfolder()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *complete, pending = pending.split("\n")
+        for line in unfolder.feed(complete):
+            yield line
+    pending += decoder.decode(b"", final=True)
+    for line in unfolder.feed(pending.split("\n")):
+        yield line
+    for line in unfolder.close():
+        yield line
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from itertools import chain
+from typing import Any, Generic, Literal, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.db.hooks import on_commit
+
+T = TypeVar("T")
+Change = Literal["insert", "update", "delete"]
+
+
+class OwnerCache(Generic[T]):
+    """Per-owner values built from the database, dropped once a watched write commits.
+
+    ``build(db, owner_id)`` loads one owner's value. Entries are kept in LRU
+    order up to ``maxsize`` and expire after ``ttl`` seconds. Any flush or bulk
+    statement that writes one of the ``watched`` models clears the whole cache
+    when its transaction commits; ``affects`` narrows which flushed instances
+    count and ``affects_statement`` which bulk statements do.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[AsyncSession, int], Awaitable[T]],
+        watched: tuple[type, ...],
+        maxsize: int,
+        ttl: float,
+        affects: Callable[[Any, Change], bool] | None = None,
+        affects_statement: Callable[[type, Change], bool] | None = None,
+    ) -> None:
+        self.build = build
+        self.watched = watched
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.affects = affects
+        self.affects_statement = affects_statement
+        self._entries: OrderedDict[int, tuple[float, T]] = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        _caches.append(self)
+
+    @property
+    def generation(self) -> int:
+        """Bumped on every invalidation."""
+        return self._generation
+
+    async def get(self, db: AsyncSession, owner_id: int) -> T:
+        with self._lock:
+            entry = self._entries.get(owner_id)
+            if entry is not None and entry[0] >= time.monotonic():
+                self._entries.move_to_end(owner_id)
+                return entry[1]
+            generation = self._generation
+
+        value = await self.build(db, owner_id)
+
+        with self._lock:
+            # A write that committed while we were reading makes this value stale.
+            if generation == self._generation:
+                self._entries[owner_id] = (time.monotonic() + self.ttl, value)
+                self._entries.move_to_end(owner_id)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def _flushed(self, session: Session) -> bool:
+        # Still the pre-flush collections and attribute history at this point.
+        changes: list[tuple[Change, Any]] = [
+            *(("insert", instance) for instance in session.new),
+            *(("update", instance) for instance in session.dirty),
+            *(("delete", instance) for instance in session.deleted),
+        ]
+        return any(
+            isinstance(instance, self.watched)
+            and (self.affects is None or self.affects(instance, change))
+            for change, instance in changes
+        )
+
+    def _executed(self, model: type, change: Change) -> bool:
+        return model in self.watched and (
+            self.affects_statement is None or self.affects_statement(model, change)
+        )
+
+
+_caches: list[OwnerCache[Any]] = []
+
+
+def _track_flush(session: Session, _flush_context: Any) -> None:
+    if not any(chain(session.new, session.dirty, session.deleted)):
+        return
+    for cache in _caches:
+        if cache._flushed(session):
+            on_commit(session, cache.invalidate)
+
+
+def _track_bulk_statement(state: ORMExecuteState) -> None:
+    if state.bind_mapper is None:
+        return
+    if state.is_insert:
+        change: Change = "insert"
+    elif state.is_update:
+        change = "update"
+    elif state.is_delete:
+        change = "delete"
+    else:
+        return
+    for cache in _caches:
+        if cache._executed(state.bind_mapper.class_, change):
+            on_commit(state.session, cache.invalidate)
+
+
+event.listen(Session, "after_flush", _track_flush)
+event.listen(Session, "do_orm_execute", _track_bulk_statement)
@@ -1,30 +1,137 @@
 from __future__ import annotations
 
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+from typing import Any
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security.api_key import APIKeyHeader
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
 
 from app.core.config import settings
+from app.db.hooks import on_commit
 from app.db.session import get_db
+from app.models.api_key import ApiKey
 from app.models.user import User
 
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+API_KEY_PREFIX = "hive_"
+
+
+def hash_api_key(raw_key: str) -> str:
+    return hashlib.sha256(raw_key.encode()).hexdigest()
+
+
+def generate_api_key() -> str:
+    return API_KEY_PREFIX + secrets.token_urlsafe(32)
+
+
+class PrincipalCache:
+    """Bounded LRU of resolved users keyed by API key hash, with a TTL."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, User]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key_hash: str) -> User | None:
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                del self._entries[key_hash]
+                return None
+            self._entries.move_to_end(key_hash)
+            return user
+
+    def put(self, key_hash: str, user: User) -> None:
+        with self._lock:
+            self._entries[key_hash] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(key_hash)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(settings.API_KEY_CACHE_SIZE, settings.API_KEY_CACHE_TTL)
 
-def get_current_user(
+
+async def get_current_user(
     api_key: str | None = Depends(api_key_header),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> User:
-    if api_key is None or api_key != settings.HIVE_API_KEY:
+    if api_key is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or missing API key",
         )
 
-    user = db.query(User).filter(User.is_active.is_(True)).first()
+    key_hash = hash_api_key(api_key)
+    user = principal_cache.get(key_hash)
+    if user is not None:
+        return user
+
+    user = await _resolve_user(key_hash, db)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="No active admin user configured",
+            detail="Invalid or missing API key",
         )
+    # Detach so the cached principal outlives this request's session.
+    db.expunge(user)
+    principal_cache.put(key_hash, user)
     return user
+
+
+async def _resolve_user(key_hash: str, db: AsyncSession) -> User | None:
+    user = await db.scalar(
+        select(User)
+        .join(ApiKey)
+        .where(
+            ApiKey.key_hash == key_hash,
+            ApiKey.revoked_at.is_(None),
+            User.is_active.is_(True),
+        )
+        .limit(1)
+    )
+    if user is not None:
+        return user
+
+    # Legacy shared key from the environment maps to the first active user.
+    if settings.HIVE_API_KEY and hmac.compare_digest(
+        key_hash, hash_api_key(settings.HIVE_API_KEY)
+    ):
+        return await db.scalar(
+            select(User).where(User.is_active.is_(True)).order_by(User.id.asc()).limit(1)
+        )
+    return None
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, _flush_context: Any) -> None:
+    touched = chain(session.new, session.dirty, session.deleted)
+    if any(isinstance(instance, (ApiKey, User)) for instance in touched):
+        on_commit(session, principal_cache.clear)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statement(state: ORMExecuteState) -> None:
+    if (state.is_update or state.is_delete) and state.bind_mapper in (
+        ApiKey.__mapper__,
+        User.__mapper__,
+    ):
+        on_commit(state.session, principal_cache.clear)
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.versioning import bump_data_version
+from app.models.anchor import Anchor
+from app.models.zone import Zone
+
+CHUNK_SIZE = 500
+
+LABEL_COLUMNS = ("name", "friendly_label")
+ZONE_COLUMNS = ("zone", "zone_slug")
+OPTIONAL_COLUMNS = ("description", "location_hint")
+MAX_LENGTH = 120
+
+
+@dataclass
+class ImportStats:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class AnchorImporter:
+    """Upsert anchors for one owner from CSV rows, a chunk at a time.
+
+    Each chunk costs three statements regardless of its size: a lookup for
+    zone names not seen in earlier chunks, a lookup of which anchor ids
+    already exist, and one ``INSERT ... ON CONFLICT (anchor_id) DO UPDATE``.
+    Anchors that belong to another owner are skipped, never re-homed, and
+    rows identical to what is stored are left untouched. With
+    ``update_existing=False`` known anchors are left alone entirely. All chunks
+    share one change sequence, taken when the first row is written, so an
+    import that changes nothing leaves the owner's data version alone; the
+    caller commits.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        owner_id: int,
+        fieldnames: Sequence[str],
+        update_existing: bool = True,
+    ) -> None:
+        columns = {name.strip().lower() for name in fieldnames}
+        self.label_column = next((c for c in LABEL_COLUMNS if c in columns), None)
+        self.zone_column = next((c for c in ZONE_COLUMNS if c in columns), None)
+        if "anchor_id" not in columns or not self.label_column or not self.zone_column:
+            raise ValueError("CSV needs anchor_id, friendly_label (or name) and zone columns")
+
+        self.db = db
+        self.owner_id = owner_id
+        self.update_existing = update_existing
+        self.optional_columns = [c for c in OPTIONAL_COLUMNS if c in columns]
+        self._columns = ["zone_id", "name", *self.optional_columns]
+        self.stats = ImportStats()
+        self._zones: dict[str, int | None] = {}
+        self._seq: int | None = None
+
+    async def upsert(self, rows: Sequence[dict[str, str | None]]) -> None:
+        rows = [{_key(k): (v or "").strip() for k, v in row.items() if k} for row in rows]
+        await self._resolve_zones({row.get(self.zone_column, "").lower() for row in rows})
+
+        values: dict[str, dict[str, Any]] = {}
+        for row in rows:
+            parsed = self._parse(row)
+            if parsed is None:
+                self.stats.skipped += 1
+                continue
+            if parsed["anchor_id"] in values:
+                # Last occurrence wins; ON CONFLICT cannot touch a row twice per statement.
+                self.stats.skipped += 1
+            values[parsed["anchor_id"]] = parsed
+        if not values:
+            return
+
+        existing = await self._existing(values.keys())
+        for anchor_id, stored in existing.items():
+            if stored is None:
+                del values[anchor_id]
+                self.stats.skipped += 1
+            elif not self.update_existing or stored == {
+                column: values[anchor_id][column] for column in stored
+            }:
+                del values[anchor_id]
+                self.stats.unchanged += 1
+        if not values:
+            return
+
+        if self._seq is None:
+            self._seq = await bump_data_version(self.db, self.owner_id)
+        for parsed in values.values():
+            parsed["change_seq"] = self._seq
+
+        written = set((await self.db.scalars(self._statement(list(values.values())))).all())
+        for anchor_id in values:
+            if anchor_id not in written:
+                self.stats.unchanged += 1
+            elif anchor_id in existing:
+                self.stats.updated += 1
+            else:
+                self.stats.inserted += 1
+
+    def _parse(self, row: dict[str, str]) -> dict[str, Any] | None:
+        anchor_id = row.get("anchor_id", "")
+        name = row.get(self.label_column, "")
+        zone_id = self._zones.get(row.get(self.zone_column, "").lower())
+        if not anchor_id or not name or zone_id is None:
+            return None
+        if len(anchor_id) > MAX_LENGTH or len(name) > MAX_LENGTH:
+            return None
+        parsed: dict[str, Any] = {"anchor_id": anchor_id, "name": name, "zone_id": zone_id}
+        for column in self.optional_columns:
+            parsed[column] = row.get(column) or None
+        return parsed
+
+    async def _resolve_zones(self, keys: set[str]) -> None:
+        missing = {key for key in keys if key and key not in self._zones}
+        if not missing:
+            return
+        result = await self.db.execute(
+            select(Zone.id, Zone.name, Zone.slug).where(
+                Zone.owner_id == self.owner_id,
+                or_(func.lower(Zone.name).in_(missing), Zone.slug.in_(missing)),
+            )
+        )
+        for zone_id, name, slug in result.all():
+            self._zones[name.lower()] = zone_id
+            self._zones[slug] = zone_id
+        for key in missing:
+            self._zones.setdefault(key, None)
+
+    async def _existing(self, anchor_ids: Any) -> dict[str, dict[str, Any] | None]:
+        """Stored values of the known anchors, or None for those another owner holds."""
+        columns = self._columns
+        result = await self.db.execute(
+            select(Anchor.anchor_id, Zone.owner_id, *(getattr(Anchor, c) for c in columns))
+            .join(Zone)
+            .where(Anchor.anchor_id.in_(list(anchor_ids)))
+        )
+        return {
+            row[0]: dict(zip(columns, row[2:])) if row[1] == self.owner_id else None
+            for row in result.all()
+        }
+
+    def _statement(self, values: list[dict[str, Any]]) -> Any:
+        dialect = self.db.get_bind().dialect.name
+        stmt = (pg_insert if dialect == "postgresql" else sqlite_insert)(Anchor).values(values)
+        if not self.update_existing:
+            return stmt.on_conflict_do_nothing(index_elements=[Anchor.anchor_id]).returning(
+                Anchor.anchor_id
+            )
+        columns = self._columns
+        return stmt.on_conflict_do_update(
+            index_elements=[Anchor.anchor_id],
+            set_={c: stmt.excluded[c] for c in [*columns, "change_seq"]},
+            where=and_(
+                Anchor.zone_id.in_(select(Zone.id).where(Zone.owner_id == self.owner_id)),
+                or_(*(getattr(Anchor, c).is_distinct_from(stmt.excluded[c]) for c in columns)),
+            ),
+        ).returning(Anchor.anchor_id)
+
+
+async def import_records(
+    db: AsyncSession,
+    owner_id: int,
+    records: AsyncIterator[list[str]],
+    chunk_size: int = CHUNK_SIZE,
+) -> ImportStats:
+    """Feed parsed CSV ``records`` (header first) through an importer in fixed-size chunks."""
+    header = await anext(records, None)
+    if header is None:
+        raise ValueError("CSV is empty")
+    importer = AnchorImporter(db, owner_id, header)
+
+    chunk: list[dict[str, str | None]] = []
+    async for record in records:
+        if not record:
+            continue
+        chunk.append(dict(zip(header, record)))
+        if len(chunk) >= chunk_size:
+            await importer.upsert(chunk)
+            chunk = []
+    if chunk:
+        await importer.upsert(chunk)
+    return importer.stats
+
+
+async def csv_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[list[str]]:
+    """Parse CSV records out of a byte stream without buffering the whole body.
+
+    Text is only handed to the parser up to the last line break that falls
+    outside a quoted field, so records spanning network chunks stay intact.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        cut = _record_boundary(pending)
+        if cut:
+            for record in csv.reader(io.StringIO(pending[:cut])):
+                yield record
+            pending = pending[cut:]
+    pending += decoder.decode(b"", final=True)
+    for record in csv.reader(io.StringIO(pending)):
+        yield record
+
+
+def _record_boundary(text: str) -> int:
+    quoted = False
+    boundary = 0
+    for index, char in enumerate(text):
+        if char == '"':
+            quoted = not quoted
+        elif char == "\n" and not quoted:
+            boundary = index + 1
+    return boundary
+
+
+def _key(name: str) -> str:
+    return name.strip().lower()
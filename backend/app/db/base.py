@@ -8,4 +8,18 @@ class Base(DeclarativeBase):
 
 
 # Import models so Alembic can discover them.
-from app.models import anchor, breadcrumb, capture, item, user, zone  # noqa: E402,F401
+from app.models import (  # noqa: E402,F401
+    anchor,
+    api_key,
+    breadcrumb,
+    calendar_event,
+    calendar_occurrence,
+    capture,
+    capture_suggestion,
+    dwell_rollup,
+    item,
+    scan_log,
+    tombstone,
+    user,
+    zone,
+)
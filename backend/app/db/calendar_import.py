@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable, Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime, time, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, joinedload
+
+from app.core.config import settings
+from app.core.ics import Component, Event, expand, last_instance, parse_event
+from app.db.versioning import bump_data_version, record_tombstones
+from app.models.calendar_event import CalendarEvent
+from app.models.calendar_occurrence import CalendarOccurrence
+from app.models.item import Item, ItemStatus, ItemType
+
+CHUNK_SIZE = 500
+MAX_UID_LENGTH = 255
+MAX_TITLE_LENGTH = 255
+
+
+@dataclass
+class CalendarImportStats:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    skipped: int = 0
+    items_created: int = 0
+    items_updated: int = 0
+    items_deleted: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class CalendarImporter:
+    """Sync one zone's calendar from a feed's components, a chunk at a time.
+
+    Events are matched on ``UID`` (plus ``RECURRENCE-ID`` for overridden
+    instances). Components whose fingerprint is unchanged, or whose
+    ``SEQUENCE`` is older than the stored one, cost nothing beyond the chunk's
+    lookup unless time has moved new instances into the window. Changed events
+    are re-expanded over the window and their items diffed: only items whose
+    text changed are written, instances that dropped out are deleted, and
+    items from before the window are left alone. ``finish()`` removes events
+    missing from the feed. All writes share one change sequence; the caller
+    commits.
+    """
+
+    def __init__(
+        self, db: AsyncSession, owner_id: int, zone_id: int, now: datetime | None = None
+    ) -> None:
+        now = now or datetime.now(timezone.utc)
+        # Day-aligned, so imports on the same day reuse cached expansions.
+        today = datetime.combine(now.astimezone(timezone.utc).date(), time(), timezone.utc)
+        self.window_start = today - timedelta(days=settings.CALENDAR_PAST_DAYS)
+        self.window_end = today + timedelta(days=settings.CALENDAR_FUTURE_DAYS + 1)
+        self.db = db
+        self.owner_id = owner_id
+        self.zone_id = zone_id
+        self.stats = CalendarImportStats()
+        self._seen: set[tuple[str, str]] = set()
+        self._seq: int | None = None
+
+    async def upsert(self, components: Sequence[Component]) -> None:
+        entries: dict[tuple[str, str], Component] = {}
+        for component in components:
+            try:
+                key = component.identity()
+            except ValueError:
+                self.stats.skipped += 1
+                continue
+            if len(key[0]) > MAX_UID_LENGTH or key in self._seen:
+                self.stats.skipped += 1
+                continue
+            self._seen.add(key)
+            entries[key] = component
+        if not entries:
+            return
+
+        rows = await self._existing({uid for uid, _key in entries})
+        # Master events to re-materialise, keyed by UID, with where to start.
+        refresh: dict[str, tuple[CalendarEvent, Event, datetime]] = {}
+        overridden: set[str] = set()
+        for key, component in entries.items():
+            row = rows.get(key)
+            fingerprint = component.fingerprint
+            if row is not None and row.fingerprint == fingerprint:
+                # Unchanged components are only parsed once the window moves past them.
+                self.stats.unchanged += 1
+                if not key[1] and self._window_moved(row):
+                    event = parse_event(component)
+                    if event.recurrence is not None and event.recurrence.start < self.window_end:
+                        start = max(_utc(row.expanded_until), self.window_start)
+                        refresh[event.uid] = (row, event, start)
+                continue
+            try:
+                event = parse_event(component)
+            except ValueError:
+                # Not kept, so a stored version of it is removed by finish().
+                self._seen.discard(key)
+                self.stats.skipped += 1
+                continue
+            if row is None:
+                row = CalendarEvent(zone_id=self.zone_id, uid=event.uid, recurrence_key=key[1])
+                self.db.add(row)
+                self.stats.inserted += 1
+            elif event.sequence < row.sequence:
+                self.stats.unchanged += 1
+                continue
+            else:
+                self.stats.updated += 1
+            row.kind = event.kind
+            row.sequence = event.sequence
+            row.fingerprint = fingerprint
+            row.source = component.source
+            row.timezone = component.timezone
+            row.last_start = last_instance(event.recurrence) if event.recurrence else None
+            if key[1]:
+                overridden.add(event.uid)
+            else:
+                refresh[event.uid] = (row, event, self.window_start)
+        await self.db.flush()
+
+        # An edited override re-renders its master's instances.
+        for uid in overridden & refresh.keys():
+            row, event, _start = refresh[uid]
+            refresh[uid] = (row, event, self.window_start)
+        for row, event in await self._masters(overridden - refresh.keys()):
+            refresh[row.uid] = (row, event, self.window_start)
+        await self._materialize(list(refresh.values()))
+
+    async def finish(self) -> CalendarImportStats:
+        """Remove events (and their items) that were missing from the feed."""
+        rows = (
+            await self.db.execute(
+                select(CalendarEvent.id, CalendarEvent.uid, CalendarEvent.recurrence_key).where(
+                    CalendarEvent.zone_id == self.zone_id
+                )
+            )
+        ).all()
+        stale = [row for row in rows if (row.uid, row.recurrence_key) not in self._seen]
+        for start in range(0, len(stale), CHUNK_SIZE):
+            await self._remove([row.id for row in stale[start : start + CHUNK_SIZE]])
+        self.stats.removed += len(stale)
+
+        # Instances a dropped override replaced fall back to their master.
+        removed_masters = {row.uid for row in stale if not row.recurrence_key}
+        overridden = {row.uid for row in stale if row.recurrence_key} - removed_masters
+        masters = await self._masters(overridden)
+        await self._materialize([(row, event, self.window_start) for row, event in masters])
+        return self.stats
+
+    def _window_moved(self, row: CalendarEvent) -> bool:
+        """Whether an event may have instances past where it was last expanded to."""
+        if row.kind != "VEVENT" or row.expanded_until is None:
+            return False
+        expanded_until = _utc(row.expanded_until)
+        return expanded_until < self.window_end and (
+            row.last_start is None or _utc(row.last_start) >= expanded_until
+        )
+
+    async def _materialize(self, masters: list[tuple[CalendarEvent, Event, datetime]]) -> None:
+        if not masters:
+            return
+        overrides = await self._overrides([row.uid for row, _event, _start in masters])
+        existing = await self._occurrences([row.id for row, _event, _start in masters])
+        for row, event, start in masters:
+            current = existing.get(row.id, {})
+            wanted = self._instances(event, overrides.get(row.uid, {}), start)
+            for occurs_at, occurrence in current.items():
+                if occurs_at in wanted or (occurs_at is not None and occurs_at < start):
+                    continue
+                await self._delete(occurrence)
+            for occurs_at, values in wanted.items():
+                occurrence = current.get(occurs_at)
+                if occurrence is None:
+                    await self._create(row, occurs_at, values)
+                elif occurrence.item is not None:
+                    await self._update(occurrence.item, values)
+            if event.kind == "VEVENT":
+                row.expanded_until = self.window_end
+
+    def _instances(
+        self, event: Event, overrides: dict[datetime, Event], start: datetime
+    ) -> dict[datetime | None, dict[str, Any]]:
+        """Item values for each instance from ``start`` to the end of the window."""
+        if event.cancelled:
+            return {}
+        if event.recurrence is None:
+            return {None: item_values(event, None)}
+        wanted: dict[datetime | None, dict[str, Any]] = {}
+        starts = expand(
+            event.recurrence, start, self.window_end, settings.CALENDAR_MAX_OCCURRENCES
+        )
+        for occurs_at in starts:
+            override = overrides.get(occurs_at)
+            if override is None:
+                wanted[occurs_at] = item_values(event, occurs_at)
+            elif not override.cancelled and override.recurrence is not None:
+                moved_to = override.recurrence.start.astimezone(timezone.utc)
+                wanted[occurs_at] = item_values(override, moved_to)
+        return wanted
+
+    async def _create(
+        self, row: CalendarEvent, occurs_at: datetime | None, values: dict[str, Any]
+    ) -> None:
+        item = Item(
+            zone_id=self.zone_id,
+            owner_id=self.owner_id,
+            change_seq=await self._change_seq(),
+            **values,
+        )
+        self.db.add(CalendarOccurrence(event=row, occurs_at=occurs_at, item=item))
+        self.stats.items_created += 1
+
+    async def _update(self, item: Item, values: dict[str, Any]) -> None:
+        changed = {key: value for key, value in values.items() if getattr(item, key) != value}
+        if not changed:
+            return
+        for key, value in changed.items():
+            setattr(item, key, value)
+        item.change_seq = await self._change_seq()
+        self.stats.items_updated += 1
+
+    async def _delete(self, occurrence: CalendarOccurrence) -> None:
+        if occurrence.item is not None:
+            seq = await self._change_seq()
+            record_tombstones(self.db, self.owner_id, "item", [occurrence.item.id], seq)
+            await self.db.delete(occurrence.item)
+            self.stats.items_deleted += 1
+        await self.db.delete(occurrence)
+
+    async def _remove(self, event_ids: list[int]) -> None:
+        item_ids = (
+            await self.db.scalars(
+                select(CalendarOccurrence.item_id).where(
+                    CalendarOccurrence.event_id.in_(event_ids),
+                    CalendarOccurrence.item_id.is_not(None),
+                )
+            )
+        ).all()
+        await self.db.execute(
+            delete(CalendarOccurrence).where(CalendarOccurrence.event_id.in_(event_ids))
+        )
+        if item_ids:
+            seq = await self._change_seq()
+            record_tombstones(self.db, self.owner_id, "item", item_ids, seq)
+            await self.db.execute(delete(Item).where(Item.id.in_(item_ids)))
+            self.stats.items_deleted += len(item_ids)
+        await self.db.execute(delete(CalendarEvent).where(CalendarEvent.id.in_(event_ids)))
+
+    async def _existing(self, uids: Iterable[str]) -> dict[tuple[str, str], CalendarEvent]:
+        rows = await self.db.scalars(
+            select(CalendarEvent)
+            .options(defer(CalendarEvent.source))
+            .where(CalendarEvent.zone_id == self.zone_id, CalendarEvent.uid.in_(list(uids)))
+        )
+        return {(row.uid, row.recurrence_key): row for row in rows}
+
+    async def _masters(self, uids: set[str]) -> list[tuple[CalendarEvent, Event]]:
+        if not uids:
+            return []
+        rows = await self.db.scalars(
+            select(CalendarEvent).where(
+                CalendarEvent.zone_id == self.zone_id,
+                CalendarEvent.uid.in_(list(uids)),
+                CalendarEvent.recurrence_key == "",
+            )
+        )
+        return [(row, _stored_event(row)) for row in rows]
+
+    async def _overrides(self, uids: list[str]) -> dict[str, dict[datetime, Event]]:
+        rows = await self.db.execute(
+            select(CalendarEvent.kind, CalendarEvent.source, CalendarEvent.timezone).where(
+                CalendarEvent.zone_id == self.zone_id,
+                CalendarEvent.uid.in_(uids),
+                CalendarEvent.recurrence_key != "",
+            )
+        )
+        overrides: dict[str, dict[datetime, Event]] = defaultdict(dict)
+        for kind, source, tz in rows:
+            override = parse_event(Component.from_source(kind, source, tz))
+            if override.recurrence_id is not None:
+                recurrence_id = override.recurrence_id.astimezone(timezone.utc)
+                overrides[override.uid][recurrence_id] = override
+        return overrides
+
+    async def _occurrences(
+        self, event_ids: list[int]
+    ) -> dict[int, dict[datetime | None, CalendarOccurrence]]:
+        rows = await self.db.scalars(
+            select(CalendarOccurrence)
+            .options(joinedload(CalendarOccurrence.item))
+            .where(CalendarOccurrence.event_id.in_(event_ids))
+        )
+        found: dict[int, dict[datetime | None, CalendarOccurrence]] = defaultdict(dict)
+        for occurrence in rows:
+            occurs_at = _utc(occurrence.occurs_at) if occurrence.occurs_at else None
+            found[occurrence.event_id][occurs_at] = occurrence
+        return found
+
+    async def _change_seq(self) -> int:
+        if self._seq is None:
+            self._seq = await bump_data_version(self.db, self.owner_id)
+        return self._seq
+
+
+async def import_calendar(
+    db: AsyncSession,
+    owner_id: int,
+    zone_id: int,
+    components: AsyncIterator[Component],
+    chunk_size: int = CHUNK_SIZE,
+    now: datetime | None = None,
+) -> CalendarImportStats:
+    """Sync a zone's calendar items with a full feed, fed through in fixed-size chunks."""
+    importer = CalendarImporter(db, owner_id, zone_id, now)
+    chunk: list[Component] = []
+    async for component in components:
+        chunk.append(component)
+        if len(chunk) >= chunk_size:
+            await importer.upsert(chunk)
+            chunk = []
+    if chunk:
+        await importer.upsert(chunk)
+    return await importer.finish()
+
+
+def item_values(event: Event, occurs_at: datetime | None) -> dict[str, Any]:
+    """Title, body and type of the item for one instance (or a to-do)."""
+    lines = []
+    if event.recurrence is not None and occurs_at is not None:
+        lines.append(_when(event, occurs_at))
+    elif event.due is not None:
+        lines.append(f"Due {_format(event.due, event.due_all_day)}")
+    lines.extend(text for text in (event.location, event.description) if text)
+    values: dict[str, Any] = {
+        "title": event.summary[:MAX_TITLE_LENGTH],
+        "body": "\n".join(lines) or None,
+        "type": ItemType.NOTE.value if event.kind == "VEVENT" else ItemType.TASK.value,
+    }
+    if event.kind == "VTODO":
+        # Event items keep whatever status was set in the app.
+        values["status"] = ItemStatus.DONE.value if event.completed else ItemStatus.OPEN.value
+    return values
+
+
+def _when(event: Event, occurs_at: datetime) -> str:
+    assert event.recurrence is not None
+    duration = event.duration or timedelta()
+    if event.recurrence.all_day:
+        last_day = occurs_at + max(duration - timedelta(days=1), timedelta())
+        if last_day.date() == occurs_at.date():
+            return f"{occurs_at:%a %d %b %Y}, all day"
+        return f"{occurs_at:%a %d %b %Y} – {last_day:%a %d %b %Y}"
+    tz = event.recurrence.start.tzinfo
+    start = occurs_at.astimezone(tz)
+    end = (occurs_at + duration).astimezone(tz)
+    if not duration:
+        return f"{start:%a %d %b %Y %H:%M} ({start.tzname()})"
+    if end.date() == start.date():
+        return f"{start:%a %d %b %Y %H:%M}–{end:%H:%M} ({start.tzname()})"
+    return f"{start:%a %d %b %Y %H:%M} – {end:%a %d %b %Y %H:%M} ({end.tzname()})"
+
+
+def _format(value: datetime, all_day: bool) -> str:
+    if all_day:
+        return f"{value:%a %d %b %Y}"
+    return f"{value:%a %d %b %Y %H:%M} ({value.tzname()})"
+
+
+def _stored_event(row: CalendarEvent) -> Event:
+    return parse_event(Component.from_source(row.kind, row.source, row.timezone))
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; they were written in UTC.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from itertools import chain
+from typing import Any
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.config import settings
+from app.db.hooks import on_commit, transaction_state
+from app.db.session import engine
+from app.models.anchor import Anchor
+from app.models.breadcrumb import Breadcrumb
+from app.models.capture import Capture
+from app.models.item import Item
+from app.models.tombstone import Tombstone
+from app.models.zone import Zone
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "hive_changes"
+RECONNECT_DELAY = 5.0
+
+ENTITY_NAMES: dict[type, str] = {
+    Zone: "zone",
+    Anchor: "anchor",
+    Item: "item",
+    Capture: "capture",
+    Breadcrumb: "breadcrumb",
+}
+_MAPPER_NAMES = {model.__mapper__: name for model, name in ENTITY_NAMES.items()}
+
+_VERSIONS_KEY = "change_stream_versions"
+_ENTITIES_KEY = "change_stream_entities"
+
+
+@dataclass
+class ChangeStreamStats:
+    published: int = 0
+    delivered: int = 0
+    overflows: int = 0
+    listener_errors: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class Subscription:
+    """One client's bounded event queue.
+
+    A client that falls ``maxsize`` events behind has its backlog replaced by
+    a single ``resync`` event; it then catches up through ``/api/changes``
+    instead of holding back the broadcaster or growing without bound.
+    """
+
+    def __init__(self, owner_id: int, maxsize: int) -> None:
+        self.owner_id = owner_id
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize)
+
+    def offer(self, change: dict[str, Any]) -> bool:
+        try:
+            self.queue.put_nowait(change)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync", "cursor": change.get("cursor")})
+            return False
+
+    async def get(self) -> dict[str, Any]:
+        return await self.queue.get()
+
+
+class ChangeBroker:
+    """Fan committed changes out to the subscribed clients of each owner.
+
+    On SQLite, or with ``CHANGE_STREAM_NOTIFY`` off, commits publish straight
+    to this process. On Postgres every commit issues ``pg_notify`` inside its
+    transaction and each worker ``LISTEN``s on one dedicated connection, so
+    clients see changes made through any worker or script.
+    """
+
+    def __init__(self, queue_size: int, use_notify: bool) -> None:
+        self.queue_size = queue_size
+        self.use_notify = use_notify and engine.dialect.name == "postgresql"
+        self.stats = ChangeStreamStats()
+        self._subscriptions: defaultdict[int, set[Subscription]] = defaultdict(set)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._listener: Any = None
+        self._lock = threading.Lock()
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if self.use_notify:
+            await self._listen()
+
+    async def stop(self) -> None:
+        self._close_listener()
+        for subscriptions in list(self._subscriptions.values()):
+            for subscription in list(subscriptions):
+                subscription.offer({"type": "closing"})
+        self._loop = None
+
+    def subscribe(self, owner_id: int) -> Subscription:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        subscription = Subscription(owner_id, self.queue_size)
+        with self._lock:
+            self._subscriptions[owner_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.owner_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.owner_id]
+
+    def publish(self, changes: list[dict[str, Any]]) -> None:
+        """Deliver ``changes`` to local subscribers; safe to call from any thread."""
+        self.stats.published += len(changes)
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(changes)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, changes)
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            subscribers = sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+        return {
+            **self.stats.as_dict(),
+            "mode": "notify" if self.use_notify else "local",
+            "listening": self._listener is not None,
+            "subscribers": subscribers,
+        }
+
+    def _dispatch(self, changes: list[dict[str, Any]]) -> None:
+        for change in changes:
+            with self._lock:
+                subscriptions = list(self._subscriptions.get(change["owner_id"], ()))
+            for subscription in subscriptions:
+                if subscription.offer(change):
+                    self.stats.delivered += 1
+                else:
+                    self.stats.overflows += 1
+
+    def _broadcast_resync(self) -> None:
+        with self._lock:
+            subscriptions = [s for group in self._subscriptions.values() for s in group]
+        for subscription in subscriptions:
+            subscription.offer({"type": "resync", "cursor": None})
+
+    async def _listen(self) -> None:
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        try:
+            connection = await asyncio.to_thread(psycopg2.connect, dsn)
+            connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+        except psycopg2.Error:
+            logger.exception("Could not LISTEN for changes; retrying in %ss", RECONNECT_DELAY)
+            self.stats.listener_errors += 1
+            self._schedule_reconnect()
+            return
+        if self._loop is None:
+            connection.close()
+            return
+        self._listener = connection
+        self._loop.add_reader(connection.fileno(), self._on_notify)
+        # Anything committed while we were not listening was missed.
+        self._broadcast_resync()
+
+    def _on_notify(self) -> None:
+        import psycopg2
+
+        connection = self._listener
+        try:
+            connection.poll()
+        except psycopg2.Error:
+            logger.exception("Change listener connection lost")
+            self.stats.listener_errors += 1
+            self._close_listener()
+            self._schedule_reconnect()
+            return
+        changes = []
+        while connection.notifies:
+            notify = connection.notifies.pop(0)
+            changes.append(json.loads(notify.payload))
+        if changes:
+            self._dispatch(changes)
+
+    def _close_listener(self) -> None:
+        connection, self._listener = self._listener, None
+        if connection is None:
+            return
+        if self._loop is not None and not connection.closed:
+            self._loop.remove_reader(connection.fileno())
+        connection.close()
+
+    def _schedule_reconnect(self) -> None:
+        if self._loop is not None:
+            self._loop.call_later(
+                RECONNECT_DELAY, lambda: asyncio.ensure_future(self._listen())
+            )
+
+
+change_broker = ChangeBroker(settings.CHANGE_STREAM_QUEUE_SIZE, settings.CHANGE_STREAM_NOTIFY)
+
+
+def record_change(session: Any, owner_id: int, seq: int) -> None:
+    """Note that ``owner_id`` reached change sequence ``seq`` in this transaction."""
+    versions = transaction_state(session, _VERSIONS_KEY, dict)
+    versions[owner_id] = max(seq, versions.get(owner_id, 0))
+
+
+def _track_flush(session: Session, _flush_context: Any) -> None:
+    entities = transaction_state(session, _ENTITIES_KEY, set)
+    for instance in chain(session.new, session.dirty, session.deleted):
+        if isinstance(instance, Tombstone):
+            entities.add(instance.entity)
+        elif type(instance) in ENTITY_NAMES:
+            entities.add(ENTITY_NAMES[type(instance)])
+
+
+def _track_bulk_statement(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        name = _MAPPER_NAMES.get(state.bind_mapper)
+        if name is not None:
+            transaction_state(state.session, _ENTITIES_KEY, set).add(name)
+
+
+def _before_commit(session: Session) -> None:
+    versions = transaction_state(session, _VERSIONS_KEY, dict)
+    if not versions:
+        return
+    # before_commit runs ahead of the final flush; flush now so it is tracked.
+    session.flush()
+    entities = sorted(transaction_state(session, _ENTITIES_KEY, set))
+    changes = [
+        {"type": "change", "owner_id": owner_id, "cursor": seq, "entities": entities}
+        for owner_id, seq in versions.items()
+    ]
+    if change_broker.use_notify:
+        change_broker.stats.published += len(changes)
+        # NOTIFY is transactional: listeners hear it only if this commit succeeds.
+        for change in changes:
+            session.execute(select(func.pg_notify(CHANNEL, json.dumps(change))))
+    else:
+        on_commit(session, lambda: change_broker.publish(changes))
+
+
+event.listen(Session, "after_flush", _track_flush)
+event.listen(Session, "do_orm_execute", _track_bulk_statement)
+event.listen(Session, "before_commit", _before_commit)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Literal
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.anchor import Anchor
+from app.models.dwell_rollup import DwellRollup
+
+DwellPeriod = Literal["day", "week", "month"]
+DwellScope = Literal["anchor", "zone"]
+
+PERIODS: tuple[DwellPeriod, ...] = ("day", "week", "month")
+
+# (period, scope, bucket, scope_id) -> [seconds, sessions, interruptions]
+DwellTotals = defaultdict[tuple[str, str, date, int], list[int]]
+
+
+def new_totals() -> DwellTotals:
+    return defaultdict(lambda: [0, 0, 0])
+
+
+def bucket_start(moment: datetime | date, period: str) -> date:
+    """Start of the UTC day, ISO week (Monday) or month containing ``moment``."""
+    day = _utc(moment).date() if isinstance(moment, datetime) else moment
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(bucket: date, period: str) -> date:
+    if period == "week":
+        return bucket + timedelta(days=7)
+    if period == "month":
+        return (bucket.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return bucket + timedelta(days=1)
+
+
+def split_dwell(
+    started_at: datetime, ended_at: datetime, period: str
+) -> Iterator[tuple[date, int]]:
+    """Yield ``(bucket, seconds)`` for each bucket the interval overlaps."""
+    start, end = _utc(started_at), _utc(ended_at)
+    bucket = bucket_start(start, period)
+    while start < end:
+        boundary = datetime.combine(next_bucket(bucket, period), time.min)
+        yield bucket, int((min(end, boundary) - start).total_seconds())
+        start, bucket = boundary, next_bucket(bucket, period)
+
+
+def accumulate(
+    totals: DwellTotals,
+    anchor_id: int,
+    zone_id: int | None,
+    started_at: datetime,
+    ended_at: datetime,
+    interrupted: bool = False,
+) -> None:
+    """Add one closed breadcrumb to ``totals`` for every period and scope.
+
+    Time is split across the buckets the crumb spans. The session is counted
+    in the bucket it started in, an interruption in the bucket it ended in.
+    """
+    scopes = [("anchor", anchor_id)] + ([("zone", zone_id)] if zone_id is not None else [])
+    for period in PERIODS:
+        first = bucket_start(started_at, period)
+        last = bucket_start(ended_at, period)
+        for scope, scope_id in scopes:
+            totals[period, scope, first, scope_id][1] += 1
+            if interrupted:
+                totals[period, scope, last, scope_id][2] += 1
+            for bucket, seconds in split_dwell(started_at, ended_at, period):
+                totals[period, scope, bucket, scope_id][0] += seconds
+
+
+async def record_dwell(
+    db: AsyncSession,
+    owner_id: int,
+    anchor_id: int,
+    started_at: datetime,
+    ended_at: datetime,
+    interrupted: bool = False,
+) -> None:
+    """Fold a breadcrumb that just closed into the owner's rollups; the caller commits."""
+    zone_id = await db.scalar(select(Anchor.zone_id).where(Anchor.id == anchor_id))
+    totals = new_totals()
+    accumulate(totals, anchor_id, zone_id, started_at, ended_at, interrupted)
+    await upsert_rollups(db, owner_id, totals)
+
+
+async def upsert_rollups(db: AsyncSession, owner_id: int, totals: DwellTotals) -> None:
+    """Add ``totals`` onto the stored rollups with one ``INSERT ... ON CONFLICT`` statement."""
+    if not totals:
+        return
+    values = [
+        {
+            "owner_id": owner_id,
+            "period": period,
+            "scope": scope,
+            "bucket": bucket,
+            "scope_id": scope_id,
+            "seconds": seconds,
+            "sessions": sessions,
+            "interruptions": interruptions,
+        }
+        for (period, scope, bucket, scope_id), (seconds, sessions, interruptions) in totals.items()
+    ]
+    dialect = db.get_bind().dialect.name
+    stmt = (pg_insert if dialect == "postgresql" else sqlite_insert)(DwellRollup).values(values)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["owner_id", "period", "scope", "bucket", "scope_id"],
+            set_={
+                column: getattr(DwellRollup, column) + stmt.excluded[column]
+                for column in ("seconds", "sessions", "interruptions")
+            },
+        )
+    )
+
+
+def _utc(moment: datetime) -> datetime:
+    # SQLite hands back naive UTC timestamps, Postgres aware ones; compare naive UTC.
+    if moment.tzinfo is not None:
+        return moment.astimezone(UTC).replace(tzinfo=None)
+    return moment
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_CALLBACKS_KEY = "after_commit_callbacks"
+_STATE_KEY = "transaction_state"
+
+
+def on_commit(session: Any, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the session's current transaction commits.
+
+    Accepts a sync ``Session``, an ``AsyncSession`` or the sync adapter. The
+    callback is dropped if the transaction rolls back, and registering the
+    same callback twice in one transaction runs it once.
+    """
+    sync_session = getattr(session, "sync_session", session)
+    callbacks = sync_session.info.setdefault(_CALLBACKS_KEY, [])
+    if callback not in callbacks:
+        callbacks.append(callback)
+
+
+def transaction_state(session: Any, key: str, factory: Callable[[], Any]) -> Any:
+    """Scratch state for the session's current transaction, dropped on commit or rollback."""
+    sync_session = getattr(session, "sync_session", session)
+    state = sync_session.info.setdefault(_STATE_KEY, {})
+    if key not in state:
+        state[key] = factory()
+    return state[key]
+
+
+@event.listens_for(Session, "after_commit")
+def _run_callbacks(session: Session) -> None:
+    session.info.pop(_STATE_KEY, None)
+    for callback in session.info.pop(_CALLBACKS_KEY, []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_callbacks(session: Session) -> None:
+    session.info.pop(_STATE_KEY, None)
+    session.info.pop(_CALLBACKS_KEY, None)
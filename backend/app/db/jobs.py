@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.hooks import on_commit
+from app.db.session import open_session
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[..., Awaitable[None]]
+
+
+@dataclass
+class Job:
+    id: int
+    kind: str
+    payload: dict[str, Any]
+    enqueued_at: float
+    attempts: int = 0
+
+
+@dataclass
+class JobQueueStats:
+    enqueued: int = 0
+    succeeded: int = 0
+    retried: int = 0
+    failed: int = 0
+    dropped: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    run_seconds_total: float = 0.0
+    run_seconds_max: float = 0.0
+    run_seconds_last: float = 0.0
+    kinds: Counter[str] = field(default_factory=Counter)
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["kinds"] = dict(self.kinds)
+        started = self.succeeded + self.retried + self.failed
+        data["wait_seconds_avg"] = self.wait_seconds_total / started if started else 0.0
+        data["run_seconds_avg"] = self.run_seconds_total / started if started else 0.0
+        return data
+
+
+class JobQueue:
+    """Run registered handlers after the request that asked for them has answered.
+
+    Jobs live in memory and are worked by ``workers`` tasks, which caps how
+    many run at once. Each attempt gets its own session; a failing job is
+    retried with exponential backoff up to ``max_attempts`` times. ``stop()``
+    lets queued jobs finish for up to ``drain_seconds``. Jobs still queued
+    when the process exits are lost, so handlers must be safe to skip or
+    redo (inbox inference, for instance, is recoverable through a rescore).
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        limit: int,
+        max_attempts: int,
+        retry_delay: float,
+        drain_seconds: float,
+    ) -> None:
+        self.workers = workers
+        self.limit = limit
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.drain_seconds = drain_seconds
+        self.stats = JobQueueStats()
+        self._handlers: dict[str, JobHandler] = {}
+        self._pending: deque[Job] = deque()
+        self._ids = itertools.count(1)
+        self._running = 0
+        self._retrying = 0
+        self._wakeup: asyncio.Event | None = None
+        self._idle: asyncio.Event | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """``handler(db, **payload)`` runs each job of ``kind``; it commits its own work."""
+        self._handlers[kind] = handler
+
+    def enqueue(self, kind: str, **payload: Any) -> None:
+        if kind not in self._handlers:
+            raise KeyError(f"No job handler registered for {kind!r}")
+        if len(self._pending) >= self.limit:
+            self.stats.dropped += 1
+            logger.error("Job queue is full; dropping %s job", kind)
+            return
+        self._push(Job(next(self._ids), kind, payload, time.monotonic()))
+        self.stats.enqueued += 1
+        self.stats.kinds[kind] += 1
+
+    def enqueue_after_commit(self, db: AsyncSession, kind: str, **payload: Any) -> None:
+        """Queue the job once ``db``'s transaction commits; a rollback drops it."""
+        on_commit(db, lambda: self.enqueue(kind, **payload))
+
+    async def start(self) -> None:
+        # Created here so they bind to the serving event loop.
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        if self._pending:
+            self._wakeup.set()
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"job-worker-{index}")
+            for index in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        if self._idle is not None and (self._pending or self._running or self._retrying):
+            self._idle.clear()
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout=self.drain_seconds)
+            except asyncio.TimeoutError:
+                pass
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = self._idle = None
+        if self._pending:
+            logger.error("Dropping %d queued jobs at shutdown", self.depth)
+            self.stats.dropped += self.depth
+            self._pending.clear()
+
+    def status(self) -> dict[str, Any]:
+        oldest = time.monotonic() - self._pending[0].enqueued_at if self._pending else 0.0
+        return {
+            "depth": self.depth,
+            "running": self._running,
+            "retrying": self._retrying,
+            "workers": len(self._tasks),
+            "limit": self.limit,
+            "max_attempts": self.max_attempts,
+            "oldest_wait_seconds": oldest,
+            **self.stats.as_dict(),
+        }
+
+    def _push(self, job: Job) -> None:
+        self._pending.append(job)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _work(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            job = self._pending.popleft()
+            self._running += 1
+            try:
+                await self._attempt(job)
+            finally:
+                self._running -= 1
+                self._check_idle()
+
+    async def _attempt(self, job: Job) -> None:
+        job.attempts += 1
+        started = time.monotonic()
+        if job.attempts == 1:
+            wait = started - job.enqueued_at
+            self.stats.wait_seconds_total += wait
+            self.stats.wait_seconds_max = max(self.stats.wait_seconds_max, wait)
+        try:
+            await _run(self._handlers[job.kind], job.payload)
+        except Exception:
+            if job.attempts >= self.max_attempts:
+                self.stats.failed += 1
+                logger.exception(
+                    "%s job %d failed after %d attempts", job.kind, job.id, job.attempts
+                )
+            else:
+                self.stats.retried += 1
+                logger.warning("%s job %d failed; retrying", job.kind, job.id, exc_info=True)
+                self._retry_later(job)
+        else:
+            self.stats.succeeded += 1
+        elapsed = time.monotonic() - started
+        self.stats.run_seconds_total += elapsed
+        self.stats.run_seconds_last = elapsed
+        self.stats.run_seconds_max = max(self.stats.run_seconds_max, elapsed)
+
+    def _retry_later(self, job: Job) -> None:
+        self._retrying += 1
+
+        def requeue() -> None:
+            self._retrying -= 1
+            self._push(job)
+
+        delay = self.retry_delay * 2 ** (job.attempts - 1)
+        asyncio.get_running_loop().call_later(delay, requeue)
+
+    def _check_idle(self) -> None:
+        if self._idle is not None and not (self._pending or self._running or self._retrying):
+            self._idle.set()
+
+
+async def _run(handler: JobHandler, payload: dict[str, Any]) -> None:
+    db = open_session()
+    try:
+        await handler(db, **payload)
+    finally:
+        await db.close()
+
+
+job_queue = JobQueue(
+    settings.JOB_WORKERS,
+    settings.JOB_QUEUE_LIMIT,
+    settings.JOB_MAX_ATTEMPTS,
+    settings.JOB_RETRY_DELAY_MS / 1000,
+    settings.JOB_DRAIN_SECONDS,
+)
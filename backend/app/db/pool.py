@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.config import settings
+
+# Checkouts slower than this count as waits even when the pool had room, unless
+# the time went on opening a new connection.
+WAIT_THRESHOLD_SECONDS = 0.005
+# Set in a connection record's info by the ``connect`` event, cleared by the checkout.
+_OPENED = "hive_pool_opened"
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    checkins: int = 0
+    connects: int = 0
+    invalidations: int = 0
+    timeouts: int = 0
+    waits: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    overflow_peak: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_checkout(self, seconds: float, overflow: int, waited: bool) -> None:
+        with self._lock:
+            self.overflow_peak = max(self.overflow_peak, overflow)
+            if waited:
+                self.waits += 1
+                self.wait_seconds_total += seconds
+                self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def incr(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            data = {f.name: getattr(self, f.name) for f in fields(self) if f.name != "_lock"}
+        data["wait_seconds_avg"] = (
+            data["wait_seconds_total"] / data["waits"] if data["waits"] else 0.0
+        )
+        return data
+
+
+class InstrumentedPoolMixin:
+    """Time checkouts that had to wait for a free connection.
+
+    A checkout counts as a wait when the pool and its overflow were both
+    exhausted, or when it took longer than ``WAIT_THRESHOLD_SECONDS`` without
+    opening a connection; opening one (the first fill, or an overflow
+    connection) is growth rather than contention.
+    """
+
+    stats: PoolStats
+
+    def __init__(self, *args: Any, max_overflow: int = 10, **kwargs: Any) -> None:
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)  # type: ignore[call-arg]
+        self.max_overflow = max_overflow
+        self.stats = PoolStats()
+
+    def connect(self) -> Any:
+        exhausted = (
+            self.max_overflow >= 0
+            and self.checkedin() == 0  # type: ignore[attr-defined]
+            and self.overflow() >= self.max_overflow  # type: ignore[attr-defined]
+        )
+        started = time.perf_counter()
+        try:
+            connection = super().connect()  # type: ignore[misc]
+        except PoolTimeoutError:
+            self.stats.incr("timeouts")
+            raise
+        elapsed = time.perf_counter() - started
+        opened = connection.info.pop(_OPENED, False)
+        self.stats.record_checkout(
+            elapsed,
+            max(self.overflow(), 0),  # type: ignore[attr-defined]
+            exhausted or (elapsed >= WAIT_THRESHOLD_SECONDS and not opened),
+        )
+        return connection
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_pool_options(url: URL, is_async: bool) -> dict[str, Any]:
+    """Pool keyword arguments for ``create_engine``/``create_async_engine``."""
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def instrument_pool(pool: Pool) -> None:
+    if not isinstance(pool, InstrumentedPoolMixin):
+        return
+
+    def on_connect(_dbapi_connection: Any, record: Any) -> None:
+        pool.stats.incr("connects")
+        record.info[_OPENED] = True
+
+    event.listen(pool, "checkout", lambda *_: pool.stats.incr("checkouts"))
+    event.listen(pool, "checkin", lambda *_: pool.stats.incr("checkins"))
+    event.listen(pool, "connect", on_connect)
+    event.listen(pool, "invalidate", lambda *_: pool.stats.incr("invalidations"))
+
+
+def pool_status(pool: Pool) -> dict[str, Any]:
+    status: dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, InstrumentedPoolMixin):
+        status["stats"] = pool.stats.as_dict()
+    return status
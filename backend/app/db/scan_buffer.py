@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.db.session import open_session
+from app.models.scan_log import ScanLog
+
+logger = logging.getLogger(__name__)
+
+
+class ScanBufferFull(Exception):
+    """Raised when accepting more scans would exceed the buffer limit."""
+
+
+@dataclass
+class ScanBufferStats:
+    accepted: int = 0
+    flushed: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    dropped: int = 0
+    flush_seconds_total: float = 0.0
+    flush_seconds_max: float = 0.0
+    flush_seconds_last: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["flush_seconds_avg"] = (
+            data["flush_seconds_total"] / data["batches"] if data["batches"] else 0.0
+        )
+        return data
+
+
+class ScanBuffer:
+    """Hold scan rows in memory and write them as multi-row inserts.
+
+    A background task flushes every ``interval`` seconds, or as soon as a
+    full batch is waiting, so each batch costs one commit no matter how many
+    devices contributed to it. A failed batch goes back to the front of the
+    queue and is retried on the next flush, up to ``max_attempts`` times
+    before it is dropped. A batch rejected by a constraint (an anchor or user
+    deleted while its scans were queued) is written row by row instead, so
+    only the offending rows are dropped. ``stop()`` drains what is left.
+    """
+
+    def __init__(self, batch_size: int, interval: float, limit: int, max_attempts: int) -> None:
+        self.batch_size = batch_size
+        self.interval = interval
+        self.limit = limit
+        self.max_attempts = max(1, max_attempts)
+        self.stats = ScanBufferStats()
+        self._pending: deque[dict[str, Any]] = deque()
+        # Failed attempts of the batch at the head of the queue.
+        self._attempts = 0
+        self._wakeup: asyncio.Event | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def add(self, rows: list[dict[str, Any]]) -> None:
+        if len(self._pending) + len(rows) > self.limit:
+            raise ScanBufferFull
+        self._pending.extend(rows)
+        self.stats.accepted += len(rows)
+        if self._wakeup is not None and len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        # Created here so they bind to the serving event loop.
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run(), name="scan-buffer-flush")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._pending:
+            logger.error("Dropping %d buffered scans that could not be written", self.depth)
+            self._pending.clear()
+
+    async def flush(self) -> None:
+        lock = self._flush_lock or asyncio.Lock()
+        async with lock:
+            while self._pending:
+                size = min(self.batch_size, len(self._pending))
+                batch = [self._pending.popleft() for _ in range(size)]
+                started = time.perf_counter()
+                try:
+                    await _write(batch)
+                    self.stats.flushed += len(batch)
+                except IntegrityError:
+                    logger.warning("Batch of %d scans rejected; writing rows one by one", size)
+                    try:
+                        await self._write_rows(batch)
+                    except Exception:
+                        # ``batch`` now holds only the rows that were not written.
+                        self._retry_later(batch)
+                        return
+                except Exception:
+                    self._retry_later(batch)
+                    return
+                self._attempts = 0
+                elapsed = time.perf_counter() - started
+                self.stats.batches += 1
+                self.stats.flush_seconds_total += elapsed
+                self.stats.flush_seconds_last = elapsed
+                self.stats.flush_seconds_max = max(self.stats.flush_seconds_max, elapsed)
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "limit": self.limit,
+            "batch_size": self.batch_size,
+            "max_attempts": self.max_attempts,
+            "interval_seconds": self.interval,
+            "running": self._task is not None and not self._task.done(),
+            **self.stats.as_dict(),
+        }
+
+    async def _write_rows(self, batch: list[dict[str, Any]]) -> None:
+        """Write rows one at a time, dropping those a constraint rejects.
+
+        Rows leave ``batch`` as they are written or dropped, so on an
+        unexpected error it holds exactly the rows still to be retried.
+        """
+        db = open_session()
+        try:
+            while batch:
+                try:
+                    await db.execute(insert(ScanLog), batch[:1])
+                    await db.commit()
+                    self.stats.flushed += 1
+                except IntegrityError:
+                    await db.rollback()
+                    self.stats.dropped += 1
+                    logger.warning(
+                        "Dropping scan of anchor %s for user %s: constraint violation",
+                        batch[0].get("anchor_id"),
+                        batch[0].get("owner_id"),
+                    )
+                del batch[0]
+        finally:
+            await db.close()
+
+    def _retry_later(self, batch: list[dict[str, Any]]) -> None:
+        self.stats.failed_batches += 1
+        self._attempts += 1
+        if self._attempts >= self.max_attempts:
+            self._attempts = 0
+            self.stats.dropped += len(batch)
+            logger.exception(
+                "Dropping %d scans after %d failed flushes", len(batch), self.max_attempts
+            )
+            return
+        self._pending.extendleft(reversed(batch))
+        logger.exception("Failed to flush %d scans; will retry", len(batch))
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+
+async def _write(batch: list[dict[str, Any]]) -> None:
+    db = open_session()
+    try:
+        await db.execute(insert(ScanLog), batch)
+        await db.commit()
+    finally:
+        await db.close()
+
+
+scan_buffer = ScanBuffer(
+    settings.SCAN_BATCH_SIZE,
+    settings.SCAN_FLUSH_INTERVAL_MS / 1000,
+    settings.SCAN_BUFFER_LIMIT,
+    settings.SCAN_FLUSH_MAX_ATTEMPTS,
+)
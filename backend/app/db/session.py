@@ -1,19 +1,155 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from typing import Any, Callable
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
 
 from app.core.config import settings
+from app.db.pool import engine_pool_options, instrument_pool
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
-engine = create_engine(settings.DATABASE_URL, future=True)
+engine = create_engine(
+    settings.DATABASE_URL,
+    future=True,
+    **engine_pool_options(make_url(settings.DATABASE_URL), is_async=False),
+)
+instrument_pool(engine.pool)
+SyncSessionFactory = sessionmaker(
+    bind=engine, autocommit=False, autoflush=False, expire_on_commit=False, future=True
+)
+# Thread-local sessions for scripts and Alembic-adjacent tooling.
 SessionLocal = scoped_session(
     sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
 )
 
 
-def get_db():
-    db = SessionLocal()
+def async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver known for {url.drivername}; set ASYNC_DATABASE_URL")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+async_engine = None
+if settings.DATABASE_ASYNC:
+    _async_url = make_url(async_database_url())
+    async_engine = create_async_engine(
+        _async_url, **engine_pool_options(_async_url, is_async=True)
+    )
+    instrument_pool(async_engine.sync_engine.pool)
+AsyncSessionLocal = (
+    async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None
+    else None
+)
+
+
+class SyncSessionAdapter:
+    """Expose a sync ``Session`` through the ``AsyncSession`` API used by the routes.
+
+    Statements run inline on the event loop, which is only acceptable for
+    SQLite development with ``DATABASE_ASYNC=false``.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self.sync_session = session
+
+    @property
+    def info(self) -> dict[Any, Any]:
+        return self.sync_session.info
+
+    def get_bind(self, *args: Any, **kwargs: Any) -> Any:
+        return self.sync_session.get_bind(*args, **kwargs)
+
+    def add(self, instance: object) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances: Any) -> None:
+        self.sync_session.add_all(instances)
+
+    def expunge(self, instance: object) -> None:
+        self.sync_session.expunge(instance)
+
+    async def execute(self, statement: Any, params: Any = None, **kwargs: Any) -> Any:
+        return self.sync_session.execute(statement, params, **kwargs)
+
+    async def scalar(self, statement: Any, params: Any = None, **kwargs: Any) -> Any:
+        return self.sync_session.scalar(statement, params, **kwargs)
+
+    async def scalars(self, statement: Any, params: Any = None, **kwargs: Any) -> Any:
+        return self.sync_session.scalars(statement, params, **kwargs)
+
+    async def stream(self, statement: Any, params: Any = None, **kwargs: Any) -> Any:
+        return _SyncStream(self.sync_session.execute(statement, params, **kwargs))
+
+    async def stream_scalars(self, statement: Any, params: Any = None, **kwargs: Any) -> Any:
+        return _SyncStream(self.sync_session.scalars(statement, params, **kwargs))
+
+    async def get(self, entity: Any, ident: Any, **kwargs: Any) -> Any:
+        return self.sync_session.get(entity, ident, **kwargs)
+
+    async def delete(self, instance: object) -> None:
+        self.sync_session.delete(instance)
+
+    async def flush(self, objects: Any = None) -> None:
+        self.sync_session.flush(objects)
+
+    async def refresh(self, instance: object, attribute_names: Any = None) -> None:
+        self.sync_session.refresh(instance, attribute_names)
+
+    async def commit(self) -> None:
+        self.sync_session.commit()
+
+    async def rollback(self) -> None:
+        self.sync_session.rollback()
+
+    async def close(self) -> None:
+        self.sync_session.close()
+
+    async def run_sync(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return fn(self.sync_session, *args, **kwargs)
+
+
+class _SyncStream:
+    """Async iteration over a sync result, mirroring ``AsyncSession.stream``."""
+
+    def __init__(self, result: Any) -> None:
+        self.result = result
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        for row in self.result:
+            yield row
+
+    async def close(self) -> None:
+        self.result.close()
+
+
+def open_session() -> AsyncSession:
+    if AsyncSessionLocal is not None:
+        return AsyncSessionLocal()
+    return SyncSessionAdapter(SyncSessionFactory())  # type: ignore[return-value]
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    db = open_session()
     try:
         yield db
     finally:  # pragma: no cover - simple resource cleanup
-        db.close()
+        await db.close()
+
+
+async def dispose_engines() -> None:
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.change_stream import record_change
+from app.models.tombstone import Tombstone
+from app.models.user import User
+
+
+async def bump_data_version(db: AsyncSession, owner_id: int) -> int:
+    """Increment the owner's data version inside the caller's transaction.
+
+    The ``UPDATE`` takes a row lock on the owner, so concurrent writers for the
+    same owner commit in version order. Once the transaction commits, the new
+    version is pushed to the owner's change stream subscribers.
+    """
+    stmt = (
+        update(User)
+        .where(User.id == owner_id)
+        .values(data_version=User.data_version + 1, data_modified_at=func.now())
+        .returning(User.data_version)
+        .execution_options(synchronize_session=False)
+    )
+    seq = (await db.execute(stmt)).scalar_one()
+    record_change(db, owner_id, seq)
+    return seq
+
+
+async def get_data_version(db: AsyncSession, owner_id: int) -> int:
+    version = await db.scalar(select(User.data_version).where(User.id == owner_id))
+    return version or 0
+
+
+async def get_data_state(db: AsyncSession, owner_id: int) -> tuple[int, datetime | None]:
+    """The owner's data version and when it last changed, in one primary-key lookup."""
+    row = (
+        await db.execute(
+            select(User.data_version, User.data_modified_at).where(User.id == owner_id)
+        )
+    ).first()
+    return (row[0], row[1]) if row is not None else (0, None)
+
+
+async def stamp_changes(db: AsyncSession, owner_id: int, *rows: object) -> int:
+    """Bump the owner's data version and tag ``rows`` with it as their change sequence."""
+    seq = await bump_data_version(db, owner_id)
+    for row in rows:
+        row.change_seq = seq
+    return seq
+
+
+async def touch_rows(db: AsyncSession, model: type, seq: int, *criteria: object) -> None:
+    """Stamp rows changed as a side effect (e.g. nulled foreign keys) with ``seq``."""
+    await db.execute(
+        update(model)
+        .where(*criteria)
+        .values(change_seq=seq)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def record_tombstones(
+    db: AsyncSession, owner_id: int, entity: str, entity_ids: Iterable[int], seq: int
+) -> None:
+    db.add_all(
+        Tombstone(owner_id=owner_id, entity=entity, entity_id=entity_id, change_seq=seq)
+        for entity_id in entity_ids
+    )
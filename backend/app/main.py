@@ -1,11 +1,33 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import api_router
+from app.db.change_stream import change_broker
+from app.db.jobs import job_queue
+from app.db.scan_buffer import scan_buffer
+from app.db.session import dispose_engines
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    await scan_buffer.start()
+    await change_broker.start()
+    await job_queue.start()
+    yield
+    # Finish queued jobs first so their commits still reach change subscribers.
+    await job_queue.stop()
+    await change_broker.stop()
+    # Drain buffered writes while the engines are still available.
+    await scan_buffer.stop()
+    await dispose_engines()
+
 
-app = FastAPI(title="Hive Dashboard API", version="0.1.0")
+app = FastAPI(title="Hive Dashboard API", version="0.1.0", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
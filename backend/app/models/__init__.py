@@ -1,8 +1,15 @@
 """ORM models for Hive Dashboard."""
 
 from app.models.anchor import Anchor  # noqa: F401
+from app.models.api_key import ApiKey  # noqa: F401
 from app.models.breadcrumb import Breadcrumb  # noqa: F401
+from app.models.calendar_event import CalendarEvent  # noqa: F401
+from app.models.calendar_occurrence import CalendarOccurrence  # noqa: F401
 from app.models.capture import Capture  # noqa: F401
+from app.models.capture_suggestion import CaptureSuggestion  # noqa: F401
+from app.models.dwell_rollup import DwellRollup  # noqa: F401
 from app.models.item import Item  # noqa: F401
+from app.models.scan_log import ScanLog  # noqa: F401
+from app.models.tombstone import Tombstone  # noqa: F401
 from app.models.user import User  # noqa: F401
 from app.models.zone import Zone  # noqa: F401
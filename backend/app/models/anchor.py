@@ -2,14 +2,19 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text, event, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.geo import GEOHASH_PRECISION, geohash_encode
 from app.db.base import Base
 
 
 class Anchor(Base):
     __tablename__ = "anchors"
+    __table_args__ = (
+        Index("ix_anchors_name_id", "name", "id"),
+        Index("ix_anchors_zone_id_name_id", "zone_id", "name", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     zone_id: Mapped[int] = mapped_column(ForeignKey("zones.id", ondelete="CASCADE"))
@@ -19,6 +24,10 @@ class Anchor(Base):
     location_hint: Mapped[str | None] = mapped_column(String(255))
     latitude: Mapped[float | None] = mapped_column(Float)
     longitude: Mapped[float | None] = mapped_column(Float)
+    geohash: Mapped[str | None] = mapped_column(String(GEOHASH_PRECISION), index=True)
+    change_seq: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False, index=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -28,7 +37,18 @@ class Anchor(Base):
     breadcrumbs: Mapped[list["Breadcrumb"]] = relationship(
         back_populates="anchor", cascade="all, delete-orphan"
     )
-    captures: Mapped[list["Capture"]] = relationship(back_populates="anchor")
+    captures: Mapped[list["Capture"]] = relationship(
+        back_populates="anchor", foreign_keys="Capture.anchor_id"
+    )
 
     def __repr__(self) -> str:  # pragma: no cover
         return f"Anchor(anchor_id='{self.anchor_id}', name='{self.name}')"
+
+
+@event.listens_for(Anchor, "before_insert")
+@event.listens_for(Anchor, "before_update")
+def _sync_geohash(_mapper: object, _connection: object, anchor: Anchor) -> None:
+    if anchor.latitude is None or anchor.longitude is None:
+        anchor.geohash = None
+    else:
+        anchor.geohash = geohash_encode(anchor.latitude, anchor.longitude)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -10,8 +10,30 @@ from app.db.base import Base
 
 class Breadcrumb(Base):
     __tablename__ = "breadcrumbs"
+    __table_args__ = (
+        Index("ix_breadcrumbs_anchor_id_started_at", "anchor_id", "started_at"),
+        Index("ix_breadcrumbs_started_at_id", "started_at", "id"),
+        Index(
+            "ix_breadcrumbs_active_anchor_id",
+            "anchor_id",
+            postgresql_where=text("active"),
+            sqlite_where=text("active"),
+        ),
+        Index("ix_breadcrumbs_owner_id_started_at", "owner_id", "started_at"),
+        # At most one active breadcrumb per owner.
+        Index(
+            "ux_breadcrumbs_owner_id_active",
+            "owner_id",
+            unique=True,
+            postgresql_where=text("active"),
+            sqlite_where=text("active"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     anchor_id: Mapped[int] = mapped_column(ForeignKey("anchors.id", ondelete="CASCADE"))
     started_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -20,6 +42,9 @@ class Breadcrumb(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
     active: Mapped[bool] = mapped_column(Boolean, default=True)
+    change_seq: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False, index=True
+    )
 
     anchor: Mapped["Anchor"] = relationship(back_populates="breadcrumbs")
 
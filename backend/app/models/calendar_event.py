@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.base import Base
+
+
+class CalendarEvent(Base):
+    """One VEVENT or VTODO synced into a zone, or one overridden instance of one.
+
+    ``fingerprint`` covers every property but DTSTAMP, so re-imports skip
+    events that did not change. ``expanded_until`` and ``last_start`` tell the
+    importer whether a recurring event has instances that have since moved
+    into the import window.
+    """
+
+    __tablename__ = "calendar_events"
+    __table_args__ = (
+        Index(
+            "ux_calendar_events_zone_uid_recurrence",
+            "zone_id",
+            "uid",
+            "recurrence_key",
+            unique=True,
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    zone_id: Mapped[int] = mapped_column(ForeignKey("zones.id", ondelete="CASCADE"), nullable=False)
+    uid: Mapped[str] = mapped_column(String(255), nullable=False)
+    # RECURRENCE-ID in UTC for an overridden instance, "" for the event itself.
+    recurrence_key: Mapped[str] = mapped_column(
+        String(16), default="", server_default="", nullable=False
+    )
+    kind: Mapped[str] = mapped_column(String(8), nullable=False)
+    sequence: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    source: Mapped[str] = mapped_column(Text(), nullable=False)
+    timezone: Mapped[str | None] = mapped_column(String(64))
+    expanded_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    last_start: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    zone: Mapped["Zone"] = relationship(back_populates="calendar_events")
+    occurrences: Mapped[list["CalendarOccurrence"]] = relationship(
+        back_populates="event", cascade="all, delete-orphan"
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"CalendarEvent(id={self.id}, uid='{self.uid}', zone_id={self.zone_id})"
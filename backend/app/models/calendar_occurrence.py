@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.base import Base
+
+
+class CalendarOccurrence(Base):
+    """Links one instance of a calendar event to the item materialised for it.
+
+    Deleting the item nulls ``item_id``, which keeps the instance dismissed:
+    later imports neither recreate nor update it.
+    """
+
+    __tablename__ = "calendar_occurrences"
+    __table_args__ = (
+        Index(
+            "ux_calendar_occurrences_event_occurs_at", "event_id", "occurs_at", unique=True
+        ),
+        Index("ix_calendar_occurrences_item_id", "item_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    event_id: Mapped[int] = mapped_column(
+        ForeignKey("calendar_events.id", ondelete="CASCADE"), nullable=False
+    )
+    # Instance start in UTC; null for to-dos.
+    occurs_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    item_id: Mapped[int | None] = mapped_column(ForeignKey("items.id", ondelete="SET NULL"))
+
+    event: Mapped["CalendarEvent"] = relationship(back_populates="occurrences")
+    item: Mapped["Item | None"] = relationship(back_populates="calendar_occurrences")
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"CalendarOccurrence(event_id={self.event_id}, occurs_at={self.occurs_at})"
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -10,18 +10,41 @@ from app.db.base import Base
 
 class Capture(Base):
     __tablename__ = "captures"
+    __table_args__ = (
+        Index("ix_captures_created_at_id", "created_at", "id"),
+        Index("ix_captures_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        Index("ix_captures_zone_id_created_at_id", "zone_id", "created_at", "id"),
+        Index("ix_captures_anchor_id_created_at_id", "anchor_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     raw_text: Mapped[str] = mapped_column(Text(), nullable=False)
     source: Mapped[str] = mapped_column(String(32), default="text")
+    # Creator; decides who sees the row while it has no zone.
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     zone_id: Mapped[int | None] = mapped_column(ForeignKey("zones.id"))
     anchor_id: Mapped[int | None] = mapped_column(ForeignKey("anchors.id"))
+    # Best guess from the capture inference index; see ``CaptureSuggestion``.
+    inferred_zone_id: Mapped[int | None] = mapped_column(
+        ForeignKey("zones.id", ondelete="SET NULL")
+    )
+    inferred_anchor_id: Mapped[int | None] = mapped_column(
+        ForeignKey("anchors.id", ondelete="SET NULL")
+    )
+    inference_confidence: Mapped[float | None] = mapped_column(Float)
+    change_seq: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False, index=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
-    zone: Mapped["Zone | None"] = relationship(back_populates="captures")
-    anchor: Mapped["Anchor | None"] = relationship(back_populates="captures")
+    zone: Mapped["Zone | None"] = relationship(back_populates="captures", foreign_keys=[zone_id])
+    anchor: Mapped["Anchor | None"] = relationship(
+        back_populates="captures", foreign_keys=[anchor_id]
+    )
 
     def __repr__(self) -> str:  # pragma: no cover
         return f"Capture(id={self.id}, source='{self.source}')"
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from sqlalchemy import Float, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class CaptureSuggestion(Base):
+    """One ranked zone/anchor guess for an inbox capture, scored against its owner's index.
+
+    Inbox captures are only visible to their creator, so ``owner_id`` is the
+    capture's owner whose zones and anchors produced the ranking; the
+    capture's ``inferred_*`` columns mirror the latest top hit.
+    """
+
+    __tablename__ = "capture_suggestions"
+    __table_args__ = (
+        Index(
+            "ux_capture_suggestions_owner_capture_rank",
+            "owner_id",
+            "capture_id",
+            "rank",
+            unique=True,
+        ),
+        Index("ix_capture_suggestions_capture_id", "capture_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    capture_id: Mapped[int] = mapped_column(
+        ForeignKey("captures.id", ondelete="CASCADE"), nullable=False
+    )
+    rank: Mapped[int] = mapped_column(Integer, nullable=False)
+    zone_id: Mapped[int] = mapped_column(ForeignKey("zones.id", ondelete="CASCADE"), nullable=False)
+    anchor_id: Mapped[int | None] = mapped_column(ForeignKey("anchors.id", ondelete="CASCADE"))
+    confidence: Mapped[float] = mapped_column(Float, nullable=False)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return (
+            f"CaptureSuggestion(capture_id={self.capture_id}, rank={self.rank}, "
+            f"zone_id={self.zone_id}, anchor_id={self.anchor_id})"
+        )
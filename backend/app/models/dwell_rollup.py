@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class DwellRollup(Base):
+    """Seconds spent at one anchor or zone during one day, week or month bucket.
+
+    Rows are folded in as breadcrumbs close, so reads never touch breadcrumb
+    history. ``scope_id`` is an anchor or zone id depending on ``scope``.
+    """
+
+    __tablename__ = "dwell_rollups"
+    __table_args__ = (
+        Index(
+            "ux_dwell_rollups_owner_period_scope_bucket",
+            "owner_id",
+            "period",
+            "scope",
+            "bucket",
+            "scope_id",
+            unique=True,
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    period: Mapped[str] = mapped_column(String(8), nullable=False)
+    scope: Mapped[str] = mapped_column(String(8), nullable=False)
+    bucket: Mapped[date] = mapped_column(Date, nullable=False)
+    scope_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    seconds: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    sessions: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    interruptions: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return (
+            f"DwellRollup(period='{self.period}', bucket={self.bucket}, "
+            f"{self.scope}={self.scope_id}, seconds={self.seconds})"
+        )
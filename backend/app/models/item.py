@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -21,14 +21,27 @@ class ItemStatus(str, Enum):
 
 class Item(Base):
     __tablename__ = "items"
+    __table_args__ = (
+        Index("ix_items_created_at_id", "created_at", "id"),
+        Index("ix_items_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        Index("ix_items_zone_id_created_at_id", "zone_id", "created_at", "id"),
+        Index("ix_items_anchor_id_created_at_id", "anchor_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
+    # Creator; decides who sees the row while it has no zone.
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     zone_id: Mapped[int | None] = mapped_column(ForeignKey("zones.id"))
     anchor_id: Mapped[int | None] = mapped_column(ForeignKey("anchors.id"))
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     body: Mapped[str | None] = mapped_column(Text())
     type: Mapped[str] = mapped_column(String(16), default=ItemType.TASK.value)
     status: Mapped[str] = mapped_column(String(16), default=ItemStatus.OPEN.value)
+    change_seq: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False, index=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -38,6 +51,9 @@ class Item(Base):
 
     zone: Mapped["Zone | None"] = relationship(back_populates="items")
     anchor: Mapped["Anchor | None"] = relationship(back_populates="items")
+    calendar_occurrences: Mapped[list["CalendarOccurrence"]] = relationship(
+        back_populates="item"
+    )
 
     def __repr__(self) -> str:  # pragma: no cover
         return f"Item(id={self.id}, title='{self.title}', status='{self.status}')"
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import DateTime, ForeignKey, Index, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ScanDevice(str, Enum):
+    IPHONE = "iphone"
+    WATCH = "watch"
+    LAPTOP = "laptop"
+
+
+class ScanLog(Base):
+    __tablename__ = "scan_logs"
+    __table_args__ = (
+        Index("ix_scan_logs_owner_id_at", "owner_id", "at"),
+        Index("ix_scan_logs_anchor_id_at", "anchor_id", "at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    anchor_id: Mapped[int] = mapped_column(
+        ForeignKey("anchors.id", ondelete="CASCADE"), nullable=False
+    )
+    device: Mapped[str] = mapped_column(
+        String(16),
+        default=ScanDevice.IPHONE.value,
+        server_default=ScanDevice.IPHONE.value,
+        nullable=False,
+    )
+    location: Mapped[str | None] = mapped_column(String(64))
+    at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"ScanLog(id={self.id}, anchor_id={self.anchor_id}, device='{self.device}')"
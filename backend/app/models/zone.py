@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -10,6 +10,9 @@ from app.db.base import Base
 
 class Zone(Base):
     __tablename__ = "zones"
+    __table_args__ = (
+        Index("ix_zones_owner_id_name_id", "owner_id", "name", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(120), unique=True, nullable=False)
@@ -17,6 +20,9 @@ class Zone(Base):
     color: Mapped[str | None] = mapped_column(String(32))
     description: Mapped[str | None] = mapped_column(Text())
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    change_seq: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False, index=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -31,7 +37,12 @@ class Zone(Base):
     items: Mapped[list["Item"]] = relationship(
         back_populates="zone", cascade="all, delete-orphan"
     )
-    captures: Mapped[list["Capture"]] = relationship(back_populates="zone")
+    calendar_events: Mapped[list["CalendarEvent"]] = relationship(
+        back_populates="zone", cascade="all, delete-orphan"
+    )
+    captures: Mapped[list["Capture"]] = relationship(
+        back_populates="zone", foreign_keys="Capture.zone_id"
+    )
 
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         return f"Zone(id={self.id}, name='{self.name}')"
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import date
+
+from pydantic import BaseModel
+
+from app.db.dwell import DwellPeriod, DwellScope
+
+
+class DwellEntry(BaseModel):
+    scope_id: int
+    name: str
+    seconds: int
+    sessions: int
+    interruptions: int
+
+
+class DwellBucket(BaseModel):
+    bucket: date
+    seconds: int
+    entries: list[DwellEntry]
+
+
+class DwellReport(BaseModel):
+    period: DwellPeriod
+    scope: DwellScope
+    since: date
+    until: date
+    buckets: list[DwellBucket]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel
 
@@ -33,3 +34,47 @@ class AnchorRead(AnchorBase):
 
     class Config:
         from_attributes = True
+
+
+class AnchorImportResult(BaseModel):
+    inserted: int
+    updated: int
+    unchanged: int
+    skipped: int
+
+
+class AnchorKeyMatch(BaseModel):
+    id: int
+    anchor_id: str
+    name: str
+    zone_id: int
+    distance: int = 0
+
+
+class AnchorResolution(BaseModel):
+    key: str
+    match: Literal["exact", "prefix", "fuzzy", "none"]
+    anchors: list[AnchorKeyMatch]
+
+
+class AnchorNearby(BaseModel):
+    anchor: AnchorRead
+    distance_m: float
+
+
+class AnchorClusterZone(BaseModel):
+    zone_id: int
+    count: int
+
+
+class AnchorCluster(BaseModel):
+    latitude: float
+    longitude: float
+    count: int
+    zones: list[AnchorClusterZone]
+    anchor_id: int | None = None
+
+
+class AnchorClusters(BaseModel):
+    zoom: int
+    clusters: list[AnchorCluster]
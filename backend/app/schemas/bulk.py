@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import Generic, Literal, TypeVar
+
+from pydantic import BaseModel
+
+MAX_BULK_ROWS = 1000
+
+T = TypeVar("T")
+
+
+class BulkRowResult(BaseModel, Generic[T]):
+    index: int
+    status: Literal["created", "rejected"]
+    detail: str | None = None
+    data: T | None = None
+
+
+class BulkResult(BaseModel, Generic[T]):
+    created: int
+    rejected: int
+    results: list[BulkRowResult[T]]
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.schemas.bulk import MAX_BULK_ROWS
 
 
 class CaptureCreate(BaseModel):
@@ -12,9 +14,32 @@ class CaptureCreate(BaseModel):
     anchor_id: int | None = None
 
 
+class CaptureBulkCreate(BaseModel):
+    captures: list[CaptureCreate] = Field(min_length=1, max_length=MAX_BULK_ROWS)
+
+
 class CaptureRead(CaptureCreate):
     id: int
+    inferred_zone_id: int | None = None
+    inferred_anchor_id: int | None = None
+    inference_confidence: float | None = None
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class CaptureSuggestionRead(BaseModel):
+    rank: int
+    zone_id: int
+    anchor_id: int | None = None
+    confidence: float
+
+    class Config:
+        from_attributes = True
+
+
+class CaptureInferenceResult(BaseModel):
+    scored: int
+    suggested: int
+    updated: int
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel
+
+from app.schemas.anchor import AnchorRead
+from app.schemas.capture import CaptureRead
+from app.schemas.item import ItemRead
+from app.schemas.zone import ZoneRead
+
+TrackedEntity = Literal["zone", "anchor", "item", "capture"]
+
+
+class TombstoneRead(BaseModel):
+    entity: TrackedEntity
+    entity_id: int
+    change_seq: int
+    deleted_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ChangeSet(BaseModel):
+    cursor: int
+    zones: list[ZoneRead]
+    anchors: list[AnchorRead]
+    items: list[ItemRead]
+    captures: list[CaptureRead]
+    tombstones: list[TombstoneRead]
@@ -3,7 +3,9 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.schemas.bulk import MAX_BULK_ROWS
 
 ItemType = Literal["task", "note"]
 ItemStatus = Literal["open", "done"]
@@ -22,6 +24,10 @@ class ItemCreate(ItemBase):
     pass
 
 
+class ItemBulkCreate(BaseModel):
+    items: list[ItemCreate] = Field(min_length=1, max_length=MAX_BULK_ROWS)
+
+
 class ItemUpdate(BaseModel):
     title: str | None = None
     body: str | None = None
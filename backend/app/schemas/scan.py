@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.models.scan_log import ScanDevice
+
+
+class ScanCreate(BaseModel):
+    anchor_id: str = Field(
+        min_length=1, max_length=512, description="Anchor key, ANCHOR:<ID> text or deep link"
+    )
+    device: ScanDevice = ScanDevice.IPHONE
+    location: str | None = Field(default=None, max_length=64)
+    at: datetime | None = None
+
+
+class ScanRejected(BaseModel):
+    index: int
+    detail: str
+
+
+class ScanAccepted(BaseModel):
+    accepted: int
+    rejected: list[ScanRejected]
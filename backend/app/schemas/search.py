@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel
+
+SearchEntity = Literal["item", "anchor", "capture"]
+
+
+class SearchHit(BaseModel):
+    entity: SearchEntity
+    entity_id: int
+    rank: float
+    title: str
+    snippet: str
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from app.schemas.anchor import AnchorRead
+from app.schemas.breadcrumb import BreadcrumbRead
+from app.schemas.capture import CaptureRead
+from app.schemas.item import ItemRead
+from app.schemas.zone import ZoneRead
+
+
+class SnapshotRead(BaseModel):
+    version: int
+    zones: list[ZoneRead]
+    anchors: list[AnchorRead]
+    items: list[ItemRead]
+    captures: list[CaptureRead]
+    breadcrumb: BreadcrumbRead | None = None
@@ -0,0 +1,160 @@
+"""Compare the response_model path with the row serializer on a large item list.
+
+Both variants run as real routes on a throwaway app over the same seeded
+table: one loads ORM entities and lets FastAPI validate and encode them
+through ``response_model``, the other selects the schema's columns and
+encodes the row tuples with ``app.api.serialization``. The bodies must match
+byte for byte. Exits non-zero when the speed-up falls below ``--min-speedup``.
+
+    python scripts/bench_serialization.py                     # temp SQLite file
+    python scripts/bench_serialization.py --rows 50000 --repeat 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from scripts.check_query_plans import (  # noqa: E402
+    _bulk,
+    add_engine_arguments,
+    close_engines,
+    configure_environment,
+    migrate,
+    request,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="Scratch database (default: temp SQLite file)")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-speedup", type=float, default=2.0)
+    add_engine_arguments(parser)
+    return parser.parse_args()
+
+
+def seed(rows: int) -> None:
+    from sqlalchemy import insert
+
+    from app.db.session import engine
+    from app.models.item import Item
+    from app.models.user import User
+    from app.models.zone import Zone
+
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        owner_id = conn.execute(
+            insert(User).values(email="bench@hive.local", is_active=True).returning(User.id)
+        ).scalar_one()
+        zone_id = conn.execute(
+            insert(Zone)
+            .values(name="Bench", slug="bench", owner_id=owner_id)
+            .returning(Zone.id)
+        ).scalar_one()
+        _bulk(
+            conn,
+            Item,
+            (
+                {
+                    "zone_id": zone_id,
+                    "owner_id": owner_id,
+                    "title": f"Task {index}",
+                    "body": f"Body of task {index}" if index % 2 else None,
+                    "status": "done" if index % 4 else "open",
+                    "created_at": now - timedelta(seconds=index),
+                    "updated_at": now - timedelta(seconds=index),
+                }
+                for index in range(rows)
+            ),
+        )
+
+
+def bench_app() -> Any:
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.api import deps
+    from app.api.serialization import item_rows, page_response
+    from app.models.item import Item
+    from app.schemas.item import ItemRead
+    from app.schemas.page import Page
+
+    app = FastAPI()
+    order = [Item.created_at.desc(), Item.id.desc()]
+
+    @app.get("/orm", response_model=Page[ItemRead])
+    async def orm(db: AsyncSession = Depends(deps.get_db)) -> dict[str, object]:
+        items = (await db.scalars(select(Item).order_by(*order))).all()
+        return {"items": items, "next_cursor": None}
+
+    @app.get("/rows", response_model=Page[ItemRead])
+    async def rows(db: AsyncSession = Depends(deps.get_db)) -> Any:
+        result = await db.execute(select(*item_rows.columns).order_by(*order))
+        return page_response(item_rows, {"items": result.all(), "next_cursor": None})
+
+    return app
+
+
+def time_route(app: Any, path: str, repeat: int) -> tuple[list[float], bytes]:
+    timings = []
+    body = b""
+    for _ in range(repeat + 1):
+        started = time.perf_counter()
+        status_code, body = request(app, "GET", path, None)
+        timings.append(time.perf_counter() - started)
+        if status_code != 200:
+            raise SystemExit(f"{path} answered {status_code}: {body[:200]!r}")
+    return timings[1:], body  # the first call warms caches
+
+
+def main() -> None:
+    args = parse_args()
+    database_url = configure_environment(args.database_url, args.use_async)
+    print(f"Benchmarking {args.rows} items against {database_url}")  # noqa: T201
+    migrate()
+    seed(args.rows)
+
+    from app.api import serialization
+
+    app = bench_app()
+    orm_times, orm_body = time_route(app, "/orm", args.repeat)
+    row_times, row_body = time_route(app, "/rows", args.repeat)
+    if orm_body != row_body:
+        raise SystemExit("Row serializer output differs from the response_model output")
+
+    orm_ms = statistics.median(orm_times) * 1000
+    row_ms = statistics.median(row_times) * 1000
+    speedup = orm_ms / row_ms
+    report = {
+        "rows": args.rows,
+        "bytes": len(row_body),
+        "encoder": "orjson" if serialization.orjson is not None else "TypeAdapter",
+        "response_model_ms": round(orm_ms, 1),
+        "row_serializer_ms": round(row_ms, 1),
+        "response_model_rows_per_s": round(args.rows / orm_ms * 1000),
+        "row_serializer_rows_per_s": round(args.rows / row_ms * 1000),
+        "speedup": round(speedup, 2),
+    }
+    print(json.dumps(report, indent=2))  # noqa: T201
+    if speedup < args.min_speedup:
+        raise SystemExit(f"Speed-up {speedup:.2f}x is below the {args.min_speedup}x floor")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        close_engines()
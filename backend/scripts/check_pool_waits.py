@@ -0,0 +1,81 @@
+"""Check that the pool reports waits for contention only, not for pool growth.
+
+Drives an instrumented pool whose connections take a while to open, the way
+a Postgres connection does: filling the pool and opening overflow
+connections must not count as waits, a checkout that blocks until another
+request checks in must, and one that gives up must count as a timeout.
+
+    python scripts/check_pool_waits.py
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError  # noqa: E402
+
+from app.db.pool import InstrumentedQueuePool, instrument_pool  # noqa: E402
+
+CONNECT_SECONDS = 0.05
+HOLD_SECONDS = 0.1
+
+
+def slow_connect() -> sqlite3.Connection:
+    time.sleep(CONNECT_SECONDS)
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+def main() -> None:
+    pool = InstrumentedQueuePool(slow_connect, pool_size=2, max_overflow=2, timeout=0.5)
+    instrument_pool(pool)
+    failures = []
+
+    held = [pool.connect() for _ in range(4)]  # two pooled, two overflow
+    if pool.stats.waits:
+        failures.append(f"opening pooled and overflow connections counted {pool.stats.waits} waits")
+
+    def release_later() -> None:
+        time.sleep(HOLD_SECONDS)
+        held.pop().close()
+
+    releaser = threading.Thread(target=release_later)
+    releaser.start()
+    blocked = pool.connect()
+    releaser.join()
+    if pool.stats.waits != 1:
+        failures.append(f"a checkout blocked on a full pool counted {pool.stats.waits} waits")
+
+    try:
+        pool.connect().close()
+        failures.append("a checkout from an exhausted pool did not time out")
+    except PoolTimeoutError:
+        pass
+    if pool.stats.timeouts != 1:
+        failures.append(f"expected one timeout, counted {pool.stats.timeouts}")
+
+    for connection in [blocked, *held]:
+        connection.close()
+    pool.connect().close()  # idle connections come straight back
+    stats = pool.stats.as_dict()
+    if stats["waits"] != 1:
+        failures.append(f"an idle checkout counted as a wait ({stats['waits']} waits)")
+
+    print(stats)  # noqa: T201
+    if failures:
+        print("\nPool wait regressions:")  # noqa: T201
+        for failure in failures:
+            print(f"  - {failure}")  # noqa: T201
+        raise SystemExit(1)
+    print("\nOnly the blocked checkout counted as a wait.")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Count the SQL statements each capture list request emits.
+
+Every capture listing and filter is requested at a small and a large page
+size, and as a follow-up page through its cursor. Statements are counted
+with a ``before_cursor_execute`` listener. The check fails when a request
+emits more statements than recorded in ``EXPECTED``, or when the count
+grows with the page size, which is how per-row lazy loads show up.
+
+    python scripts/check_query_counts.py                      # temp SQLite file
+    python scripts/check_query_counts.py --database-url postgresql+psycopg2://...
+    python scripts/check_query_counts.py --sync               # through the sync engine
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from scripts.check_query_plans import (  # noqa: E402
+    add_engine_arguments,
+    close_engines,
+    configure_environment,
+    migrate,
+    request,
+    request_engine,
+    seed,
+)
+
+# Once the API key is cached (see the warm-up request), one statement reads the
+# owner's data version for the ETag and one reads the page.
+EXPECTED = {
+    "/api/captures/": 2,
+    "/api/captures/?source=text": 2,
+    "/api/captures/?zone_id={zone_id}": 2,
+    "/api/captures/?anchor_id={anchor_id}": 2,
+    "/api/captures/?unassigned=true": 2,
+}
+PAGE_SIZES = (5, 200)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="Scratch database (default: temp SQLite file)")
+    parser.add_argument("--scale", type=int, default=1, help="Multiply the synthetic row counts")
+    add_engine_arguments(parser)
+    return parser.parse_args()
+
+
+def count_statements(app: Any, path: str) -> tuple[int, dict[str, Any]]:
+    from sqlalchemy import event
+
+    engine = request_engine()
+    statements: list[str] = []
+
+    def on_execute(_conn, _cursor, statement, _parameters, _context, _executemany) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        status_code, content = request(app, "GET", path, None)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    if status_code != 200:
+        raise SystemExit(f"{path} failed with {status_code}: {content[:200]!r}")
+    return len(statements), json.loads(content)
+
+
+def main() -> None:
+    args = parse_args()
+    database_url = configure_environment(args.database_url, args.use_async)
+    print(f"Counting statements per capture request against {database_url}")  # noqa: T201
+    migrate()
+    ids = seed(args.scale)
+
+    from app.main import app
+
+    count_statements(app, "/api/captures/?limit=1")  # warm the API key cache
+    failures = []
+    for template, expected in EXPECTED.items():
+        path = template.format(**ids)
+        separator = "&" if "?" in path else "?"
+        counts = []
+        for limit in PAGE_SIZES:
+            count, page = count_statements(app, f"{path}{separator}limit={limit}")
+            counts.append(count)
+            if limit == PAGE_SIZES[0] and page["next_cursor"]:
+                cursor = page["next_cursor"]
+                count, _page = count_statements(
+                    app, f"{path}{separator}limit={limit}&cursor={cursor}"
+                )
+                counts.append(count)
+        print(f"{' '.join(map(str, counts)):>10}  {template}")  # noqa: T201
+        if max(counts) > expected:
+            failures.append(f"{template}: {max(counts)} statements, expected {expected}")
+        if len(set(counts)) > 1:
+            failures.append(f"{template}: statement count varies with the page ({counts})")
+
+    if failures:
+        print("\nQuery count regressions:")  # noqa: T201
+        for failure in failures:
+            print(f"  - {failure}")  # noqa: T201
+        raise SystemExit(1)
+    print(f"\n{len(EXPECTED)} capture requests checked, no regressions.")  # noqa: T201
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        close_engines()
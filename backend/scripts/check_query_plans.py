@@ -0,0 +1,572 @@
+"""Seed a large synthetic hive, replay the API routes and check their query plans.
+
+Every SQL statement a route emits is captured and run through ``EXPLAIN``;
+routes left out on purpose are listed with the reason in ``EXCLUDED_ROUTES``.
+The check fails when a statement falls back to a sequential scan of a large
+table, or when a Postgres plan cost exceeds the recorded baseline by more
+than the allowed ratio.
+
+    python scripts/check_query_plans.py                      # temp SQLite file
+    python scripts/check_query_plans.py --database-url postgresql+psycopg2://...
+    python scripts/check_query_plans.py --database-url ... --update-baseline
+    python scripts/check_query_plans.py --sync               # through the sync engine
+
+Point ``--database-url`` at a scratch database: it is migrated and filled
+with synthetic rows. Routes run on the engine production would use
+(``DATABASE_ASYNC``, on by default) unless ``--async`` or ``--sync`` says
+otherwise; seeding and ``EXPLAIN`` always go through the sync engine.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from collections.abc import Awaitable
+from typing import Any, TypeVar
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+T = TypeVar("T")
+
+DEFAULT_BASELINE = BASE_DIR / "scripts" / "query_plan_baseline.json"
+API_KEY = "hive_query-plan-check"
+_NUMBERED_PARAM = re.compile(r"\$(\d+)")
+_loops = threading.local()
+
+
+@dataclass
+class CapturedStatement:
+    route: str
+    sql: str
+    params: Any
+
+
+@dataclass
+class PlanReport:
+    route: str
+    sql: str
+    seq_scans: list[str] = field(default_factory=list)
+    cost: float | None = None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="Scratch database (default: temp SQLite file)")
+    parser.add_argument("--scale", type=int, default=1, help="Multiply the synthetic row counts")
+    parser.add_argument(
+        "--min-rows",
+        type=int,
+        default=1000,
+        help="Ignore sequential scans of tables smaller than this",
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--max-cost-ratio",
+        type=float,
+        default=1.5,
+        help="Fail when a plan costs more than baseline * ratio (Postgres only)",
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    add_engine_arguments(parser)
+    return parser.parse_args()
+
+
+def add_engine_arguments(parser: argparse.ArgumentParser) -> None:
+    engines = parser.add_mutually_exclusive_group()
+    engines.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_const",
+        const=True,
+        help="Serve requests through the async engine (default: DATABASE_ASYNC, else async)",
+    )
+    engines.add_argument(
+        "--sync",
+        dest="use_async",
+        action="store_const",
+        const=False,
+        help="Serve requests through the sync engine",
+    )
+
+
+def configure_environment(database_url: str | None, use_async: bool | None = None) -> str:
+    """Point the app at ``database_url``; returns it with the engine mode for reports."""
+    if database_url is None:
+        scratch = Path(tempfile.mkdtemp(prefix="hive-plans-")) / "hive.db"
+        database_url = f"sqlite:///{scratch}"
+    os.environ["DATABASE_URL"] = database_url
+    if use_async is not None:
+        os.environ["DATABASE_ASYNC"] = "true" if use_async else "false"
+    os.environ["HIVE_API_KEY"] = ""
+
+    from app.core.config import settings
+
+    return f"{database_url} ({'async' if settings.DATABASE_ASYNC else 'sync'})"
+
+
+def request_engine() -> Any:
+    """The engine the routes' sessions run on."""
+    from app.db.session import async_engine, engine
+
+    return async_engine.sync_engine if async_engine is not None else engine
+
+
+def migrate() -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(BASE_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BASE_DIR / "alembic"))
+    command.upgrade(config, "head")
+
+
+def seed(scale: int) -> dict[str, Any]:
+    from sqlalchemy import insert, select
+
+    from app.core.geo import geohash_encode
+    from app.core.security import hash_api_key
+    from app.db.session import engine
+    from app.models.anchor import Anchor
+    from app.models.api_key import ApiKey
+    from app.models.breadcrumb import Breadcrumb
+    from app.models.capture import Capture
+    from app.models.item import Item
+    from app.models.user import User
+    from app.models.zone import Zone
+
+    rng = random.Random(1325)
+    now = datetime.now(timezone.utc)
+    counts = {"anchors": 2000 * scale, "items": 50000 * scale, "captures": 20000 * scale}
+
+    with engine.begin() as conn:
+        owner_ids = []
+        for index in range(2):
+            owner_ids.append(
+                conn.execute(
+                    insert(User)
+                    .values(email=f"plans{index}@hive.local", is_active=True)
+                    .returning(User.id)
+                ).scalar_one()
+            )
+        conn.execute(
+            insert(ApiKey).values(
+                user_id=owner_ids[0],
+                name="query-plans",
+                key_prefix=API_KEY[:12],
+                key_hash=hash_api_key(API_KEY),
+            )
+        )
+        conn.execute(
+            insert(Zone),
+            [
+                {
+                    "name": f"Zone {owner}-{index}",
+                    "slug": f"zone-{owner}-{index}",
+                    "owner_id": owner,
+                }
+                for owner in owner_ids
+                for index in range(10)
+            ],
+        )
+        zone_owners = dict(conn.execute(select(Zone.id, Zone.owner_id)).all())
+        zone_ids = sorted(zone_owners)
+        geo_rng = random.Random(2718)
+        coordinates = [
+            (51.5 + geo_rng.uniform(-0.5, 0.5), -0.12 + geo_rng.uniform(-0.8, 0.8))
+            for _ in range(counts["anchors"])
+        ]
+        _bulk(
+            conn,
+            Anchor,
+            (
+                {
+                    "zone_id": rng.choice(zone_ids),
+                    "anchor_id": f"PLAN-{index:07d}",
+                    "name": f"Anchor {index:07d}",
+                    "latitude": lat,
+                    "longitude": lon,
+                    "geohash": geohash_encode(lat, lon),
+                }
+                for index, (lat, lon) in enumerate(coordinates)
+            ),
+        )
+        anchor_ids = conn.scalars(select(Anchor.id)).all()
+        anchor_owners = conn.execute(select(Anchor.id, Zone.owner_id).join(Zone)).all()
+        _bulk(
+            conn,
+            Item,
+            (
+                {
+                    "zone_id": zone,
+                    "owner_id": zone_owners[zone],
+                    "anchor_id": rng.choice(anchor_ids) if index % 3 else None,
+                    "title": f"Task {index}",
+                    "status": "done" if index % 4 else "open",
+                    "created_at": now - timedelta(minutes=index),
+                    "updated_at": now - timedelta(minutes=index),
+                }
+                for index, zone in enumerate(
+                    rng.choice(zone_ids) for _ in range(counts["items"])
+                )
+            ),
+        )
+        _bulk(
+            conn,
+            Capture,
+            (
+                {
+                    "raw_text": f"capture {index}",
+                    "source": "text",
+                    "owner_id": zone_owners[zone] if zone else rng.choice(owner_ids),
+                    "zone_id": zone,
+                    "anchor_id": rng.choice(anchor_ids) if index % 5 == 0 else None,
+                    "created_at": now - timedelta(minutes=index),
+                }
+                for index, zone in enumerate(
+                    rng.choice(zone_ids) if index % 2 else None
+                    for index in range(counts["captures"])
+                )
+            ),
+        )
+        _bulk(
+            conn,
+            Breadcrumb,
+            (
+                {
+                    "anchor_id": anchor,
+                    "owner_id": owner,
+                    "started_at": now - timedelta(minutes=index),
+                    "last_action_at": now - timedelta(minutes=index),
+                    "active": False,
+                }
+                for index, (anchor, owner) in enumerate(
+                    rng.choice(anchor_owners) for _ in range(counts["anchors"] * 5)
+                )
+            ),
+        )
+        conn.exec_driver_sql("ANALYZE")
+
+    owned_zone = zone_ids[0]
+    with engine.connect() as conn:
+        owned_anchor = conn.scalar(
+            select(Anchor.id).where(Anchor.zone_id == owned_zone).limit(1)
+        )
+    return {"zone_id": owned_zone, "anchor_id": owned_anchor}
+
+
+def _bulk(conn: Any, model: type, rows: Any, chunk_size: int = 5000) -> None:
+    from sqlalchemy import insert
+
+    batch: list[dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            conn.execute(insert(model), batch)
+            batch = []
+    if batch:
+        conn.execute(insert(model), batch)
+
+
+# Routes under app/api/routes/ that are deliberately not replayed, and why.
+EXCLUDED_ROUTES = {
+    "GET /api/changes/stream": "server-sent events; each push runs the GET /api/changes queries",
+    "GET /api/diagnostics/*": "reports in-memory counters and pool state, no SQL",
+    "GET /api/captures/{capture_id}/suggestions": "primary-key lookups of one capture",
+    "POST /api/items/bulk, POST /api/captures/bulk": "one scope lookup plus a multi-row INSERT",
+    "POST /api/anchors/, POST /api/zones/": "single-row INSERTs after a primary-key scope check",
+    "POST /api/anchors/import": "per-chunk lookups on the unique anchor_id index; see README",
+    "POST /api/zones/{zone_id}/calendar": (
+        "raw ICS body; per-chunk lookups on the (zone_id, uid, recurrence_key) unique index"
+    ),
+    "PUT/PATCH/DELETE by id": (
+        "primary-key writes; replaying them would change the rows later routes read"
+    ),
+}
+
+
+def route_calls(ids: dict[str, Any]) -> list[tuple[str, str, dict[str, Any] | None]]:
+    zone_id, anchor_id = ids["zone_id"], ids["anchor_id"]
+    return [
+        ("GET", "/api/snapshot/", None),
+        ("GET", "/api/search/?q=task", None),
+        ("GET", "/api/search/?q=anchor&entity=anchor", None),
+        ("GET", "/api/search/?q=capture&entity=capture", None),
+        ("GET", "/api/export/", None),
+        ("GET", "/api/export/?since=0", None),
+        ("GET", "/api/zones/", None),
+        ("GET", f"/api/zones/{zone_id}", None),
+        ("GET", "/api/anchors/", None),
+        ("GET", f"/api/anchors/?zone_id={zone_id}", None),
+        ("GET", "/api/anchors/PLAN-0000001", None),
+        ("GET", "/api/anchors/nearby?lat=51.5&lon=-0.12&radius=2000", None),
+        ("GET", "/api/anchors/clusters?bbox=-1,51,1,52&zoom=12", None),
+        ("GET", "/api/items/", None),
+        ("GET", "/api/items/?limit=50&cursor={next_cursor}", None),
+        ("GET", f"/api/items/?zone_id={zone_id}", None),
+        ("GET", f"/api/items/?anchor_id={anchor_id}", None),
+        ("GET", "/api/captures/", None),
+        ("GET", f"/api/captures/?zone_id={zone_id}", None),
+        ("GET", f"/api/captures/?anchor_id={anchor_id}", None),
+        ("GET", "/api/breadcrumbs/", None),
+        ("GET", "/api/breadcrumbs/current", None),
+        ("GET", "/api/changes/?since=0", None),
+        ("GET", "/api/analytics/dwell?period=week&scope=zone", None),
+        ("POST", "/api/items/", {"title": "plan", "zone_id": zone_id, "anchor_id": anchor_id}),
+        ("POST", "/api/captures/", {"raw_text": "plan", "zone_id": zone_id}),
+        ("POST", "/api/breadcrumbs/start", {"anchor_id": anchor_id}),
+        ("POST", "/api/breadcrumbs/stop", {}),
+        # Scans are queued in memory; the buffer writes them as one multi-row INSERT.
+        ("POST", "/api/scan/", {"anchor_id": "PLAN-0000001"}),
+        ("POST", "/api/captures/infer", None),
+    ]
+
+
+def run(awaitable: Awaitable[T]) -> T:
+    """Run ``awaitable`` on this thread's event loop.
+
+    The loop outlives each call: the async engine's pool belongs to one loop,
+    and session cleanup still pending after a response is not cancelled the
+    way ``asyncio.run`` would cancel it.
+    """
+    loop = getattr(_loops, "loop", None)
+    if loop is None:
+        loop = _loops.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(awaitable)
+
+
+def request(app: Any, method: str, path: str, body: Any) -> tuple[int, bytes]:
+    return run(asgi_request(app, method, path, body))
+
+
+def close_engines() -> None:
+    """Dispose the engines; pooled aiosqlite connections otherwise keep their threads alive."""
+    if "app.db.session" not in sys.modules:
+        return
+    from app.db.session import dispose_engines
+
+    loop = getattr(_loops, "loop", None) or asyncio.new_event_loop()
+    loop.run_until_complete(dispose_engines())
+    loop.close()
+    _loops.loop = None
+
+
+async def asgi_request(
+    app: Any, method: str, path: str, body: dict[str, Any] | None
+) -> tuple[int, bytes]:
+    """Drive one request through the ASGI app without an HTTP client dependency."""
+    raw_path, _, query = path.partition("?")
+    payload = json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": raw_path,
+        "raw_path": raw_path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [
+            (b"host", b"query-plans"),
+            (b"x-api-key", API_KEY.encode()),
+            (b"content-type", b"application/json"),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("query-plans", 80),
+    }
+    messages = [{"type": "http.request", "body": payload, "more_body": False}]
+    status_code = 0
+    chunks: list[bytes] = []
+    finished = asyncio.Event()
+
+    async def receive() -> dict[str, Any]:
+        if messages:
+            return messages.pop(0)
+        # Streaming responses watch for a disconnect; the client stays until the last chunk.
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                finished.set()
+
+    await app(scope, receive, send)
+    return status_code, b"".join(chunks)
+
+
+def capture_statements(ids: dict[str, Any]) -> list[CapturedStatement]:
+    from sqlalchemy import event
+
+    from app.main import app
+
+    engine = request_engine()
+    captured: list[CapturedStatement] = []
+    current_route = ""
+
+    def on_execute(conn, _cursor, statement, parameters, _context, executemany) -> None:
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+            # One parameter set is enough to plan an executemany batch.
+            params = parameters[0] if executemany and parameters else parameters
+            sql, params = replayable(statement, params, conn.dialect.paramstyle)
+            captured.append(CapturedStatement(current_route, sql, params))
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    next_cursor = ""
+    try:
+        for method, template, body in route_calls(ids):
+            current_route = f"{method} {template}"
+            path = template.format(next_cursor=next_cursor)
+            status_code, content = request(app, method, path, body)
+            if status_code >= 400:
+                raise SystemExit(f"{current_route} failed with {status_code}: {content[:200]!r}")
+            if (method, path) == ("GET", "/api/items/"):
+                next_cursor = json.loads(content)["next_cursor"] or ""
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    return captured
+
+
+def replayable(statement: str, params: Any, paramstyle: str) -> tuple[str, Any]:
+    """Rewrite asyncpg's ``$n`` placeholders into the ``%s`` form psycopg2 can EXPLAIN.
+
+    aiosqlite and sqlite3 share the ``qmark`` style, so SQLite statements
+    replay unchanged.
+    """
+    if paramstyle != "numeric_dollar":
+        return statement, params
+    positions = [int(number) - 1 for number in _NUMBERED_PARAM.findall(statement)]
+    sql = _NUMBERED_PARAM.sub("%s", statement.replace("%", "%%"))
+    return sql, [params[position] for position in positions]
+
+
+def explain(statements: list[CapturedStatement], min_rows: int) -> list[PlanReport]:
+    from sqlalchemy import inspect as sa_inspect
+
+    from app.db.session import engine
+
+    table_names = sa_inspect(engine).get_table_names()
+    reports: list[PlanReport] = []
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        row_counts = {}
+        for table in table_names:
+            cursor.execute(f"SELECT count(*) FROM {table}")  # noqa: S608 - reflected names
+            row_counts[table] = cursor.fetchone()[0]
+        large_tables = {table for table, count in row_counts.items() if count >= min_rows}
+
+        for captured in statements:
+            report = PlanReport(captured.route, " ".join(captured.sql.split()))
+            if engine.dialect.name == "postgresql":
+                cursor.execute("EXPLAIN (FORMAT JSON) " + captured.sql, captured.params)
+                plan = cursor.fetchone()[0][0]["Plan"]
+                report.cost = plan["Total Cost"]
+                report.seq_scans = [
+                    node["Relation Name"]
+                    for node in _walk_plan(plan)
+                    if node.get("Node Type") == "Seq Scan"
+                    and node.get("Relation Name") in large_tables
+                ]
+            else:
+                cursor.execute("EXPLAIN QUERY PLAN " + captured.sql, captured.params)
+                for row in cursor.fetchall():
+                    detail = row[-1]
+                    words = detail.split()
+                    # FTS5 MATCH shows up as "SCAN <table> VIRTUAL TABLE INDEX", an index lookup.
+                    indexed = "USING" in words or "VIRTUAL" in words
+                    if len(words) >= 2 and words[0] == "SCAN" and not indexed:
+                        table = words[1]
+                        if table in large_tables:
+                            report.seq_scans.append(table)
+            reports.append(report)
+        raw.rollback()
+    finally:
+        raw.close()
+    return reports
+
+
+def _walk_plan(node: dict[str, Any]) -> list[dict[str, Any]]:
+    nodes = [node]
+    for child in node.get("Plans", []):
+        nodes.extend(_walk_plan(child))
+    return nodes
+
+
+def compare(
+    reports: list[PlanReport], baseline_path: Path, ratio: float, update: bool
+) -> list[str]:
+    failures = [
+        f"{report.route}: sequential scan of {', '.join(sorted(set(report.seq_scans)))}\n"
+        f"    {report.sql[:240]}"
+        for report in reports
+        if report.seq_scans
+    ]
+
+    costs: dict[str, float] = {}
+    for report in reports:
+        if report.cost is not None:
+            key = f"{report.route} :: {report.sql}"
+            costs[key] = max(costs.get(key, 0.0), report.cost)
+
+    if update:
+        baseline_path.write_text(json.dumps(costs, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {baseline_path}")  # noqa: T201
+        return failures
+
+    if costs and baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())
+        for key, cost in costs.items():
+            expected = baseline.get(key)
+            if expected is not None and cost > expected * ratio:
+                failures.append(
+                    f"{key.split(' :: ')[0]}: plan cost {cost:.1f} exceeds baseline "
+                    f"{expected:.1f} x {ratio}"
+                )
+    return failures
+
+
+def main() -> None:
+    args = parse_args()
+    database_url = configure_environment(args.database_url, args.use_async)
+    print(f"Checking query plans against {database_url}")  # noqa: T201
+    migrate()
+    ids = seed(args.scale)
+    statements = capture_statements(ids)
+    reports = explain(statements, args.min_rows)
+
+    for report in reports:
+        marker = "SEQ " if report.seq_scans else "ok  "
+        cost = f"{report.cost:>10.1f}" if report.cost is not None else " " * 10
+        print(f"{marker}{cost}  {report.route}")  # noqa: T201
+
+    failures = compare(reports, args.baseline, args.max_cost_ratio, args.update_baseline)
+    if failures:
+        print("\nQuery plan regressions:")  # noqa: T201
+        for failure in failures:
+            print(f"  - {failure}")  # noqa: T201
+        raise SystemExit(1)
+    print(f"\n{len(reports)} statements checked, no regressions.")  # noqa: T201
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        close_engines()
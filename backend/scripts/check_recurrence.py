@@ -0,0 +1,149 @@
+"""Expand a table of RRULEs and compare the instances with known calendar dates.
+
+Covers the BYDAY, BYSETPOS and BYMONTHDAY paths, including DTSTARTs on the
+29th to 31st that later months cannot hold. Exits non-zero on any mismatch.
+
+    python scripts/check_recurrence.py
+"""
+
+from __future__ import annotations
+
+import sys
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from app.core.ics import Recurrence, expand, instances, parse_rule  # noqa: E402
+
+# (rule, DTSTART, expected instance dates); DTSTART is always the first instance.
+CASES: list[tuple[str, date, list[str]]] = [
+    (
+        "FREQ=MONTHLY;BYDAY=-1FR;COUNT=24",
+        date(2026, 1, 30),
+        [
+            "2026-01-30", "2026-02-27", "2026-03-27", "2026-04-24", "2026-05-29",
+            "2026-06-26", "2026-07-31", "2026-08-28", "2026-09-25", "2026-10-30",
+            "2026-11-27", "2026-12-25", "2027-01-29", "2027-02-26", "2027-03-26",
+            "2027-04-30", "2027-05-28", "2027-06-25", "2027-07-30", "2027-08-27",
+            "2027-09-24", "2027-10-29", "2027-11-26", "2027-12-31",
+        ],
+    ),
+    (
+        "FREQ=MONTHLY;BYDAY=1MO;COUNT=12",
+        date(2026, 3, 31),
+        [
+            "2026-03-31", "2026-04-06", "2026-05-04", "2026-06-01", "2026-07-06",
+            "2026-08-03", "2026-09-07", "2026-10-05", "2026-11-02", "2026-12-07",
+            "2027-01-04", "2027-02-01",
+        ],
+    ),
+    (
+        "FREQ=MONTHLY;BYDAY=MO,TU,WE,TH,FR;BYSETPOS=-1;COUNT=6",
+        date(2026, 1, 30),
+        ["2026-01-30", "2026-02-27", "2026-03-31", "2026-04-30", "2026-05-29", "2026-06-30"],
+    ),
+    (
+        "FREQ=MONTHLY;BYMONTHDAY=31;COUNT=6",
+        date(2026, 1, 31),
+        ["2026-01-31", "2026-03-31", "2026-05-31", "2026-07-31", "2026-08-31", "2026-10-31"],
+    ),
+    (
+        "FREQ=MONTHLY;BYMONTHDAY=-1;COUNT=4",
+        date(2026, 1, 31),
+        ["2026-01-31", "2026-02-28", "2026-03-31", "2026-04-30"],
+    ),
+    (
+        "FREQ=MONTHLY;COUNT=5",
+        date(2026, 1, 29),
+        ["2026-01-29", "2026-03-29", "2026-04-29", "2026-05-29", "2026-06-29"],
+    ),
+    (
+        "FREQ=MONTHLY;INTERVAL=2;BYMONTHDAY=30;COUNT=4",
+        date(2026, 12, 30),
+        ["2026-12-30", "2027-04-30", "2027-06-30", "2027-08-30"],
+    ),
+    (
+        "FREQ=YEARLY;BYMONTH=2;BYMONTHDAY=29;COUNT=3",
+        date(2024, 2, 29),
+        ["2024-02-29", "2028-02-29", "2032-02-29"],
+    ),
+    (
+        "FREQ=YEARLY;BYMONTH=11;BYDAY=4TH;COUNT=3",
+        date(2026, 11, 26),
+        ["2026-11-26", "2027-11-25", "2028-11-23"],
+    ),
+    (
+        "FREQ=YEARLY;BYDAY=-1SU;BYMONTH=3,10;COUNT=4",
+        date(2026, 3, 29),
+        ["2026-03-29", "2026-10-25", "2027-03-28", "2027-10-31"],
+    ),
+    (
+        "FREQ=WEEKLY;BYDAY=MO,WE;COUNT=4",
+        date(2026, 12, 30),
+        ["2026-12-30", "2027-01-04", "2027-01-06", "2027-01-11"],
+    ),
+]
+
+# (rule, DTSTART, window start, window end, expected) for open-ended rules
+# that skip ahead to the window.
+WINDOW_CASES: list[tuple[str, date, date, date, list[str]]] = [
+    (
+        "FREQ=MONTHLY;BYDAY=-1FR",
+        date(2026, 1, 30),
+        date(2030, 1, 1),
+        date(2030, 4, 1),
+        ["2030-01-25", "2030-02-22", "2030-03-29"],
+    ),
+    (
+        "FREQ=MONTHLY;BYMONTHDAY=30",
+        date(2026, 1, 30),
+        date(2031, 1, 1),
+        date(2031, 5, 1),
+        ["2031-01-30", "2031-03-30", "2031-04-30"],
+    ),
+]
+
+
+def recurrence(rule: str, start: date) -> Recurrence:
+    dtstart = datetime(start.year, start.month, start.day, 9, tzinfo=timezone.utc)
+    return Recurrence(start=dtstart, all_day=False, rule=parse_rule(rule))
+
+
+def check(rule: str, found: list[datetime], expected: list[str]) -> str | None:
+    days = [instance.date().isoformat() for instance in found]
+    if days == expected:
+        return None
+    missing = sorted(set(expected) - set(days))
+    extra = sorted(set(days) - set(expected))
+    return f"{rule}: missing {missing or '-'}, unexpected {extra or '-'}"
+
+
+def main() -> None:
+    failures = []
+    for rule, start, expected in CASES:
+        failure = check(rule, list(instances(recurrence(rule, start))), expected)
+        if failure:
+            failures.append(failure)
+    for rule, start, window_start, window_end, expected in WINDOW_CASES:
+        window = [
+            datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+            for day in (window_start, window_end)
+        ]
+        found = list(expand(recurrence(rule, start), window[0], window[1], 500))
+        failure = check(f"{rule} in {window_start}..{window_end}", found, expected)
+        if failure:
+            failures.append(failure)
+
+    if failures:
+        print("Recurrence mismatches:")  # noqa: T201
+        for failure in failures:
+            print(f"  - {failure}")  # noqa: T201
+        raise SystemExit(1)
+    print(f"{len(CASES) + len(WINDOW_CASES)} rules checked, all instances match.")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
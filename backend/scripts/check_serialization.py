@@ -0,0 +1,235 @@
+"""Check that the row serializers encode what the ``response_model`` path would.
+
+Seeds a small hive with awkward values (non-ASCII and line-separator text,
+NULLs, tiny and inexact floats, microsecond timestamps), then compares:
+
+* every ``RowSerializer`` in ``app.api.serialization``, with orjson and with
+  the ``TypeAdapter`` fallback, against ``jsonable_encoder`` applied to
+  ``Schema.model_validate(entity)`` for the same rows;
+* every route that answers with serialized rows, member by member, against
+  the same encoding of the entities its body names.
+
+Values and key order must match; byte-level differences in how a number is
+spelled (``1e-07`` against ``1e-7``) are not failures. Exits non-zero on any
+mismatch.
+
+    python scripts/check_serialization.py                     # temp SQLite file
+    python scripts/check_serialization.py --database-url postgresql+psycopg2://...
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from scripts.check_query_plans import (  # noqa: E402
+    API_KEY,
+    add_engine_arguments,
+    close_engines,
+    configure_environment,
+    migrate,
+    request,
+)
+
+# Route -> (body member, serializer in ``app.api.serialization``) pairs it encodes.
+ROUTES: dict[str, list[tuple[str, str]]] = {
+    "/api/zones/": [("items", "zone_rows")],
+    "/api/anchors/": [("items", "anchor_rows")],
+    "/api/items/": [("items", "item_rows")],
+    "/api/captures/": [("items", "capture_rows")],
+    "/api/snapshot/": [
+        ("zones", "zone_rows"),
+        ("anchors", "anchor_rows"),
+        ("items", "item_rows"),
+        ("captures", "capture_rows"),
+        ("breadcrumb", "breadcrumb_rows"),
+    ],
+}
+TEXT = 'Café ☕ «quoted» \u2028line\\sep "x"'
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="Scratch database (default: temp SQLite file)")
+    add_engine_arguments(parser)
+    return parser.parse_args()
+
+
+def seed() -> None:
+    from app.core.security import hash_api_key
+    from app.db.session import SyncSessionFactory
+    from app.models.anchor import Anchor
+    from app.models.api_key import ApiKey
+    from app.models.breadcrumb import Breadcrumb
+    from app.models.capture import Capture
+    from app.models.item import Item
+    from app.models.user import User
+    from app.models.zone import Zone
+
+    at = datetime(2026, 10, 18, 9, 30, 15, 123456, tzinfo=timezone.utc)
+    with SyncSessionFactory() as session:
+        user = User(email="serialization@hive.local", is_active=True)
+        session.add(user)
+        session.flush()
+        session.add(
+            ApiKey(
+                user_id=user.id,
+                name="check",
+                key_prefix=API_KEY[:12],
+                key_hash=hash_api_key(API_KEY),
+            )
+        )
+        zones = [
+            Zone(name=TEXT, slug="text", owner_id=user.id, color="#fff", description=TEXT),
+            Zone(name="Bare", slug="bare", owner_id=user.id),
+        ]
+        session.add_all(zones)
+        session.flush()
+        anchors = [
+            Anchor(
+                zone_id=zones[0].id,
+                anchor_id="SER-01",
+                name=TEXT,
+                description=TEXT,
+                location_hint="",
+                latitude=1e-7,
+                longitude=-0.1 + 0.2,
+                created_at=at,
+            ),
+            Anchor(zone_id=zones[1].id, anchor_id="SER-02", name="Bare", created_at=at),
+        ]
+        session.add_all(anchors)
+        session.flush()
+        for index in range(3):
+            session.add(
+                Item(
+                    owner_id=user.id,
+                    zone_id=zones[0].id if index else None,
+                    anchor_id=anchors[0].id if index == 2 else None,
+                    title=TEXT if index else "bare",
+                    body=TEXT if index == 1 else None,
+                    created_at=at + timedelta(microseconds=index),
+                )
+            )
+            session.add(
+                Capture(
+                    owner_id=user.id,
+                    raw_text=TEXT,
+                    zone_id=None if index else zones[1].id,
+                    inferred_zone_id=zones[0].id if index else None,
+                    inference_confidence=0.1 + 0.2 if index else None,
+                    created_at=at - timedelta(days=index),
+                )
+            )
+        session.add(
+            Breadcrumb(
+                owner_id=user.id,
+                anchor_id=anchors[0].id,
+                started_at=at,
+                last_action_at=at + timedelta(seconds=1),
+                active=True,
+            )
+        )
+        session.commit()
+
+
+def reference(schema: Any, entities: list[Any]) -> str:
+    """The body ``response_model`` would send for ``entities``, as ``JSONResponse`` renders it."""
+    from fastapi.encoders import jsonable_encoder
+
+    value = jsonable_encoder([schema.model_validate(entity) for entity in entities])
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def ordered(body: str | bytes) -> Any:
+    return json.loads(body, object_pairs_hook=list)
+
+
+def check_serializers(failures: list[str]) -> int:
+    from sqlalchemy import select
+
+    from app.api import serialization
+    from app.db.session import SyncSessionFactory
+
+    serializers = [
+        value
+        for value in vars(serialization).values()
+        if isinstance(value, serialization.RowSerializer)
+    ]
+    orjson = serialization.orjson
+    with SyncSessionFactory() as session:
+        for serializer in serializers:
+            model = serializer.columns[0].class_
+            entities = list(session.scalars(select(model).order_by(model.id)))
+            rows = session.execute(select(*serializer.columns).order_by(model.id)).all()
+            expected = ordered(reference(serializer.schema, entities))
+            for encoder in ("orjson", "TypeAdapter"):
+                if encoder == "orjson" and orjson is None:
+                    continue
+                serialization.orjson = orjson if encoder == "orjson" else None
+                try:
+                    found = ordered(serializer.dump(rows))
+                finally:
+                    serialization.orjson = orjson
+                if found != expected:
+                    failures.append(f"{serializer.schema.__name__} via {encoder}: {found!r}")
+                print(f"{len(rows):>4}  {serializer.schema.__name__} via {encoder}")  # noqa: T201
+    return len(serializers)
+
+
+def check_routes(failures: list[str]) -> None:
+    from app.api import serialization
+    from app.db.session import SyncSessionFactory
+    from app.main import app
+
+    for path, members in ROUTES.items():
+        status_code, content = request(app, "GET", path, None)
+        if status_code != 200:
+            raise SystemExit(f"{path} answered {status_code}: {content[:200]!r}")
+        body = json.loads(content)
+        found = dict(ordered(content))
+        with SyncSessionFactory() as session:
+            for member, name in members:
+                serializer = getattr(serialization, name)
+                model = serializer.columns[0].class_
+                single = not isinstance(body[member], list)
+                values = [body[member]] if single else body[member]
+                entities = [session.get(model, value["id"]) for value in values]
+                expected = ordered(reference(serializer.schema, entities))
+                actual = [found[member]] if single else found[member]
+                if actual != expected:
+                    failures.append(f"{path} {member}: {actual!r} != {expected!r}")
+                print(f"{len(values):>4}  {path} {member}")  # noqa: T201
+
+
+def main() -> None:
+    args = parse_args()
+    database_url = configure_environment(args.database_url, args.use_async)
+    print(f"Comparing serializers with response_model against {database_url}")  # noqa: T201
+    migrate()
+    seed()
+
+    failures: list[str] = []
+    count = check_serializers(failures)
+    check_routes(failures)
+    if failures:
+        print("\nSerialization mismatches:")  # noqa: T201
+        for failure in failures:
+            print(f"  - {failure}")  # noqa: T201
+        raise SystemExit(1)
+    print(f"\n{count} serializers and {len(ROUTES)} routes match response_model.")  # noqa: T201
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        close_engines()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from app.core.security import generate_api_key, hash_api_key  # noqa: E402
+from app.models.api_key import ApiKey  # noqa: E402
+from app.models.user import User  # noqa: E402
+from scripts.seed import session_scope  # noqa: E402
+
+
+def create_api_key(email: str, name: str) -> str:
+    raw_key = generate_api_key()
+    with session_scope() as session:
+        user = session.query(User).filter(User.email == email).first()
+        if user is None:
+            raise SystemExit(f"No user with email {email}")
+        session.add(
+            ApiKey(
+                user_id=user.id,
+                name=name,
+                key_prefix=raw_key[:12],
+                key_hash=hash_api_key(raw_key),
+            )
+        )
+    return raw_key
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Issue a new API key for a Hive user.")
+    parser.add_argument("--email", default="admin@hive.local")
+    parser.add_argument("--name", required=True, help="Label for the key, e.g. 'iphone'")
+    args = parser.parse_args()
+    raw_key = create_api_key(args.email, args.name)
+    print(f"API key for {args.email} ({args.name}): {raw_key}")  # noqa: T201
+    print("Store it now; only its hash is kept.")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Fire concurrent breadcrumb starts and stops and check one-active-per-owner holds.
+
+Each worker drives the ASGI app directly, so requests overlap on separate
+pooled connections, as they would from phones, watches and laptops hitting
+the API at once. With the async engine the workers are tasks on one event
+loop, as under uvicorn; with ``--sync`` they are threads with a loop each.
+
+    python scripts/hammer_breadcrumbs.py                          # temp SQLite file
+    python scripts/hammer_breadcrumbs.py --sync
+    python scripts/hammer_breadcrumbs.py --database-url postgresql+psycopg2://...
+
+Point ``--database-url`` at a scratch database: it is migrated and seeded.
+Exits non-zero if any request fails with a 5xx or an owner ends up with more
+than one active breadcrumb.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from scripts.check_query_plans import (  # noqa: E402
+    API_KEY,
+    add_engine_arguments,
+    asgi_request,
+    close_engines,
+    configure_environment,
+    migrate,
+    request,
+    run,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="Scratch database (default: temp SQLite file)")
+    parser.add_argument("--threads", type=int, default=16, help="Concurrent workers")
+    parser.add_argument("--requests", type=int, default=25, help="Requests per worker")
+    add_engine_arguments(parser)
+    return parser.parse_args()
+
+
+def seed() -> list[int]:
+    from sqlalchemy import insert
+
+    from app.core.security import hash_api_key
+    from app.db.session import engine
+    from app.models.anchor import Anchor
+    from app.models.api_key import ApiKey
+    from app.models.user import User
+    from app.models.zone import Zone
+
+    with engine.begin() as conn:
+        owner_id = conn.execute(
+            insert(User).values(email="hammer@hive.local", is_active=True).returning(User.id)
+        ).scalar_one()
+        conn.execute(
+            insert(ApiKey).values(
+                user_id=owner_id,
+                name="hammer",
+                key_prefix=API_KEY[:12],
+                key_hash=hash_api_key(API_KEY),
+            )
+        )
+        zone_id = conn.execute(
+            insert(Zone)
+            .values(name="Hammer", slug="hammer", owner_id=owner_id)
+            .returning(Zone.id)
+        ).scalar_one()
+        return list(
+            conn.execute(
+                insert(Anchor)
+                .values(
+                    [
+                        {"zone_id": zone_id, "anchor_id": f"HAMMER-{i:02d}", "name": f"H{i}"}
+                        for i in range(20)
+                    ]
+                )
+                .returning(Anchor.id)
+            ).scalars()
+        )
+
+
+def hammer(anchor_ids: list[int], threads: int, requests: int) -> Counter[str]:
+    from app.core.config import settings
+    from app.main import app
+
+    outcomes: Counter[str] = Counter()
+    lock = threading.Lock()
+
+    def calls(seed_value: int) -> Iterator[tuple[str, str, dict[str, Any]]]:
+        rng = random.Random(seed_value)
+        for _ in range(requests):
+            if rng.random() < 0.2:
+                yield "POST", "/api/breadcrumbs/stop", {}
+            else:
+                yield "POST", "/api/breadcrumbs/start", {"anchor_id": rng.choice(anchor_ids)}
+
+    def record(path: str, status_code: int) -> None:
+        with lock:
+            outcomes[f"{path.rsplit('/', 1)[-1]} {status_code}"] += 1
+
+    if settings.DATABASE_ASYNC:
+
+        async def task(seed_value: int) -> None:
+            for call in calls(seed_value):
+                status_code, _body = await asgi_request(app, *call)
+                record(call[1], status_code)
+
+        async def gather() -> None:
+            await asyncio.gather(*(task(index) for index in range(threads)))
+
+        run(gather())
+        return outcomes
+
+    barrier = threading.Barrier(threads)
+
+    def worker(seed_value: int) -> None:
+        barrier.wait()
+        for call in calls(seed_value):
+            status_code, _body = request(app, *call)
+            record(call[1], status_code)
+
+    pool = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return outcomes
+
+
+def active_counts() -> dict[int, int]:
+    from sqlalchemy import func, select
+
+    from app.db.session import engine
+    from app.models.breadcrumb import Breadcrumb
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(Breadcrumb.owner_id, func.count())
+            .where(Breadcrumb.active.is_(True))
+            .group_by(Breadcrumb.owner_id)
+        ).all()
+    return dict(rows)
+
+
+def main() -> None:
+    args = parse_args()
+    database_url = configure_environment(args.database_url, args.use_async)
+    print(f"Hammering breadcrumbs against {database_url}")  # noqa: T201
+    migrate()
+    anchor_ids = seed()
+    outcomes = hammer(anchor_ids, args.threads, args.requests)
+    active = active_counts()
+
+    from app.main import app
+
+    _status, current = request(app, "GET", "/api/breadcrumbs/current", None)
+    print(json.dumps({"outcomes": outcomes, "active_per_owner": active}, indent=2))  # noqa: T201
+    print(f"current: {current.decode()}")  # noqa: T201
+
+    failures = [outcome for outcome in outcomes if outcome.split()[-1].startswith("5")]
+    if failures or any(count > 1 for count in active.values()):
+        raise SystemExit("Breadcrumb invariant violated")
+    print("At most one active breadcrumb per owner.")  # noqa: T201
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        close_engines()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import BinaryIO
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from app.db.anchor_import import CHUNK_SIZE, ImportStats, csv_records, import_records  # noqa: E402
+from app.db.session import SyncSessionAdapter  # noqa: E402
+from app.models.user import User  # noqa: E402
+from scripts.seed import session_scope  # noqa: E402
+
+READ_SIZE = 64 * 1024
+
+
+def import_anchors(source: BinaryIO, email: str, chunk_size: int) -> ImportStats:
+    with session_scope() as session:
+        user = session.query(User).filter(User.email == email).first()
+        if user is None:
+            raise SystemExit(f"No user with email {email}")
+        db = SyncSessionAdapter(session)
+        return asyncio.run(import_records(db, user.id, csv_records(_read(source)), chunk_size))
+
+
+async def _read(source: BinaryIO) -> AsyncIterator[bytes]:
+    while data := source.read(READ_SIZE):
+        yield data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Upsert anchors from a CSV file.")
+    parser.add_argument("path", help="anchor_id,friendly_label,zone CSV, or '-' for stdin")
+    parser.add_argument("--email", default="admin@hive.local", help="Owner of the zones")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    try:
+        if args.path == "-":
+            stats = import_anchors(sys.stdin.buffer, args.email, args.chunk_size)
+        else:
+            with open(args.path, "rb") as source:
+                stats = import_anchors(source, args.email, args.chunk_size)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    print(", ".join(f"{count} {label}" for label, count in stats.as_dict().items()))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import BinaryIO
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from app.core.ics import ics_components  # noqa: E402
+from app.db.calendar_import import CHUNK_SIZE, CalendarImportStats, import_calendar  # noqa: E402
+from app.db.session import SyncSessionAdapter  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.zone import Zone  # noqa: E402
+from scripts.seed import session_scope  # noqa: E402
+
+READ_SIZE = 64 * 1024
+
+
+def import_feed(source: BinaryIO, email: str, zone: str, chunk_size: int) -> CalendarImportStats:
+    with session_scope() as session:
+        user = session.query(User).filter(User.email == email).first()
+        if user is None:
+            raise SystemExit(f"No user with email {email}")
+        target = (
+            session.query(Zone)
+            .filter(Zone.owner_id == user.id, (Zone.slug == zone.lower()) | (Zone.name == zone))
+            .first()
+        )
+        if target is None:
+            raise SystemExit(f"No zone named {zone}")
+        db = SyncSessionAdapter(session)
+        components = ics_components(_read(source))
+        return asyncio.run(import_calendar(db, user.id, target.id, components, chunk_size))
+
+
+async def _read(source: BinaryIO) -> AsyncIterator[bytes]:
+    while data := source.read(READ_SIZE):
+        yield data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sync a zone's calendar items from an ICS file.")
+    parser.add_argument("path", help="ICS feed, or '-' for stdin")
+    parser.add_argument("--zone", required=True, help="Zone name or slug, e.g. dad")
+    parser.add_argument("--email", default="admin@hive.local", help="Owner of the zone")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    try:
+        if args.path == "-":
+            stats = import_feed(sys.stdin.buffer, args.email, args.zone, args.chunk_size)
+        else:
+            with open(args.path, "rb") as source:
+                stats = import_feed(source, args.email, args.zone, args.chunk_size)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    print(", ".join(f"{count} {label}" for label, count in stats.as_dict().items()))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
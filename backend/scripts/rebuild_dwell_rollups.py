@@ -0,0 +1,104 @@
+"""Recompute breadcrumb dwell rollups from the full breadcrumb history.
+
+Rollups are normally maintained as breadcrumbs stop; run this once after the
+rollup migration, or whenever the bucketing rules change. History does not
+record why a crumb closed, so an interruption is inferred when the next crumb
+started at a different anchor at the very moment this one stopped; on SQLite,
+whose clock has whole-second resolution, a quick stop-then-start also counts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from sqlalchemy import Row, delete, select  # noqa: E402
+
+from app.db.dwell import DwellTotals, accumulate, new_totals, upsert_rollups  # noqa: E402
+from app.db.session import SyncSessionAdapter  # noqa: E402
+from app.models.anchor import Anchor  # noqa: E402
+from app.models.breadcrumb import Breadcrumb  # noqa: E402
+from app.models.dwell_rollup import DwellRollup  # noqa: E402
+from app.models.user import User  # noqa: E402
+from scripts.seed import session_scope  # noqa: E402
+
+FLUSH_SIZE = 2000
+
+
+def rebuild(owner_id: int) -> int:
+    """Replace ``owner_id``'s rollups; returns the number of breadcrumbs folded in."""
+    with session_scope() as session:
+        db = SyncSessionAdapter(session)
+        session.execute(delete(DwellRollup).where(DwellRollup.owner_id == owner_id))
+        rows = session.execute(
+            select(
+                Breadcrumb.anchor_id,
+                Anchor.zone_id,
+                Breadcrumb.started_at,
+                Breadcrumb.last_action_at,
+                Breadcrumb.active,
+            )
+            .join(Anchor, Anchor.id == Breadcrumb.anchor_id)
+            .where(Breadcrumb.owner_id == owner_id)
+            .order_by(Breadcrumb.started_at, Breadcrumb.id)
+            .execution_options(yield_per=1000)
+        )
+
+        totals = new_totals()
+        count = 0
+        previous = None
+        for row in rows:
+            if previous is not None and not previous.active:
+                _fold(totals, previous, row)
+                count += 1
+            previous = row
+            if len(totals) >= FLUSH_SIZE:
+                asyncio.run(upsert_rollups(db, owner_id, totals))
+                totals = new_totals()
+        if previous is not None and not previous.active:
+            _fold(totals, previous, None)
+            count += 1
+        asyncio.run(upsert_rollups(db, owner_id, totals))
+        return count
+
+
+def _fold(totals: DwellTotals, crumb: Row, following: Row | None) -> None:
+    interrupted = (
+        following is not None
+        and following.anchor_id != crumb.anchor_id
+        and following.started_at == crumb.last_action_at
+    )
+    accumulate(
+        totals,
+        crumb.anchor_id,
+        crumb.zone_id,
+        crumb.started_at,
+        crumb.last_action_at,
+        interrupted,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--email", help="Only rebuild this owner's rollups")
+    args = parser.parse_args()
+
+    with session_scope() as session:
+        query = select(User.id, User.email).order_by(User.id)
+        if args.email:
+            query = query.where(User.email == args.email)
+        owners = session.execute(query).all()
+    if not owners:
+        raise SystemExit(f"No user with email {args.email}")
+    for owner_id, email in owners:
+        print(f"{email}: {rebuild(owner_id)} breadcrumbs")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from contextlib import contextmanager
 import sys
 from pathlib import Path
@@ -10,8 +11,8 @@ if str(BASE_DIR) not in sys.path:
 
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
-from app.models.anchor import Anchor
+from app.db.anchor_import import AnchorImporter
+from app.db.session import SessionLocal, SyncSessionAdapter
 from app.models.user import User
 from app.models.zone import Zone
 
@@ -77,8 +78,8 @@ def session_scope() -> Session:
 def seed() -> None:
     with session_scope() as session:
         user = _ensure_admin_user(session)
-        zone_map = _ensure_zones(session, user)
-        _ensure_anchors(session, zone_map)
+        _ensure_zones(session, user)
+        _ensure_anchors(session, user)
     print("Seed completed.")  # noqa: T201
 
 
@@ -105,21 +106,21 @@ def _ensure_zones(session: Session, user: User) -> dict[str, Zone]:
     return zone_map
 
 
-def _ensure_anchors(session: Session, zones: dict[str, Zone]) -> None:
-    for payload in DEFAULT_ANCHORS:
-        zone = zones[payload["zone_slug"]]
-        exists = session.query(Anchor).filter(Anchor.anchor_id == payload["anchor_id"]).first()
-        if exists:
-            continue
-        anchor = Anchor(
-            zone_id=zone.id,
-            anchor_id=payload["anchor_id"],
-            name=payload["name"],
-            description=payload["description"],
-            location_hint=payload.get("location_hint"),
-        )
-        session.add(anchor)
-        session.flush()
+def _ensure_anchors(session: Session, user: User) -> None:
+    rows = [
+        {
+            "anchor_id": payload["anchor_id"],
+            "name": payload["name"],
+            "zone": payload["zone_slug"],
+            "description": payload["description"],
+            "location_hint": payload.get("location_hint"),
+        }
+        for payload in DEFAULT_ANCHORS
+    ]
+    importer = AnchorImporter(
+        SyncSessionAdapter(session), user.id, list(rows[0]), update_existing=False
+    )
+    asyncio.run(importer.upsert(rows))
 
 
 if __name__ == "__main__":
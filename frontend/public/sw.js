@@ -1,4 +1,4 @@
-const CACHE_NAME = "hive-shell-v1";
+const CACHE_NAME = "hive-shell-v2";
 const APP_SHELL = ["/", "/index.html", "/manifest.webmanifest"];
 
 self.addEventListener("install", (event) => {
@@ -19,6 +19,10 @@ self.addEventListener("fetch", (event) => {
   if (event.request.method !== "GET") {
     return;
   }
+  // API responses carry ETag/Last-Modified; let the HTTP cache revalidate them.
+  if (new URL(event.request.url).pathname.startsWith("/api/")) {
+    return;
+  }
   event.respondWith(
     caches.match(event.request).then((cached) => {
       if (cached) {
@@ -1,4 +1,21 @@
-import type { Anchor, Breadcrumb, Capture, Item, Zone } from "../types";
+import type {
+  Anchor,
+  AnchorClusters,
+  Breadcrumb,
+  CalendarImportStats,
+  Capture,
+  CaptureSuggestion,
+  ChangeEvent,
+  DwellPeriod,
+  DwellReport,
+  DwellScope,
+  Item,
+  NearbyAnchor,
+  Page,
+  SearchHit,
+  Snapshot,
+  Zone
+} from "../types";
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || "http://localhost:8000";
 const API_KEY = import.meta.env.VITE_API_KEY || "change-me";
@@ -26,25 +43,59 @@ async function request<T>(path: string, init?: RequestInit): Promise<T> {
 }
 
 class HiveApiClient {
-  listZones(): Promise<Zone[]> {
-    return request<Zone[]>("/api/zones");
+  getSnapshot(): Promise<Snapshot> {
+    return request<Snapshot>("/api/snapshot");
   }
 
-  listAnchors(zoneId?: number): Promise<Anchor[]> {
-    const suffix = zoneId ? `?zone_id=${zoneId}` : "";
-    return request<Anchor[]>(`/api/anchors${suffix}`);
+  listZones(cursor?: string): Promise<Page<Zone>> {
+    const suffix = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+    return request<Page<Zone>>(`/api/zones${suffix}`);
   }
 
-  listItems(params?: { zoneId?: number; anchorId?: number }): Promise<Item[]> {
+  listAnchors(zoneId?: number, cursor?: string): Promise<Page<Anchor>> {
+    const search = new URLSearchParams();
+    if (zoneId) search.set("zone_id", zoneId.toString());
+    if (cursor) search.set("cursor", cursor);
+    const suffix = search.toString() ? `?${search}` : "";
+    return request<Page<Anchor>>(`/api/anchors${suffix}`);
+  }
+
+  anchorClusters(bbox: string, zoom: number): Promise<AnchorClusters> {
+    const search = new URLSearchParams({ bbox, zoom: zoom.toString() });
+    return request<AnchorClusters>(`/api/anchors/clusters?${search}`);
+  }
+
+  nearbyAnchors(lat: number, lon: number, radius = 1000, limit = 20): Promise<NearbyAnchor[]> {
+    const search = new URLSearchParams({
+      lat: lat.toString(),
+      lon: lon.toString(),
+      radius: radius.toString(),
+      limit: limit.toString()
+    });
+    return request<NearbyAnchor[]>(`/api/anchors/nearby?${search}`);
+  }
+
+  listItems(params?: { zoneId?: number; anchorId?: number; cursor?: string }): Promise<Page<Item>> {
     const search = new URLSearchParams();
     if (params?.zoneId) search.set("zone_id", params.zoneId.toString());
     if (params?.anchorId) search.set("anchor_id", params.anchorId.toString());
+    if (params?.cursor) search.set("cursor", params.cursor);
     const suffix = search.toString() ? `?${search}` : "";
-    return request<Item[]>(`/api/items${suffix}`);
+    return request<Page<Item>>(`/api/items${suffix}`);
   }
 
-  listCaptures(): Promise<Capture[]> {
-    return request<Capture[]>("/api/captures");
+  listCaptures(params?: { unassigned?: boolean; cursor?: string }): Promise<Page<Capture>> {
+    const search = new URLSearchParams();
+    if (params?.unassigned) search.set("unassigned", "true");
+    if (params?.cursor) search.set("cursor", params.cursor);
+    const suffix = search.toString() ? `?${search}` : "";
+    return request<Page<Capture>>(`/api/captures${suffix}`);
+  }
+
+  search(query: string, cursor?: string): Promise<Page<SearchHit>> {
+    const search = new URLSearchParams({ q: query });
+    if (cursor) search.set("cursor", cursor);
+    return request<Page<SearchHit>>(`/api/search?${search}`);
   }
 
   getActiveBreadcrumb(): Promise<Breadcrumb | null> {
@@ -65,12 +116,63 @@ class HiveApiClient {
     });
   }
 
+  getDwell(period: DwellPeriod = "day", scope: DwellScope = "anchor"): Promise<DwellReport> {
+    const search = new URLSearchParams({ period, scope });
+    return request<DwellReport>(`/api/analytics/dwell?${search}`);
+  }
+
+  /**
+   * Follow the server-sent change stream until `signal` aborts. Uses fetch
+   * rather than EventSource so the API key stays in a header.
+   */
+  async streamChanges(onEvent: (event: ChangeEvent) => void, signal: AbortSignal): Promise<void> {
+    const response = await fetch(`${API_BASE_URL}/api/changes/stream`, {
+      headers: { "X-API-Key": API_KEY, Accept: "text/event-stream" },
+      signal
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`Change stream failed with status ${response.status}`);
+    }
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = "";
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) return;
+      buffer += value;
+      const frames = buffer.split("\n\n");
+      buffer = frames.pop() ?? "";
+      for (const frame of frames) {
+        const type = frame.match(/^event: (.*)$/m)?.[1];
+        const data = frame.match(/^data: (.*)$/m)?.[1];
+        if (type && data) {
+          onEvent({ type, ...JSON.parse(data) } as ChangeEvent);
+        }
+      }
+    }
+  }
+
   createCapture(rawText: string, anchorId?: number, zoneId?: number): Promise<Capture> {
     return request<Capture>("/api/captures", {
       method: "POST",
       body: JSON.stringify({ raw_text: rawText, anchor_id: anchorId, zone_id: zoneId })
     });
   }
+
+  getCaptureSuggestions(captureId: number): Promise<CaptureSuggestion[]> {
+    return request<CaptureSuggestion[]>(`/api/captures/${captureId}/suggestions`);
+  }
+
+  rescoreInbox(): Promise<{ scored: number; suggested: number; updated: number }> {
+    return request("/api/captures/infer", { method: "POST" });
+  }
+
+  importZoneCalendar(zoneId: number, ics: Blob | string): Promise<CalendarImportStats> {
+    return request<CalendarImportStats>(`/api/zones/${zoneId}/calendar`, {
+      method: "POST",
+      headers: { "Content-Type": "text/calendar" },
+      body: ics
+    });
+  }
 }
 
 export const hiveApi = new HiveApiClient();
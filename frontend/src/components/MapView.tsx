@@ -1,7 +1,9 @@
-import { MapContainer, Marker, Popup, TileLayer } from "react-leaflet";
+import { useEffect, useState } from "react";
+import { CircleMarker, MapContainer, Marker, Popup, TileLayer, Tooltip, useMap, useMapEvents } from "react-leaflet";
 import L from "leaflet";
 
-import type { Anchor } from "../types";
+import { hiveApi } from "../api/client";
+import type { Anchor, AnchorCluster } from "../types";
 
 const markerIcon = new L.Icon({
   iconUrl: "https://unpkg.com/leaflet@1.9.4/dist/images/marker-icon.png",
@@ -38,21 +40,68 @@ export function MapView({ anchors, onAnchorSelect }: MapViewProps): JSX.Element
         attribution='&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a>'
         url="https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png"
       />
-      {anchorsWithCoords.map((anchor) => (
-        <Marker
-          key={anchor.id}
-          position={[anchor.latitude as number, anchor.longitude as number]}
-          icon={markerIcon}
-          eventHandlers={{
-            click: () => onAnchorSelect?.(anchor)
-          }}
-        >
-          <Popup>
-            <strong>{anchor.name}</strong>
-            <p>{anchor.description}</p>
-          </Popup>
-        </Marker>
-      ))}
+      <ClusterLayer anchors={anchors} onAnchorSelect={onAnchorSelect} />
     </MapContainer>
   );
 }
+
+/** Draws server-side clusters for the visible area, refetching as the map moves. */
+function ClusterLayer({ anchors, onAnchorSelect }: MapViewProps): JSX.Element {
+  const map = useMap();
+  const [clusters, setClusters] = useState<AnchorCluster[]>([]);
+
+  const load = () => {
+    hiveApi
+      .anchorClusters(map.getBounds().toBBoxString(), map.getZoom())
+      .then((result) => setClusters(result.clusters))
+      .catch((error) => console.error(error));
+  };
+
+  useMapEvents({ moveend: load });
+  // Anchors changing (after a refresh) may have moved markers.
+  useEffect(load, [anchors]);
+
+  const anchorsById = new Map(anchors.map((anchor) => [anchor.id, anchor]));
+
+  return (
+    <>
+      {clusters.map((cluster) => {
+        const position: [number, number] = [cluster.latitude, cluster.longitude];
+        const anchor = cluster.anchor_id != null ? anchorsById.get(cluster.anchor_id) : undefined;
+        if (cluster.count === 1) {
+          return (
+            <Marker
+              key={`anchor-${cluster.anchor_id}`}
+              position={position}
+              icon={markerIcon}
+              eventHandlers={{
+                click: () => anchor && onAnchorSelect?.(anchor)
+              }}
+            >
+              {anchor && (
+                <Popup>
+                  <strong>{anchor.name}</strong>
+                  <p>{anchor.description}</p>
+                </Popup>
+              )}
+            </Marker>
+          );
+        }
+        return (
+          <CircleMarker
+            key={`cluster-${position.join(",")}`}
+            center={position}
+            radius={Math.min(10 + Math.log2(cluster.count) * 3, 30)}
+            eventHandlers={{
+              click: () => map.setView(position, Math.min(map.getZoom() + 2, map.getMaxZoom()))
+            }}
+          >
+            <Tooltip direction="center" permanent>
+              {cluster.count}
+            </Tooltip>
+          </CircleMarker>
+        );
+      })}
+    </>
+  );
+}
@@ -9,7 +9,7 @@ import {
 } from "react";
 
 import { hiveApi } from "../api/client";
-import type { Anchor, Breadcrumb, Capture, Item, Zone } from "../types";
+import type { Anchor, Breadcrumb, Capture, ChangeEvent, Item, Zone } from "../types";
 
 interface AppStateContextValue {
   zones: Zone[];
@@ -36,26 +36,54 @@ export function AppStateProvider({ children }: { children: ReactNode }): JSX.Ele
   const [activeAnchorId, setActiveAnchorId] = useState<number | null>(null);
 
   const refresh = useCallback(async () => {
-    const [zoneData, anchorData, itemData, captureData, breadcrumbData] = await Promise.all([
-      hiveApi.listZones(),
-      hiveApi.listAnchors(),
-      hiveApi.listItems(),
-      hiveApi.listCaptures(),
-      hiveApi.getActiveBreadcrumb()
-    ]);
-    setZones(zoneData);
-    setAnchors(anchorData);
-    setItems(itemData);
-    setCaptures(captureData);
-    setBreadcrumb(breadcrumbData);
-    setActiveZoneId((prev) => prev ?? (zoneData[0]?.id ?? null));
-    setActiveAnchorId((prev) => prev ?? (anchorData[0]?.id ?? null));
+    const snapshot = await hiveApi.getSnapshot();
+    setZones(snapshot.zones);
+    setAnchors(snapshot.anchors);
+    setItems(snapshot.items);
+    setCaptures(snapshot.captures);
+    setBreadcrumb(snapshot.breadcrumb);
+    setActiveZoneId((prev) => prev ?? (snapshot.zones[0]?.id ?? null));
+    setActiveAnchorId((prev) => prev ?? (snapshot.anchors[0]?.id ?? null));
   }, []);
 
   useEffect(() => {
     void refresh();
   }, [refresh]);
 
+  // Refresh when another device commits a change instead of polling.
+  useEffect(() => {
+    const controller = new AbortController();
+    let cursor: number | null = null;
+    let pending: number | undefined;
+    const onEvent = (event: ChangeEvent) => {
+      const stale = event.type === "resync" || (event.cursor ?? 0) > (cursor ?? 0);
+      if (event.type === "ready" && cursor === null) {
+        cursor = event.cursor;
+        return;
+      }
+      cursor = event.cursor ?? cursor;
+      if (stale) {
+        window.clearTimeout(pending);
+        pending = window.setTimeout(() => void refresh(), 250);
+      }
+    };
+    const follow = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          await hiveApi.streamChanges(onEvent, controller.signal);
+        } catch {
+          // Fall through to the retry delay.
+        }
+        await new Promise((resolve) => window.setTimeout(resolve, 5000));
+      }
+    };
+    void follow();
+    return () => {
+      controller.abort();
+      window.clearTimeout(pending);
+    };
+  }, [refresh]);
+
   const setActiveZone = useCallback((zoneId: number | null) => {
     setActiveZoneId(zoneId);
     if (zoneId === null) {
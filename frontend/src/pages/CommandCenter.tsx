@@ -69,6 +69,11 @@ export function CommandCenter(): JSX.Element {
               <li key={capture.id}>
                 <span>{new Date(capture.created_at).toLocaleTimeString([], { hour: "2-digit", minute: "2-digit" })}</span>
                 <p>{capture.raw_text}</p>
+                {capture.inferred_anchor_id && (
+                  <small>
+                    Looks like {anchors.find((anchor) => anchor.id === capture.inferred_anchor_id)?.name ?? "a known anchor"}
+                  </small>
+                )}
               </li>
             ))}
             {!captures.length && <p>Capture queue is empty.</p>}
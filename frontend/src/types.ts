@@ -24,6 +24,24 @@ export interface Anchor {
   created_at: string;
 }
 
+export interface AnchorCluster {
+  latitude: number;
+  longitude: number;
+  count: number;
+  zones: { zone_id: number; count: number }[];
+  anchor_id?: number | null;
+}
+
+export interface AnchorClusters {
+  zoom: number;
+  clusters: AnchorCluster[];
+}
+
+export interface NearbyAnchor {
+  anchor: Anchor;
+  distance_m: number;
+}
+
 export interface Item {
   id: number;
   title: string;
@@ -42,9 +60,30 @@ export interface Capture {
   source: string;
   zone_id?: number | null;
   anchor_id?: number | null;
+  inferred_zone_id?: number | null;
+  inferred_anchor_id?: number | null;
+  inference_confidence?: number | null;
   created_at: string;
 }
 
+export interface CaptureSuggestion {
+  rank: number;
+  zone_id: number;
+  anchor_id?: number | null;
+  confidence: number;
+}
+
+export interface CalendarImportStats {
+  inserted: number;
+  updated: number;
+  unchanged: number;
+  removed: number;
+  skipped: number;
+  items_created: number;
+  items_updated: number;
+  items_deleted: number;
+}
+
 export interface Breadcrumb {
   id: number;
   anchor_id: number;
@@ -52,3 +91,50 @@ export interface Breadcrumb {
   last_action_at: string;
   active: boolean;
 }
+
+export interface Snapshot {
+  version: number;
+  zones: Zone[];
+  anchors: Anchor[];
+  items: Item[];
+  captures: Capture[];
+  breadcrumb: Breadcrumb | null;
+}
+
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+export interface SearchHit {
+  entity: "item" | "anchor" | "capture";
+  entity_id: number;
+  rank: number;
+  title: string;
+  snippet: string;
+}
+
+export interface ChangeEvent {
+  type: "ready" | "change" | "resync";
+  cursor: number | null;
+  entities?: string[];
+}
+
+export type DwellPeriod = "day" | "week" | "month";
+export type DwellScope = "anchor" | "zone";
+
+export interface DwellEntry {
+  scope_id: number;
+  name: string;
+  seconds: number;
+  sessions: number;
+  interruptions: number;
+}
+
+export interface DwellReport {
+  period: DwellPeriod;
+  scope: DwellScope;
+  since: string;
+  until: string;
+  buckets: { bucket: string; seconds: number; entries: DwellEntry[] }[];
+}